@@ -4,10 +4,8 @@ import json
 import os
 import signal
 import time
-from contextlib import redirect_stderr, redirect_stdout
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler
-from io import StringIO
 from urllib.parse import urlparse
 
 
@@ -36,13 +34,16 @@ def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict)
     handler.wfile.write(data)
 
 
-class _Timeout(Exception):
-    pass
+class _alarm:
+    """Raise LimitExceeded("timeout") after `seconds`, reporting `limit`.
 
+    A LimitExceeded is a JattiError (a BaseException), so neither pakad nor the
+    interpreter's expression error handling can turn it into something else.
+    """
 
-class _alarm:
-    def __init__(self, seconds: float):
+    def __init__(self, seconds: float, limit: float):
         self.seconds = max(0.0, float(seconds))
+        self.limit = limit
         self._enabled = False
         self._old_handler = None
 
@@ -53,8 +54,10 @@ class _alarm:
         if not hasattr(signal, "SIGALRM"):
             return self
 
+        from compiler.limits import LimitExceeded
+
         def _handle(signum, frame):
-            raise _Timeout()
+            raise LimitExceeded("timeout", f"Time limit of {self.limit}s reached")
 
         self._old_handler = signal.getsignal(signal.SIGALRM)
         signal.signal(signal.SIGALRM, _handle)
@@ -80,45 +83,62 @@ class _alarm:
         return False
 
 
-def _run_jatti(code: str) -> tuple[bool, str, bool, bool]:
+def _run_jatti(code: str, answers: list[str]) -> tuple[bool, str, bool, bool, dict | None]:
     # Import here so the function cold-start can bundle correctly.
-    from compiler.core import run as jatti_run
+    from compiler.errors import JattiError
+    from compiler.interpreter import JattiInterpreter
+    from compiler.limits import ExecutionLimits, LimitExceeded
+    from compiler.streams import BufferSink, ListInput
 
     timeout_sec = float(os.environ.get("JATTI_TIMEOUT_SEC", "2.5").strip() or 2.5)
     max_output_bytes = _get_env_int("JATTI_MAX_OUTPUT_BYTES", 200_000)
 
-    buf = StringIO()
+    # The program writes straight into a capped buffer and das_oye reads the
+    # answers sent with the request, so nothing touches sys.stdout/stdin.
+    buf = BufferSink(max_bytes=max_output_bytes)
+    interpreter = JattiInterpreter(
+        limits=ExecutionLimits(timeout=timeout_sec),
+        output=buf,
+        input=ListInput(answers),
+    )
     started = time.time()
     timed_out = False
+    error = None
+    tail = ""
 
+    # The interpreter checks the deadline between statements; the alarm only
+    # fires for a single statement that runs on well past it.
     try:
-        with _alarm(timeout_sec):
-            with redirect_stdout(buf), redirect_stderr(buf):
-                jatti_run(code)
-    except _Timeout:
+        with _alarm(timeout_sec + 1.0, timeout_sec):
+            interpreter.run(code)
+    except LimitExceeded as e:
         timed_out = True
-        buf.write(f"\n\u23f1\ufe0f Timed out after {timeout_sec}s")
+        tail = f"\n\u23f1\ufe0f Timed out after {timeout_sec}s"
+        error = e.to_dict()
+    except JattiError as e:
+        error = e.to_dict()
+        tail = e.render()
+    except EOFError:
+        error = {"type": "input", "message": "das_oye: request de input vich hor answers chahide ne"}
+        tail = "\n" + error["message"]
     except Exception as e:
         # Keep response stable; the interpreter typically prints its own errors.
-        buf.write(f"\nUnhandled server error: {e}")
+        error = {"type": "server", "message": str(e)}
+        tail = f"\nUnhandled server error: {e}"
 
     output = buf.getvalue()
+    truncated = buf.truncated
+    if truncated:
+        output += "\n\u2026(output truncated)"
+    output += tail
 
-    truncated = False
-    out_bytes = output.encode("utf-8", "ignore")
-    if len(out_bytes) > max_output_bytes:
-        truncated = True
-        # Slice by bytes (utf-8 safe enough for ASCII output).
-        output = out_bytes[:max_output_bytes].decode("utf-8", "ignore") + "\n\u2026(output truncated)"
-
-    # Heuristic: roast_error prints a banner containing "❌ JATTI ERROR"
-    success = (not timed_out) and ("\u274c JATTI ERROR" not in output)
+    success = (not timed_out) and error is None
 
     # Add timing (useful in serverless logs)
     elapsed_ms = int((time.time() - started) * 1000)
     output = output
 
-    return success, output, timed_out, truncated
+    return success, output, timed_out, truncated, error
 
 
 class handler(BaseHTTPRequestHandler):
@@ -164,13 +184,19 @@ class handler(BaseHTTPRequestHandler):
         if not isinstance(code, str) or not code.strip():
             return _json_response(self, HTTPStatus.BAD_REQUEST, {"success": False, "error": "Missing code"})
 
-        success, output, timed_out, truncated = _run_jatti(code)
+        # Answers for das_oye, in order; a program that asks for more sees end of input
+        answers = body.get("input", [])
+        if isinstance(answers, str):
+            answers = answers.splitlines()
+        if not isinstance(answers, list) or not all(isinstance(a, (str, int, float)) for a in answers):
+            return _json_response(self, HTTPStatus.BAD_REQUEST, {"success": False, "error": "input must be a list of strings"})
+
+        success, output, timed_out, truncated, error = _run_jatti(code, answers)
 
-        return _json_response(
-            self,
-            HTTPStatus.OK,
-            {"success": success, "output": output, "timedOut": timed_out, "truncated": truncated},
-        )
+        payload = {"success": success, "output": output, "timedOut": timed_out, "truncated": truncated}
+        if error is not None:
+            payload["error"] = error
+        return _json_response(self, HTTPStatus.OK, payload)
 
     def do_GET(self):
         # Helpful for quick checks
@@ -2,13 +2,22 @@
 """
 Jatti Language CLI - Command line interface for Jatti programs
 Usage:
-    jatti run <file.jatti> [--debug]      # Run a Jatti program
+    jatti run <file.jatti> [--debug] [--engine=vm] [--compiled] [--no-cache]  # Run a Jatti program
+              [--profile] [--profile-json out.json]  # Time every line and kaam
+              [--trace out.json]                      # Chrome trace + flamegraph stacks
+              [--trace-limit N] [--trace-keep head|tail|both|sample]  # --debug trace size
+              [--max-steps N] [--max-depth N] [--timeout SEC]  # Stop runaway programs
     jatti build <file.jatti> [-o output.py]  # Compile to Python
     jatti format <file.jatti> [-i]        # Format Jatti code
+    jatti cache clear [dir]               # Delete __jatticache__ directories
 """
 
-from compiler.core import run, compile_to_python, format_code
-from compiler.errors import roast_error, info
+import compiler
+from compiler.core import compile_to_python, format_code, ENGINES
+from compiler.errors import roast_error, info, JattiError
+from compiler.interpreter import JattiInterpreter
+from compiler.limits import ExecutionLimits
+from compiler.steptrace import KEEP_MODES
 import compiler.state as state
 import sys
 import os
@@ -27,14 +36,32 @@ def print_usage():
 
 Usage:
   jatti run <file.jatti> [--debug]       Run a Jatti program
+      [--trace-limit N]                   steps the --debug trace keeps (default 30)
+      [--trace-keep head|tail|both|sample]  which ones: first, last, both halves, or spread out
+      [--engine=tree|vm]                  tree walker (default) or bytecode VM
+      [--compiled]                        translate to Python in memory and exec it
+      [--no-cache]                        parse again instead of using __jatticache__
+      [--profile]                         report time per line and per kaam (tree engine)
+      [--profile-json out.json]           also save the profile as JSON
+      [--trace out.json]                  kaam calls as a Chrome trace (out.json)
+                                          and collapsed stacks (out.folded)
+      [--max-steps N]                     stop after N statements
+      [--max-depth N]                     stop when more than N kaam calls are open
+      [--timeout SEC]                     stop after SEC seconds
   jatti build <file.jatti> [-o output.py]   Compile to Python
   jatti format <file.jatti> [-i]         Format code in-place
+  jatti cache clear [dir]                Delete __jatticache__ dirs under dir (default .)
   jatti --version                        Show version
   jatti --help                          Show this help
 
 Examples:
   jatti run example.jatti
   jatti run example.jatti --debug
+  jatti run example.jatti --engine=vm
+  jatti run example.jatti --compiled
+  jatti run example.jatti --profile
+  jatti run example.jatti --trace trace.json
+  jatti run example.jatti --max-steps 100000 --timeout 2
   jatti build example.jatti -o output.py
   jatti format example.jatti -i
 
@@ -42,6 +69,18 @@ Examples:
 """)
 
 
+def _option_value(args, name, default=None):
+    """Value of `--name=value` or `--name value` in args"""
+    for i, arg in enumerate(args):
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+        if arg == name:
+            if i + 1 < len(args):
+                return args[i + 1]
+            roast_error(f"Missing value after {name}", 1)
+    return default
+
+
 def cmd_run(args):
     """Run a Jatti program"""
     if not args:
@@ -49,29 +88,111 @@ def cmd_run(args):
     
     filepath = args[0]
     debug_mode = "--debug" in args
+    engine = _option_value(args, "--engine", "tree")
+    mode = "compiled" if "--compiled" in args else "interpret"
+    use_cache = "--no-cache" not in args
+    profile_json = _option_value(args, "--profile-json")
+    profile = "--profile" in args or profile_json is not None
+    trace_path = _option_value(args, "--trace")
+    trace_limit = _option_value(args, "--trace-limit", str(state.TRACE_LIMIT))
+    trace_keep = _option_value(args, "--trace-keep", state.TRACE_KEEP)
+    max_steps = _option_value(args, "--max-steps")
+    max_depth = _option_value(args, "--max-depth")
+    timeout = _option_value(args, "--timeout")
     
     if not os.path.exists(filepath):
         roast_error(f"File not found: {filepath}", 1)
+
+    if engine not in ENGINES:
+        roast_error(f"Unknown engine: {engine}. Use one of: {', '.join(ENGINES)}", 1)
     
+    if not trace_limit.isdigit():
+        roast_error(f"--trace-limit needs a whole number, got: {trace_limit}", 1)
+    if trace_keep not in KEEP_MODES:
+        roast_error(f"Unknown --trace-keep: {trace_keep}. Use one of: {', '.join(KEEP_MODES)}", 1)
+
+    limits = None
+    if max_steps is not None or max_depth is not None or timeout is not None:
+        for name, value in (("--max-steps", max_steps), ("--max-depth", max_depth)):
+            if value is not None and not value.isdigit():
+                roast_error(f"{name} needs a whole number, got: {value}", 1)
+        try:
+            seconds = None if timeout is None else float(timeout)
+        except ValueError:
+            roast_error(f"--timeout needs a number of seconds, got: {timeout}", 1)
+        if mode != "interpret":
+            info(f"--max-steps/--max-depth/--timeout run the program on the {engine} engine")
+        limits = ExecutionLimits(
+            max_steps=None if max_steps is None else int(max_steps),
+            max_depth=None if max_depth is None else int(max_depth),
+            timeout=seconds,
+        )
+
     if debug_mode:
-        state.DEBUG_MODE = True
         print("🔍 Debug mode enabled")
         print("="*60)
     
+    profiler = tracer = None
+    if profile:
+        from compiler.profiler import Profiler
+        if engine != "tree" or mode != "interpret":
+            info("--profile runs the program on the tree engine")
+        profiler = Profiler()
+    if trace_path is not None:
+        from compiler.tracer import CallTracer
+        if mode != "interpret" and not profile:
+            info(f"--trace runs the program on the {engine} engine")
+        tracer = CallTracer()
+
+    interpreter = JattiInterpreter(
+        engine, mode,
+        debug=debug_mode,
+        trace_limit=int(trace_limit),
+        trace_keep=trace_keep,
+        profiler=profiler,
+        tracer=tracer,
+        limits=limits,
+    )
+
     with open(filepath, encoding='utf-8') as f:
         code = f.read()
     
-    run(code)
+    try:
+        interpreter.run(code, path=filepath if use_cache else None)
+    except JattiError as e:
+        interpreter.output.write(e.render())
+        return
+    finally:
+        # Also after an error: the report shows where the time went until then
+        if profile:
+            print("="*60)
+            print(profiler.report())
+            print("="*60)
+            if profile_json is not None:
+                profiler.write_json(profile_json)
+                print(f"📝 Profile saved to {profile_json}")
+        if trace_path is not None:
+            folded_path = tracer.write(trace_path)
+            print(f"📝 Trace saved to {trace_path} (Chrome trace) and {folded_path} (collapsed stacks)")
+            if tracer.dropped:
+                print(f"   {tracer.dropped} calls beyond the first {tracer.max_events} are only in {folded_path}")
     
     if debug_mode:
         print("="*60)
         print(f"✅ Program executed successfully")
-        if state.TRACE_EXECUTION:
-            print(f"\n📊 Execution trace ({len(state.TRACE_EXECUTION)} steps):")
-            for i, trace in enumerate(state.TRACE_EXECUTION[:15], 1):
-                print(f"   {i}. {trace}")
-            if len(state.TRACE_EXECUTION) > 15:
-                print(f"   ... and {len(state.TRACE_EXECUTION)-15} more steps")
+        trace = interpreter.trace
+        if trace:
+            entries = trace.entries()
+            print(f"\n📊 Execution trace ({len(trace)} steps, {len(entries)} kept: {trace.keep}):")
+            previous = 0
+            for entry in entries:
+                step = entry[0]
+                if step > previous + 1 and trace.keep != "sample":
+                    print(f"   ... {step - previous - 1} steps not kept")
+                print(f"   {step}. {trace.format(entry)}")
+                previous = step
+            if len(trace) > previous and trace.keep != "sample":
+                print(f"   ... and {len(trace) - previous} more steps")
 
 
 def cmd_build(args):
@@ -137,18 +258,26 @@ def cmd_format(args):
         print("="*60)
 
 
-def main():
-    if len(sys.argv) < 2:
-        print_usage()
-        return
-    
-    command = sys.argv[1]
-    args = sys.argv[2:]
-    
+def cmd_cache(args):
+    """Manage the __jatticache__ parse cache"""
+    if not args or args[0] != "clear":
+        roast_error("Usage: jatti cache clear [dir]", 1)
+
+    from compiler.cache import clear
+
+    root = args[1] if len(args) > 1 else "."
+    if not os.path.isdir(root):
+        roast_error(f"Directory not found: {root}", 1)
+
+    removed = clear(root)
+    print(f"🧹 Removed {removed} __jatticache__ director{'y' if removed == 1 else 'ies'} under {root}")
+
+
+def _dispatch(command, args):
     if command in ["--help", "-h", "help"]:
         print_usage()
     elif command == "--version":
-        print("Jatti Language v0.4.0")
+        print(f"Jatti Language v{compiler.__version__}")
         print("Phase 4: Error Handling & Debugging")
     elif command == "run":
         cmd_run(args)
@@ -156,11 +285,27 @@ def main():
         cmd_build(args)
     elif command == "format":
         cmd_format(args)
+    elif command == "cache":
+        cmd_cache(args)
     else:
         print(f"Unknown command: {command}")
         print_usage()
 
 
+def main():
+    if len(sys.argv) < 2:
+        print_usage()
+        return
+    
+    command = sys.argv[1]
+    args = sys.argv[2:]
+    
+    try:
+        _dispatch(command, args)
+    except JattiError as e:
+        sys.stdout.write(e.render())
+
+
 if __name__ == "__main__":
     main()
 
@@ -1,2 +1,4 @@
 # Jatti Lang compiler package
 # Eh file Python nu dasdi hai ke compiler ek package hai
+
+__version__ = "0.4.0"
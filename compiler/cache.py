@@ -0,0 +1,143 @@
+# compiler/cache.py
+# On-disk cache of parsed programs, the Jatti version of __pycache__.
+#
+# `jatti run prog.jatti` keeps the Program built by parse_program() in
+# __jatticache__/prog.<key>.jattic next to the source file. The key hashes the
+# source text together with the interpreter version and the parser/node
+# sources, so editing the program or upgrading Jatti never loads a stale
+# tree. A later run of the same text unpickles the Program instead of
+# splitting, normalizing and parsing every line again.
+#
+# Files are written to a temporary name in the same directory and moved into
+# place with os.replace(), so concurrent runs only ever see complete files; a
+# run that loses the race simply parses as usual. Unreadable, corrupt or
+# foreign files are ignored. Like __pycache__, the cache trusts whoever can
+# write to the source directory (the files are pickles).
+#
+# Set JATTI_NO_CACHE=1 (or pass --no-cache to `jatti run`) to bypass it, and
+# use `jatti cache clear` to delete it.
+
+import gc
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+import compiler
+from compiler.errors import set_code_context
+from compiler.nodes import Program
+from compiler.parser import parse_program
+
+
+CACHE_DIR = "__jatticache__"
+SUFFIX = ".jattic"
+FORMAT = 1   # bump when the file layout changes
+
+_front_end = None
+
+
+def _front_end_hash():
+    """Hash of the modules that define the cached tree"""
+    global _front_end
+    if _front_end is None:
+        digest = hashlib.sha256(f"{compiler.__version__}:{FORMAT}".encode())
+        here = Path(__file__).resolve().parent
+        for name in ("parser.py", "nodes.py"):
+            digest.update((here / name).read_bytes())
+        _front_end = digest.hexdigest()
+    return _front_end
+
+
+def enabled():
+    return os.environ.get("JATTI_NO_CACHE", "") in ("", "0")
+
+
+def cache_key(code):
+    """Key for one source text under this interpreter"""
+    digest = hashlib.sha256(_front_end_hash().encode())
+    digest.update(code.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()[:32]
+
+
+def cache_path(path, code):
+    path = Path(path)
+    return path.parent / CACHE_DIR / f"{path.stem}.{cache_key(code)}{SUFFIX}"
+
+
+def _read(file, key):
+    """Cached statement list, or None"""
+    try:
+        with open(file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    # Unpickling thousands of nodes would otherwise trigger several GC passes
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        magic, stored_key, body = pickle.loads(data)
+    except Exception:
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if magic != "jattic" or stored_key != key or not isinstance(body, list):
+        return None
+    return body
+
+
+def _write(file, stem, key, body):
+    """Atomically write program to file and drop older entries for the same source"""
+    try:
+        file.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{file.stem}.", suffix=".tmp", dir=file.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(("jattic", key, body), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception:
+        return   # read-only directory, full disk, ...: just run without a cache
+
+    for old in file.parent.glob(f"{stem}.*{SUFFIX}"):
+        old_key = old.name[len(stem) + 1:-len(SUFFIX)]
+        if old != file and len(old_key) == len(key) and "." not in old_key:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def load_program(path, code):
+    """Program for the source text code read from path, via the cache"""
+    if not enabled():
+        return parse_program(code)
+
+    key = cache_key(code)
+    file = cache_path(path, code)
+    body = _read(file, key)
+    if body is not None:
+        # The source lines are not stored; parse_program() would also have
+        # set them as the error context
+        raw = code.splitlines()
+        set_code_context(raw)
+        return Program(raw, body)
+
+    program = parse_program(code)
+    _write(file, Path(path).stem, key, program.body)
+    return program
+
+
+def clear(root="."):
+    """Delete every __jatticache__ directory under root; returns how many"""
+    removed = 0
+    for directory in sorted(Path(root).rglob(CACHE_DIR)):
+        if directory.is_dir():
+            shutil.rmtree(directory, ignore_errors=True)
+            removed += 1
+    return removed
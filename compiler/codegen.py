@@ -0,0 +1,771 @@
+# compiler/codegen.py
+# Compiled execution mode: `jatti run --compiled` / run(code, mode="compiled").
+#
+# generate() turns the tree from compiler.parser into the source of a single
+# Python module, which run_program() compiles and execs in memory. Top-level
+# statements run at module level, so Jatti globals are the module's globals,
+# and every kaam becomes a def. Expressions are already Python after norm()
+# and are emitted as they are; the checks the interpreter adds on top (numeric
+# comparisons, builtin and method calls, throw, pa_ander, ...) go through
+# small __jatti_* helpers that reuse the interpreter's own code.
+#
+# Nothing is tracked per statement while the program runs. Every generated
+# line maps back to its Jatti line, and when a Python exception is caught by
+# pakad or escapes the program, the traceback is translated into the message,
+# line and call stack the tree walker would have reported. pakad payloads
+# come from __jatti_exception_value(), like in `jatti build` output.
+#
+# Differences from the interpreter, all in programs that already misbehave:
+# - roko_oye_roko / chalo_oye_chalo outside a loop in the same block roast
+#   instead of leaving a loop in the calling code (same as the VM)
+# - a kaam that assigns a name declared `global` anywhere in the program
+#   writes the global from its first statement, not from the `global` line
+# - a kaam local read before its first assignment sees the global's value at
+#   call time rather than when the line runs
+# If the generated module does not compile (a Python keyword used as a name,
+# say), or a kaam is defined inside another kaam (a nested def would close
+# over the outer kaam's locals, where the interpreter reads globals), then
+# run_program() returns False and run() interprets the program instead.
+#
+# compile_to_python()'s line translator, used by `jatti build`, is unchanged.
+
+import ast
+import builtins
+import importlib
+import re
+import sys
+from functools import lru_cache
+
+from compiler.errors import roast_error
+from compiler.runtime import (
+    JattiException, get_compiled, _find_comparison, _COMPARE_OPS,
+    expression_error_message, process_string_escapes,
+)
+from compiler.core import BUILTIN_FUNCS, apply_method
+from compiler.stdlib import LIST_TYPES, python_range
+from compiler.nodes import (
+    Invalid, Print, Assign, IndexAssign, Append, ShowLength, Copy, Clear,
+    Input, PythonImport, Global, FunctionDef, Return, Throw, Break, Continue,
+    If, While, ForEach, Try,
+)
+
+
+FILENAME = "<jatti-compiled>"
+INDENT = "    "
+
+_COMPARE_HELPERS = {
+    ">=": "__jatti_ge",
+    "<=": "__jatti_le",
+    "==": "__jatti_eq",
+    "!=": "__jatti_ne",
+    ">": "__jatti_gt",
+    "<": "__jatti_lt",
+}
+
+# TypeError raised by CPython when a def is called with the wrong arg count
+_ARITY = re.compile(
+    r"^([\w.<>]+)\(\) (?:takes (\d+) positional arguments? but (\d+) (?:was|were) given"
+    r"|missing (\d+) required positional arguments?)"
+)
+
+
+# ---------------- name analysis ----------------
+@lru_cache(maxsize=4096)
+def _names_in(code):
+    """Names an expression reads"""
+    try:
+        tree = ast.parse(code, mode="eval")
+    except SyntaxError:
+        return frozenset()
+    return frozenset(n.id for n in ast.walk(tree) if isinstance(n, ast.Name))
+
+
+def _expr_reads(expr):
+    if expr is None or expr.error:
+        return frozenset()
+    return _names_in(expr.code)
+
+
+def _reads(node):
+    """Names a simple statement reads (compound statements are walked)"""
+    if isinstance(node, (Print, Return, Throw)):
+        return _expr_reads(node.expr)
+    if isinstance(node, Assign):
+        names = set(_expr_reads(node.expr))
+        if node.method is not None:
+            names |= _expr_reads(node.method.obj)
+            for arg in node.method.args:
+                names |= _expr_reads(arg)
+        return names
+    if isinstance(node, IndexAssign):
+        return {node.container} | _expr_reads(node.index) | _expr_reads(node.expr)
+    if isinstance(node, Append):
+        return {node.name} | _expr_reads(node.expr)
+    if isinstance(node, (ShowLength, Clear)):
+        return {node.name}
+    if isinstance(node, Copy):
+        return {node.src}
+    return frozenset()
+
+
+def _bound(node):
+    """Names a simple statement binds"""
+    if isinstance(node, Assign):
+        return (node.target,)
+    if isinstance(node, Copy):
+        return (node.dest,)
+    if isinstance(node, Input):
+        return (node.var,)
+    return ()
+
+
+def _walk(nodes):
+    """Statements in nodes and their blocks, without entering kaam bodies"""
+    for node in nodes:
+        yield node
+        if isinstance(node, If):
+            for branch in node.branches:
+                yield from _walk(branch.body)
+        elif isinstance(node, (While, ForEach)):
+            yield from _walk(node.body)
+        elif isinstance(node, Try):
+            yield from _walk(node.body)
+            yield from _walk(node.handler)
+
+
+def _all_nodes(nodes):
+    """Every statement in the program, kaam bodies included"""
+    for node in _walk(nodes):
+        yield node
+        if isinstance(node, FunctionDef):
+            yield from _all_nodes(node.body)
+
+
+def _has_nested_kaam(program):
+    return any(
+        isinstance(inner, FunctionDef)
+        for node in _all_nodes(program.body) if isinstance(node, FunctionDef)
+        for inner in _all_nodes(node.body)
+    )
+
+
+def _assigned(nodes):
+    names = set()
+    for node in _walk(nodes):
+        names.update(_bound(node))
+        if isinstance(node, ForEach):
+            names.update(node.names)
+        elif isinstance(node, Try) and node.catch_var:
+            names.add(node.catch_var)
+    return names
+
+
+def _unbound_reads(nodes, assigned, local, found):
+    """Collect locals that may be read before they are assigned.
+
+    assigned is the set of names definitely bound on entry; returns the set
+    bound on exit. In the interpreter such reads fall back to the global.
+    """
+    for node in nodes:
+        if isinstance(node, If):
+            after = None
+            for branch in node.branches:
+                if branch.cond is not None:
+                    found |= (_expr_reads(branch.cond) & local) - assigned
+                out = _unbound_reads(branch.body, set(assigned), local, found)
+                after = out if after is None else after & out
+            if node.branches and node.branches[-1].cond is None:
+                assigned = assigned | after
+        elif isinstance(node, While):
+            found |= (_expr_reads(node.cond) & local) - assigned
+            _unbound_reads(node.body, set(assigned), local, found)
+        elif isinstance(node, ForEach):
+            found |= (_expr_reads(node.iterable) & local) - assigned
+            _unbound_reads(node.body, assigned | set(node.names), local, found)
+        elif isinstance(node, Try):
+            _unbound_reads(node.body, set(assigned), local, found)
+            caught = {node.catch_var} if node.catch_var else set()
+            _unbound_reads(node.handler, assigned | caught, local, found)
+        else:
+            found |= (_reads(node) & local) - assigned
+            assigned = assigned | set(_bound(node))
+    return assigned
+
+
+# ---------------- generator ----------------
+class _Generator:
+    def __init__(self, program, expressions):
+        self.expressions = expressions
+        nodes = list(_all_nodes(program.body))
+        self.kaams = {n.name for n in nodes if isinstance(n, FunctionDef)}
+        self.global_names = {name for n in nodes if isinstance(n, Global) for name in n.names}
+        self.out = []
+        # per generated line (1-indexed): Jatti line, expression text, and the
+        # kaam a `chal_oye x ban kaam(...)` line calls (for arity messages)
+        self.lines = [0]
+        self.exprs = [None]
+        self.calls = [None]
+        self.depth = 0
+        self.loop_depth = 0
+        self.in_kaam = False
+
+    def emit(self, text, line, expr=None, call=None):
+        self.out.append(INDENT * self.depth + text)
+        self.lines.append(line)
+        self.exprs.append(expr)
+        self.calls.append(call)
+
+    def fail(self, message, line):
+        self.emit(f"__jatti_fail({message!r}, {line})", line)
+
+    # -------- expressions --------
+    def expr(self, expr):
+        """Python source for a parsed expression"""
+        if expr.error:
+            return f"__jatti_fail({expr.error!r})"
+        compiled = get_compiled(expr.code, self.expressions)
+        if compiled.invalid:
+            return f"__jatti_invalid({expr.code!r})"
+        if compiled.left is None:
+            return f"({expr.code})"
+
+        # safe_eval's numeric check on the operands of the first comparison
+        op, left, right = _find_comparison(expr.code)
+        operands = f"({left.strip()}), ({right.strip()})"
+        if compiled.op is not None:
+            return f"{_COMPARE_HELPERS[op]}({operands})"
+        return f"(__jatti_numeric({operands}) or ({expr.code}))"
+
+    def value(self, expr):
+        """Like expr(), but a whole-expression builtin call goes through call_builtin rules"""
+        call = expr.call
+        if call is not None and call.name in BUILTIN_FUNCS:
+            args = "".join(", " + self.expr(arg) for arg in call.args)
+            return f"__jatti_builtin({call.name!r}{args})"
+        return self.expr(expr)
+
+    # -------- statements --------
+    def block(self, nodes):
+        start = len(self.out)
+        for node in nodes:
+            STATEMENTS[type(node)](self, node)
+        if len(self.out) == start:
+            self.emit("pass", self.lines[-1])
+
+    def body(self, nodes):
+        self.depth += 1
+        self.block(nodes)
+        self.depth -= 1
+
+    def stmt_invalid(self, node):
+        self.fail(node.message, node.line)
+
+    def stmt_print(self, node):
+        self.emit(f"__jatti_print({self.value(node.expr)})", node.line, node.expr.code)
+
+    def stmt_assign(self, node):
+        expr = node.expr
+        call = expr.call
+        kaam = None
+        if node.method is not None and not (
+            call is not None and (call.name in BUILTIN_FUNCS or call.name in self.kaams)
+        ):
+            method = node.method
+            args = ", ".join(self.expr(arg) for arg in method.args)
+            get_args = f"lambda: [{args}]" if args else "list"
+            value = f"__jatti_method({self.expr(method.obj)}, {method.method!r}, {get_args})"
+        else:
+            if call is not None and call.name in self.kaams:
+                kaam = call.name
+            value = self.value(expr)
+        self.emit(f"{node.target} = {value}", node.line, expr.code, kaam)
+
+    def _load(self, name, line, missing):
+        """Bind __jatti_c to variable name; run missing if it is not defined"""
+        self.emit("try:", line)
+        self.depth += 1
+        self.emit(f"__jatti_c = {name}", line)
+        self.depth -= 1
+        self.emit("except NameError:", line)
+        self.depth += 1
+        self.emit(missing, line)
+        self.depth -= 1
+
+    def stmt_index_assign(self, node):
+        self._load(node.container, node.line, f"__jatti_fail('Variable define nahi hoya.', {node.line})")
+        self.emit(
+            f"__jatti_setitem(__jatti_c, {self.expr(node.index)}, {self.expr(node.expr)})",
+            node.line, node.expr.code,
+        )
+
+    def stmt_append(self, node):
+        self._load(node.name, node.line, "__jatti_c = None")
+        self.emit(f"__jatti_append_target(__jatti_c).append({self.expr(node.expr)})", node.line, node.expr.code)
+
+    def stmt_show_length(self, node):
+        self.emit(f"__jatti_print(len({node.name}))", node.line, node.name)
+
+    def stmt_copy(self, node):
+        self.emit(f"{node.dest} = {node.src}.copy()", node.line, node.src)
+
+    def stmt_clear(self, node):
+        self.emit(f"{node.name}.clear()", node.line, node.name)
+
+    def stmt_input(self, node):
+        self.emit(f"{node.var} = __jatti_input({node.prompt!r})", node.line)
+
+    def stmt_python_import(self, node):
+        self.emit(f"__jatti_import({node.module!r}, {node.names!r}, globals())", node.line)
+
+    def stmt_global(self, node):
+        # Declared in the enclosing def (see stmt_function_def)
+        self.emit("pass", node.line)
+
+    def stmt_function_def(self, node):
+        params = set(node.params)
+        declared = (_assigned(node.body) & self.global_names) | {
+            n.name for n in _walk(node.body) if isinstance(n, FunctionDef)
+        }
+        declared -= params
+        local = _assigned(node.body) - declared - params
+        read_through = set()
+        _unbound_reads(node.body, set(params), local, read_through)
+
+        self.emit(f"def {node.name}({', '.join(node.params)}):", node.line)
+        saved = self.loop_depth, self.in_kaam
+        self.loop_depth, self.in_kaam = 0, True
+        self.depth += 1
+        if declared:
+            self.emit(f"global {', '.join(sorted(declared))}", node.line)
+        for name in sorted(read_through):
+            self.emit(f"if {name!r} in globals(): {name} = globals()[{name!r}]", node.line)
+        self.block(node.body)
+        self.emit("__jatti_no_return()", node.line)
+        self.depth -= 1
+        self.loop_depth, self.in_kaam = saved
+
+    def stmt_return(self, node):
+        value = self.expr(node.expr)
+        if self.in_kaam:
+            self.emit(f"return {value}", node.line, node.expr.code)
+        else:
+            # wapas_kar outside a kaam ends the program
+            self.emit(f"__jatti_end({value})", node.line, node.expr.code)
+
+    def stmt_throw(self, node):
+        self.emit(f"__jatti_check_throw({node.expr is not None})", node.line)
+        if node.expr is not None:
+            self.emit(f"raise __jatti_exception({self.expr(node.expr)})", node.line, node.expr.code)
+
+    def _loop_exit(self, node, keyword, statement):
+        if self.loop_depth:
+            self.emit(statement, node.line)
+        else:
+            self.fail(f"{keyword} sirf loop vich allowed hai.", node.line)
+
+    def stmt_break(self, node):
+        self._loop_exit(node, "roko_oye_roko", "break")
+
+    def stmt_continue(self, node):
+        self._loop_exit(node, "chalo_oye_chalo", "continue")
+
+    def stmt_if(self, node):
+        branches = node.branches
+        bad = next((b for b in branches if b.error), None)
+        has_else = False
+        for k, branch in enumerate(branches):
+            if branch is bad:
+                break
+            if branch.cond is None:
+                self.emit("else:", branch.line)
+                has_else = True
+            else:
+                keyword = "if" if k == 0 else "elif"
+                self.emit(f"{keyword} {self.expr(branch.cond)}:", branch.line, branch.cond.code)
+            self.depth += 1
+            self.block(branch.body)
+            if bad is not None:
+                # the interpreter still reaches the broken branch afterwards
+                self.fail(bad.error, bad.line)
+            self.depth -= 1
+            if has_else:
+                break
+
+        if bad is not None and not has_else:
+            if bad is branches[0]:
+                self.fail(bad.error, bad.line)
+            else:
+                self.emit("else:", bad.line)
+                self.depth += 1
+                self.fail(bad.error, bad.line)
+                self.depth -= 1
+
+    def _loop_body(self, nodes):
+        self.loop_depth += 1
+        self.body(nodes)
+        self.loop_depth -= 1
+
+    def stmt_while(self, node):
+        if node.error:
+            self.fail(node.error, node.line)
+            return
+        self.emit(f"while {self.expr(node.cond)}:", node.line, node.cond.code)
+        self._loop_body(node.body)
+
+    def stmt_foreach(self, node):
+        if node.error:
+            self.fail(node.error, node.line)
+            return
+        iterable = self.value(node.iterable)
+        if node.body_error:
+            self.emit(iterable, node.line, node.iterable.code)
+            self.fail(node.body_error, node.line)
+            return
+        call = node.iterable.call
+        if len(node.names) == 1 and call is not None and call.name == "range_banao":
+            # Loop straight over a Python range; no JattiRange in between
+            args = ", ".join(self.expr(arg) for arg in call.args)
+            header = f"for {node.names[0]} in __jatti_range({args}):"
+        elif len(node.names) == 1:
+            header = f"for {node.names[0]} in __jatti_each({iterable}):"
+        else:
+            header = f"for {node.names[0]}, {node.names[1]} in __jatti_items({iterable}):"
+        self.emit(header, node.line, node.iterable.code)
+        self._loop_body(node.body)
+
+    def stmt_try(self, node):
+        if node.error:
+            self.fail(node.error, node.error_line or node.line)
+            return
+        line = node.line
+        self.emit("__jatti_interp.in_try += 1", line)
+        self.emit("try:", line)
+        self.depth += 1
+        self.emit("try:", line)
+        self.body(node.body)
+        self.emit("except Exception as __jatti_e:", line)
+        self.depth += 1
+        target = f"{node.catch_var} = " if node.catch_var else ""
+        self.emit(f"{target}__jatti_exception_value(__jatti_e)", line)
+        self.block(node.handler)
+        self.depth -= 2
+        self.emit("finally:", line)
+        self.depth += 1
+        self.emit("__jatti_interp.in_try -= 1", line)
+        self.depth -= 1
+
+
+STATEMENTS = {
+    Invalid: _Generator.stmt_invalid,
+    Print: _Generator.stmt_print,
+    Assign: _Generator.stmt_assign,
+    IndexAssign: _Generator.stmt_index_assign,
+    Append: _Generator.stmt_append,
+    ShowLength: _Generator.stmt_show_length,
+    Copy: _Generator.stmt_copy,
+    Clear: _Generator.stmt_clear,
+    Input: _Generator.stmt_input,
+    PythonImport: _Generator.stmt_python_import,
+    Global: _Generator.stmt_global,
+    FunctionDef: _Generator.stmt_function_def,
+    Return: _Generator.stmt_return,
+    Throw: _Generator.stmt_throw,
+    Break: _Generator.stmt_break,
+    Continue: _Generator.stmt_continue,
+    If: _Generator.stmt_if,
+    While: _Generator.stmt_while,
+    ForEach: _Generator.stmt_foreach,
+    Try: _Generator.stmt_try,
+}
+
+
+class GeneratedModule:
+    """Generated Python source plus the tables that map it back to Jatti"""
+    __slots__ = ("source", "lines", "exprs", "calls")
+
+    def __init__(self, source, lines, exprs, calls):
+        self.source = source
+        self.lines = lines
+        self.exprs = exprs
+        self.calls = calls
+
+
+def generate(program, expressions=None):
+    """Generate the Python module for a parsed Program; expressions is the
+    CompiledExpr cache of the run"""
+    gen = _Generator(program, {} if expressions is None else expressions)
+    gen.block(program.body)
+    return GeneratedModule("\n".join(gen.out) + "\n", gen.lines, gen.exprs, gen.calls)
+
+
+# ---------------- error mapping ----------------
+class _End(BaseException):
+    """wapas_kar at top level; not an Exception so pakad lets it through"""
+
+
+def _frames(exc=None):
+    """(frame, lineno) of generated code, outermost first.
+
+    Live frames come from the current stack; with exc, the frames between the
+    handler and the point where exc was raised come from its traceback.
+    """
+    frames = []
+    f = sys._getframe(1)
+    while f is not None:
+        if f.f_code.co_filename == FILENAME:
+            frames.append((f, f.f_lineno))
+        f = f.f_back
+    frames.reverse()
+
+    if exc is not None:
+        raised = []
+        tb = exc.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == FILENAME:
+                raised.append((tb.tb_frame, tb.tb_lineno))
+            tb = tb.tb_next
+        if raised and frames and frames[-1][0] is raised[0][0]:
+            frames.pop()
+        frames += raised
+
+    # lambdas and comprehensions belong to the line that created them
+    return [(f, n) for f, n in frames if f.f_code.co_name == "<module>" or not f.f_code.co_name.startswith("<")]
+
+
+def _translate(exc, frames):
+    """(message, catchable) the interpreter would report for exc"""
+    frame, lineno = frames[-1]
+    module = frame.f_globals["__jatti_module__"]
+
+    if isinstance(exc, TypeError):
+        match = _ARITY.match(str(exc))
+        name = match.group(1).rsplit(".", 1)[-1] if match else None
+        fn = frame.f_globals.get(name) if name else None
+        tb = exc.__traceback__
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        if (
+            getattr(getattr(fn, "__code__", None), "co_filename", None) == FILENAME
+            and tb is not None and tb.tb_frame.f_code.co_filename == FILENAME
+        ):
+            # A kaam called with the wrong number of arguments
+            if module.calls[lineno] == name:
+                return "Function arguments ginti galat hai.", False
+            expected = fn.__code__.co_argcount
+            got = int(match.group(3)) if match.group(3) else expected - int(match.group(4))
+            return f"Function {name} expects {expected} args, got {got}", False
+
+    return expression_error_message(exc, module.exprs[lineno]), True
+
+
+# ---------------- helpers used by generated code ----------------
+class _Runtime:
+    """The __jatti_* helpers of one run, reporting through its interpreter"""
+
+    def __init__(self, interp):
+        self.interp = interp
+
+    def set_context(self, frames, line=None, at_caller=False):
+        """Point the interpreter's current line and roast call stack at frames"""
+        interp = self.interp
+        lines = frames[0][0].f_globals["__jatti_module__"].lines
+        interp.function_stack.clear()
+        for (caller, caller_line), (callee, _) in zip(frames, frames[1:]):
+            interp.push_function(callee.f_code.co_name, lines[caller_line])
+        if line is None:
+            frame, lineno = frames[-2] if at_caller and len(frames) > 1 else frames[-1]
+            line = lines[lineno]
+        interp.current_line = line
+
+    def report(self, exc):
+        """Roast an exception that escaped the program, like the interpreter"""
+        frames = _frames(exc)
+        if not frames:
+            raise exc
+        message, _ = _translate(exc, frames)
+        self.set_context(frames)
+        roast_error(message, self.interp.current_line)
+
+    def fail(self, message, line=None):
+        self.set_context(_frames(), line)
+        roast_error(message, self.interp.current_line)
+
+    def invalid(self, expr):
+        self.set_context(_frames())
+        self.interp.expression_error(SyntaxError(expr), expr)
+
+    def exception_value(self, exc):
+        """pakad payload for exc (roasts for errors pakad cannot catch)"""
+        if isinstance(exc, JattiException):
+            return exc.value
+        frames = _frames(exc)
+        if not frames:
+            return str(exc)
+        message, catchable = _translate(exc, frames)
+        if not catchable:
+            self.set_context(frames)
+            roast_error(message, self.interp.current_line)
+        return message
+
+    def numeric(self, left, right):
+        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+            self.set_context(_frames())
+            self.interp.comparison_error()
+        return False
+
+    def compare(self, fn):
+        def compare(left, right):
+            if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+                return fn(left, right)
+            self.set_context(_frames())
+            self.interp.comparison_error()
+        return compare
+
+    def builtin(self, name, *args):
+        try:
+            return BUILTIN_FUNCS[name](*args)
+        except Exception as e:
+            self.fail(f"Built-in function error: {str(e)}")
+
+    def method(self, obj, method_name, get_args):
+        self.set_context(_frames())
+        return apply_method(self.interp, obj, method_name, get_args)
+
+    def setitem(self, container, index, value):
+        try:
+            container[index] = value
+        except:
+            self.fail("Indexed assignment galat hai.")
+
+    def append_target(self, value):
+        if not isinstance(value, LIST_TYPES):
+            self.fail("pa_ander sirf list layi use hunda hai.")
+        return value
+
+    def each(self, iterable):
+        if not isinstance(iterable, LIST_TYPES):
+            self.fail("har_ek x sirf list layi use hunda hai.")
+        return iterable
+
+    def range(self, *args):
+        try:
+            return python_range(*args)
+        except Exception as e:
+            self.fail(f"Built-in function error: {str(e)}")
+
+    def items(self, iterable):
+        if not isinstance(iterable, dict):
+            self.fail("har_ek key, value sirf map layi use hunda hai.")
+        return iterable.items()
+
+    def import_names(self, module, names, namespace):
+        try:
+            mod = importlib.import_module(module)
+            for f in names:
+                namespace[f] = getattr(mod, f)
+        except Exception:
+            self.fail("Python import fail ho gaya.")
+
+    def check_throw(self, has_value):
+        if self.interp.in_try == 0:
+            self.fail("throw sirf try vich allowed hai.")
+        if not has_value:
+            self.fail("throw vich value chahidi hai.")
+
+    def print(self, result):
+        if isinstance(result, str):
+            result = process_string_escapes(f'"{result}"')
+        self.interp.print(result)
+
+    def input(self, prompt):
+        val = self.interp.read_input(prompt)
+        try:
+            return int(val) if "." not in val else float(val)
+        except:
+            return val
+
+    def no_return(self):
+        frames = _frames()
+        self.set_context(frames, at_caller=True)
+        roast_error("wapas_kar missing hai.", self.interp.current_line)
+
+    def helpers(self):
+        """Names the generated module sees"""
+        helpers = {
+            "__jatti_fail": self.fail,
+            "__jatti_invalid": self.invalid,
+            "__jatti_exception_value": self.exception_value,
+            "__jatti_exception": JattiException,
+            "__jatti_numeric": self.numeric,
+            "__jatti_builtin": self.builtin,
+            "__jatti_method": self.method,
+            "__jatti_print": self.print,
+            "__jatti_setitem": self.setitem,
+            "__jatti_append_target": self.append_target,
+            "__jatti_each": self.each,
+            "__jatti_items": self.items,
+            "__jatti_range": self.range,
+            "__jatti_input": self.input,
+            "__jatti_import": self.import_names,
+            "__jatti_check_throw": self.check_throw,
+            "__jatti_no_return": self.no_return,
+            "__jatti_end": _end,
+            "__jatti_interp": self.interp,
+        }
+        for op, name in _COMPARE_HELPERS.items():
+            helpers[name] = self.compare(_COMPARE_OPS[op][1])
+        return helpers
+
+
+def _end(value):
+    raise _End()
+
+
+# ---------------- runner ----------------
+def run_program(interp, program):
+    """Generate, compile and exec a parsed Program for interp.
+
+    Returns False without running anything if the program has a nested kaam
+    or the generated module does not compile, so the caller can interpret the
+    program instead.
+    """
+    if _has_nested_kaam(program):
+        return False
+    module = generate(program, interp.expressions)
+    try:
+        code = compile(module.source, FILENAME, "exec")
+    except SyntaxError:
+        return False
+
+    runtime = _Runtime(interp)
+    namespace = {"__name__": "__jatti__", "__builtins__": builtins, "__jatti_module__": module}
+    namespace.update(BUILTIN_FUNCS)
+    namespace.update(runtime.helpers())
+    try:
+        exec(code, namespace)
+    except _End:
+        pass
+    except JattiException:
+        # Raised from a pakad handler; the interpreter does not catch it either
+        raise
+    except Exception as e:
+        runtime.report(e)
+    finally:
+        _export_globals(interp, program, namespace)
+    return True
+
+
+def _export_globals(interp, program, namespace):
+    """Leave the module's globals on interp, where the interpreter keeps them:
+    Jatti variables in interp.variables, kaams and python_le_aa imports in
+    interp.python_funcs"""
+    nodes = list(_all_nodes(program.body))
+    callables = {n.name for n in nodes if isinstance(n, FunctionDef)}
+    callables.update(name for n in nodes if isinstance(n, PythonImport) for name in n.names)
+    for name, value in namespace.items():
+        if name.startswith("__") or BUILTIN_FUNCS.get(name) is value:
+            continue
+        if name in callables:
+            interp.python_funcs[name] = value
+        else:
+            interp.variables[name] = value
@@ -1,5 +1,7 @@
 import random
+import threading
 import traceback
+from contextlib import contextmanager
 from typing import Optional, List
 
 ROASTS = [
@@ -23,90 +25,171 @@ ERROR_CONTEXT = {
     'function_stack': [],  # Stack of function calls
 }
 
+# Each JattiInterpreter has its own error context and makes it the active
+# one for its thread while it runs, so programs running on other threads
+# report their own code and call stack. ERROR_CONTEXT is used otherwise.
+_active = threading.local()
 
-def set_code_context(lines: List[str]):
-    """Store the entire program for error context display"""
-    ERROR_CONTEXT['code_lines'] = lines
 
+def new_error_context():
+    return {'code_lines': [], 'current_line': 1, 'function_stack': [], 'warnings': []}
 
-def push_function(func_name: str, line_no: int):
-    """Track function call stack for better error messages"""
-    ERROR_CONTEXT['function_stack'].append({
-        'name': func_name,
-        'line': line_no
-    })
 
+def error_context():
+    """The error context roast_error reports against on this thread"""
+    context = getattr(_active, 'context', None)
+    return ERROR_CONTEXT if context is None else context
 
-def pop_function():
-    """Remove function from stack"""
-    if ERROR_CONTEXT['function_stack']:
-        ERROR_CONTEXT['function_stack'].pop()
 
+@contextmanager
+def active_error_context(context):
+    """Make context the active error context of this thread inside the block"""
+    previous = getattr(_active, 'context', None)
+    _active.context = context
+    try:
+        yield context
+    finally:
+        _active.context = previous
 
-def get_error_context(line_no: Optional[int] = None) -> str:
-    """Generate detailed error context with code snippet"""
-    if line_no is None:
-        line_no = ERROR_CONTEXT['current_line']
-    
-    context_lines = []
-    lines = ERROR_CONTEXT['code_lines']
-    
+
+def set_code_context(lines: List[str]):
+    """Store the entire program for error context display"""
+    error_context()['code_lines'] = lines
+
+
+def _context_rows(lines, line_no):
+    """(line number, text) of the code around line_no: 2 before, 2 after"""
     if not lines or line_no < 1 or line_no > len(lines):
-        return ""
-    
-    # Show context: 2 lines before, current line, 2 lines after
+        return []
     start = max(0, line_no - 3)
     end = min(len(lines), line_no + 2)
-    
-    context_lines.append("📋 Code Context:")
-    for i in range(start, end):
-        prefix = ">>> " if (i + 1) == line_no else "    "
-        line_text = lines[i] if i < len(lines) else ""
-        line_num = i + 1
+    return [(i + 1, lines[i]) for i in range(start, end)]
+
+
+def _format_context(rows, line_no):
+    if not rows:
+        return ""
+    context_lines = ["📋 Code Context:"]
+    for line_num, line_text in rows:
+        prefix = ">>> " if line_num == line_no else "    "
         context_lines.append(f"{prefix}{line_num:3d} | {line_text}")
-    
     return "\n".join(context_lines)
 
 
-def get_stack_trace() -> str:
-    """Generate call stack trace for debugging"""
-    if not ERROR_CONTEXT['function_stack']:
+def _format_stack(function_stack):
+    if not function_stack:
         return ""
-    
     trace_lines = ["📞 Call Stack:"]
-    for i, func_info in enumerate(ERROR_CONTEXT['function_stack']):
+    for i, func_info in enumerate(function_stack):
         indent = "  " * i
         trace_lines.append(f"{indent}└─ {func_info['name']}() at line {func_info['line']}")
-    
     return "\n".join(trace_lines)
 
 
+def get_error_context(line_no: Optional[int] = None) -> str:
+    """Generate detailed error context with code snippet"""
+    context = error_context()
+    if line_no is None:
+        line_no = context['current_line']
+    return _format_context(_context_rows(context['code_lines'], line_no), line_no)
+
+
+def get_stack_trace() -> str:
+    """Generate call stack trace for debugging"""
+    return _format_stack(error_context()['function_stack'])
+
+
+# ---------------- exceptions ----------------
+class JattiError(BaseException):
+    """An error that stops a Jatti program.
+
+    Carries the message, line, the program's source lines, the kaam call
+    stack at the point of the error and the roast line; render() builds the
+    banner shown to the user and to_dict() the same for JSON. Nothing is
+    formatted until one of them is called.
+
+    Like SystemExit, which roast_error used to raise, it is not an Exception,
+    so pakad and the engines' `except Exception` handlers let it through.
+    """
+
+    category = "error"
+
+    def __init__(self, message, line=None, code_lines=None, call_stack=None, roast=None):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+        self.code_lines = code_lines if code_lines is not None else []
+        self.call_stack = call_stack if call_stack is not None else []
+        self.roast = roast if roast is not None else random.choice(ROASTS)
+
+    def attach(self, context):
+        """Fill in source lines and call stack from an error context"""
+        if not self.code_lines:
+            self.code_lines = context['code_lines']
+        if not self.call_stack:
+            self.call_stack = [dict(frame) for frame in context['function_stack']]
+        return self
+
+    def _context_line(self):
+        # Without a line the code context starts at the top of the program
+        return 1 if self.line is None else self.line
+
+    def context_rows(self):
+        return _context_rows(self.code_lines, self._context_line())
+
+    def render(self) -> str:
+        """The banner roast_error used to print"""
+        lines = ["\n" + "="*60, "❌ JATTI ERROR", "="*60]
+        lines.append(f"\n🔴 Error: {self.message}")
+        if self.line is not None:
+            lines.append(f"📍 Line {self.line}")
+
+        context = _format_context(self.context_rows(), self._context_line())
+        if context:
+            lines.append("\n" + context)
+
+        stack = _format_stack(self.call_stack)
+        if stack:
+            lines.append("\n" + stack)
+
+        lines.append("\n" + "# " + self.roast)
+        lines.append("="*60 + "\n")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.category,
+            "message": self.message,
+            "line": self.line,
+            "context": [
+                {"line": line_num, "code": text, "current": line_num == self._context_line()}
+                for line_num, text in self.context_rows()
+            ],
+            "callStack": [{"name": f['name'], "line": f['line']} for f in self.call_stack],
+            "roast": self.roast,
+        }
+
+
+class JattiSyntaxError(JattiError):
+    """The program does not parse"""
+
+    category = "syntax"
+
+
+class JattiRuntimeError(JattiError):
+    """The program failed while running"""
+
+    category = "runtime"
+
+
 def roast_error(msg, line_no=None):
-    """Enhanced error reporting with context and debugging info"""
-    print("\n" + "="*60)
-    print("❌ JATTI ERROR")
-    print("="*60)
-    
-    print(f"\n🔴 Error: {msg}")
-    
-    if line_no is not None:
-        print(f"📍 Line {line_no}")
-    
-    # Show code context
-    context = get_error_context(line_no)
-    if context:
-        print("\n" + context)
-    
-    # Show call stack if any
-    stack = get_stack_trace()
-    if stack:
-        print("\n" + stack)
-    
-    # Show roast message
-    print("\n" + "# " + random.choice(ROASTS))
-    print("="*60 + "\n")
-    
-    raise SystemExit
+    """Stop the program with a JattiRuntimeError at line_no"""
+    raise JattiRuntimeError(msg, line_no).attach(error_context())
+
+
+def syntax_error(msg, line_no=None):
+    """Stop parsing with a JattiSyntaxError at line_no"""
+    raise JattiSyntaxError(msg, line_no).attach(error_context())
 
 
 def warning(msg, line_no=None):
@@ -129,12 +212,13 @@ def soft_error(msg, line_no=None, recovery_value=None):
 
 def get_warnings_summary() -> List[str]:
     """Get summary of all warnings during execution"""
-    return ERROR_CONTEXT.get('warnings', [])
+    return error_context().get('warnings', [])
 
 
 def clear_error_context():
     """Reset error tracking for new program"""
-    ERROR_CONTEXT['code_lines'] = []
-    ERROR_CONTEXT['current_line'] = 1
-    ERROR_CONTEXT['function_stack'] = []
-    ERROR_CONTEXT['warnings'] = []
+    context = error_context()
+    context['code_lines'] = []
+    context['current_line'] = 1
+    context['function_stack'] = []
+    context['warnings'] = []
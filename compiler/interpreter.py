@@ -0,0 +1,255 @@
+# compiler/interpreter.py
+# JattiInterpreter: the state of one running Jatti program.
+#
+# All of it used to live in module globals (compiler.state, the scopes in
+# compiler.runtime, compiler.errors.ERROR_CONTEXT) that run() cleared on
+# entry, so a process could only run one program at a time. An interpreter
+# owns its own copy instead:
+#
+#   variables, functions, python_funcs   globals, kaam table, eval() globals
+#   scope                                innermost scope (a Frame inside a kaam)
+#   current_line, loop_depth, in_try     where execution is
+#   global_vars                          names declared `global`
+#   error_context                        source lines and kaam call stack
+#   trace, profiler, tracer, limits      --debug / --profile / --trace / limits
+#   output, input                        output sink and das_oye answers
+#                                        (compiler.streams)
+#
+# The tree walker's executors, the VM and compiled mode are handed the
+# interpreter and keep everything on it, so separate interpreters can run on
+# separate threads at the same time. roast_error() takes no interpreter: run()
+# makes error_context the active one for its thread (compiler.errors), and
+# the parser keeps its indentation state per thread. Nothing is printed
+# to or read from the process's stdout/stdin except through the default
+# StdoutSink and StdinInput.
+#
+# compiler.core.run(code) is a thin wrapper that creates one per call.
+
+from compiler.errors import roast_error, new_error_context, active_error_context
+from compiler.limits import LimitExceeded
+from compiler.parser import parse_program
+from compiler.runtime import (
+    JattiException, BreakSignal, ContinueSignal, ReturnSignal, frame_class,
+    get_compiled, expression_error_message, register_builtins,
+)
+from compiler.steptrace import StepTrace
+from compiler.streams import StdoutSink, StdinInput
+
+
+class JattiInterpreter:
+    """Runs Jatti programs; one program at a time per interpreter.
+
+    engine is "tree" or "vm", mode "interpret" or "compiled" (see
+    compiler.core.run). debug keeps a StepTrace of trace_limit steps in
+    self.trace; profiler (compiler.profiler.Profiler), tracer
+    (compiler.tracer.CallTracer) and limits (compiler.limits.ExecutionLimits)
+    are used by every run() of this interpreter. output is the sink the
+    program writes to, input answers das_oye (see
+    compiler.streams); they default to stdout and stdin.
+    """
+
+    def __init__(self, engine="tree", mode="interpret", debug=False, trace_limit=30,
+                 trace_keep="both", profiler=None, tracer=None, limits=None,
+                 output=None, input=None):
+        from compiler.core import ENGINES, MODES
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        self.engine = engine
+        self.mode = mode
+        self.debug = debug
+        self.trace_limit = trace_limit
+        self.trace_keep = trace_keep
+        self.profiler = profiler
+        self.tracer = tracer
+        self.limits = limits
+        self.output = StdoutSink() if output is None else output
+        self.input = StdinInput() if input is None else input
+        self.reset()
+
+    def reset(self):
+        """Forget the variables, kaams and imports of the previous run"""
+        self.current_line = 1
+        self.loop_depth = 0
+        self.in_try = 0
+        self.global_vars = set()
+
+        self.variables = {}      # global scope
+        self.functions = {}
+        self.python_funcs = {}   # eval() globals: builtins, kaams, imports
+        register_builtins(self.python_funcs)
+        self.Frame = frame_class(self.variables, self.python_funcs)
+        self._frames = []
+        self.scope = self.variables
+        self.expressions = {}    # per-run CompiledExpr cache
+
+        self.error_context = new_error_context()
+        self.function_stack = self.error_context['function_stack']
+        self.trace = StepTrace(self.trace_limit, self.trace_keep, self.error_context)
+
+    # ---------------- running ----------------
+    def run(self, code, path=None):
+        """Parse and run a program.
+
+        With a profiler the program always runs on the tree engine, the only
+        one with per-statement hooks; with a tracer or limits compiled mode
+        falls back to the engine, whose kaam calls and statements report to
+        them.
+
+        A program that fails raises a compiler.errors.JattiError
+        (JattiSyntaxError, JattiRuntimeError, or LimitExceeded for the
+        limits); nothing about the error is written to the output, callers
+        show e.render() or send e.to_dict().
+        """
+        self.reset()
+        with active_error_context(self.error_context):
+            # Parse once; loop and function bodies are walked as nodes from here on
+            if path is not None:
+                from compiler.cache import load_program
+                program = load_program(path, code)
+            else:
+                program = parse_program(code)
+
+            engine, mode = self.engine, self.mode
+            if self.profiler is not None:
+                self.profiler.code_lines = program.source_lines
+                engine, mode = "tree", "interpret"
+            if self.tracer is not None or self.limits is not None:
+                mode = "interpret"
+            if self.limits is not None:
+                self.limits.start()
+            if self.tracer is not None:
+                self.tracer.begin()
+
+            try:
+                self._execute(program, engine, mode)
+            except LimitExceeded as e:
+                if e.line is None:
+                    e.line = self.current_line
+                e.attach(self.error_context)
+                raise
+            finally:
+                self.output.flush()
+
+    def _execute(self, program, engine, mode):
+        if mode == "compiled":
+            from compiler.codegen import run_program as run_compiled
+            if run_compiled(self, program):
+                return
+
+        if engine == "vm":
+            from compiler.vm import run_program
+            run_program(self, program)
+            return
+
+        from compiler.core import execute_block
+        try:
+            execute_block(self, program.body)
+        except ReturnSignal:
+            # wapas_kar outside a function ends the program
+            pass
+
+    # ---------------- input/output ----------------
+    def print(self, value):
+        """chilla_we: one line of output"""
+        self.output.write(str(value) + "\n")
+
+    def read_input(self, prompt):
+        """das_oye: the next answer, as a str"""
+        return self.input.read(prompt + ": ", self.output)
+
+    # ---------------- scopes ----------------
+    def push_frame(self, frame):
+        self._frames.append(frame)
+        self.scope = frame
+
+    def pop_frame(self):
+        frames = self._frames
+        frames.pop()
+        self.scope = frames[-1] if frames else self.variables
+
+    def set_var(self, name, value):
+        """Bind a variable in the current scope (globals for `global` names)."""
+        if name in self.global_vars:
+            self.variables[name] = value
+        else:
+            self.scope[name] = value
+
+    def get_var(self, name):
+        return self.scope[name]
+
+    def has_var(self, name):
+        return name in self.scope or name in self.variables
+
+    def declare_global(self, name):
+        """Mark name global; a local binding made earlier in this call moves out."""
+        self.global_vars.add(name)
+        scope = self.scope
+        if scope is not self.variables and name in scope:
+            self.variables[name] = scope.pop(name)
+
+    # ---------------- kaam call stack ----------------
+    def push_function(self, name, line):
+        """Track a kaam call for error messages, limits and the tracer"""
+        if self.limits is not None:
+            self.limits.check_depth(len(self.function_stack) + 1)
+        self.function_stack.append({'name': name, 'line': line})
+        if self.tracer is not None:
+            self.tracer.enter(name, line)
+
+    def pop_function(self):
+        if self.function_stack:
+            self.function_stack.pop()
+            if self.tracer is not None:
+                self.tracer.leave()
+
+    # ---------------- expressions ----------------
+    def safe_eval(self, expr):
+        compiled = self.expressions.get(expr) or get_compiled(expr, self.expressions)
+        python_funcs = self.python_funcs
+        scope = self.scope
+        try:
+            if compiled.invalid:
+                # Same path as the old eval() of a malformed string
+                raise SyntaxError(expr)
+
+            if compiled.left is None:
+                return eval(compiled.code, python_funcs, scope)
+
+            # ---------- numeric comparison safety ----------
+            lval = eval(compiled.left, python_funcs, scope)
+            rval = eval(compiled.right, python_funcs, scope)
+
+            if not isinstance(lval, (int, float)) or not isinstance(rval, (int, float)):
+                self.comparison_error()
+
+            if compiled.op is not None:
+                return compiled.op(lval, rval)
+            return eval(compiled.code, python_funcs, scope)
+
+        except (JattiException, BreakSignal, ContinueSignal, ReturnSignal):
+            # Raised from inside a kaam function called by this expression
+            raise
+
+        except Exception as e:
+            self.expression_error(e, expr)
+
+    def comparison_error(self):
+        if self.in_try > 0:
+            raise JattiException("Comparison sirf numbers layi allowed hai.")
+        roast_error(
+            "Comparison sirf numbers layi allowed hai.",
+            self.current_line
+        )
+
+    def expression_error(self, exc, expr):
+        """Report an exception raised while evaluating expr.
+
+        Inside chal_koshish_karle this raises JattiException so pakad can catch
+        it, otherwise it roasts at current_line.
+        """
+        message = expression_error_message(exc, expr)
+        if self.in_try > 0:
+            raise JattiException(message)
+        roast_error(message, self.current_line)
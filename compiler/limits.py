@@ -0,0 +1,107 @@
+# compiler/limits.py
+# Step budget, call depth limit, deadline and cancellation for run().
+#
+# run(code, limits=ExecutionLimits(...)) hands the limits to the
+# JattiInterpreter, and the engines check them as the program runs:
+#
+#   max_steps  statements executed. Every statement the tree walker runs
+#              (execute_block) or the VM reaches (a STEP op per statement) is
+#              one step, so a loop body of three lines costs three steps per
+#              iteration and both engines count the same program the same way
+#   max_depth  kaam calls open at once, checked in
+#              JattiInterpreter.push_function()
+#   timeout    wall-clock seconds from the start of run()
+#   cancel     a CancelToken another thread can cancel()
+#
+# The hot path is tick(): an increment and one comparison per statement.
+# The deadline and the cancel token are only looked at every CHECK_EVERY
+# steps, so a deadline fires within a few hundred statements of passing.
+#
+# Exceeding a limit raises LimitExceeded, a compiler.errors.JattiError, so
+# like every error that stops a program chal_koshish_karle/pakad blocks and
+# the engines' `except Exception` error mapping cannot swallow it; the host
+# that called run() catches it. Compiled mode runs plain Python without these hooks, so
+# run() uses the engine instead while limits are set.
+
+import threading
+import time
+
+from compiler.errors import JattiError
+
+
+# Steps between two looks at the clock and the cancel token
+CHECK_EVERY = 256
+
+
+class LimitExceeded(JattiError):
+    """A run went over one of its ExecutionLimits.
+
+    kind is "steps", "depth", "timeout" or "cancelled"; line is the Jatti
+    source line that was running (JattiInterpreter.run() fills it in).
+    """
+
+    category = "limit"
+
+    def __init__(self, kind, message, line=None):
+        super().__init__(message, line)
+        self.kind = kind
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["limit"] = self.kind
+        return data
+
+
+class CancelToken:
+    """Thread-safe flag for stopping a run from outside"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class ExecutionLimits:
+    def __init__(self, max_steps=None, max_depth=None, timeout=None, cancel=None):
+        self.max_steps = max_steps
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.cancel = cancel
+        self.steps = 0
+        self.deadline = None
+        self._next_check = 1
+
+    def start(self):
+        """Reset the step count and start the clock; run() calls this"""
+        self.steps = 0
+        self.deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        self._next_check = 1
+
+    def tick(self):
+        """Count one statement"""
+        self.steps += 1
+        if self.steps >= self._next_check:
+            self._check()
+
+    def _check(self):
+        steps = self.steps
+        if self.max_steps is not None and steps > self.max_steps:
+            raise LimitExceeded("steps", f"Step limit of {self.max_steps} statements reached")
+        if self.cancel is not None and self.cancel.cancelled:
+            raise LimitExceeded("cancelled", "Execution cancelled")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise LimitExceeded("timeout", f"Time limit of {self.timeout}s reached")
+        next_check = steps + CHECK_EVERY
+        if self.max_steps is not None and next_check > self.max_steps + 1:
+            next_check = self.max_steps + 1
+        self._next_check = next_check
+
+    def check_depth(self, depth):
+        """Called before a kaam call that would make `depth` calls open"""
+        if self.max_depth is not None and depth > self.max_depth:
+            raise LimitExceeded("depth", f"Call depth limit of {self.max_depth} reached")
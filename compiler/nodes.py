@@ -0,0 +1,178 @@
+# compiler/nodes.py
+# Program tree produced by compiler.parser and walked by compiler.core.
+#
+# Every statement node keeps its absolute source line (1-indexed, counting the
+# sun_we line) and the stripped source text, so error messages and --debug
+# traces can point at the original program.
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+# ---------------- expressions ----------------
+@dataclass
+class Expr:
+    """A Jatti expression, normalized to Python source once at parse time."""
+    src: str                       # original Jatti text
+    code: str                      # normalized Python expression
+    error: Optional[str] = None    # deferred syntax error (raised when evaluated)
+    call: Optional["Call"] = None  # set when the whole expression is name(args)
+
+
+@dataclass
+class Call:
+    """A whole-expression call such as `fact(n - 1)` or `range_banao(1, 5)`."""
+    name: str
+    args: List[Expr]
+
+
+@dataclass
+class MethodCall:
+    """`obj.method(args)` on the right hand side of chal_oye."""
+    obj: Expr
+    method: str
+    args: List[Expr]
+
+
+# ---------------- statements ----------------
+@dataclass
+class Node:
+    line: int
+    text: str
+
+
+@dataclass
+class Invalid(Node):
+    """A statement that failed to parse; roasts when execution reaches it."""
+    message: str
+
+
+@dataclass
+class Print(Node):
+    expr: Expr
+
+
+@dataclass
+class Assign(Node):
+    target: str
+    expr: Expr
+    method: Optional[MethodCall] = None
+
+
+@dataclass
+class IndexAssign(Node):
+    container: str
+    index: Expr
+    expr: Expr
+
+
+@dataclass
+class Append(Node):
+    name: str
+    expr: Expr
+
+
+@dataclass
+class ShowLength(Node):
+    name: str
+
+
+@dataclass
+class Copy(Node):
+    src: str
+    dest: str
+
+
+@dataclass
+class Clear(Node):
+    name: str
+
+
+@dataclass
+class Input(Node):
+    var: str
+    prompt: str
+
+
+@dataclass
+class PythonImport(Node):
+    module: str
+    names: List[str]
+
+
+@dataclass
+class Global(Node):
+    names: List[str]
+
+
+@dataclass
+class FunctionDef(Node):
+    name: str
+    params: List[str]
+    body: List[Node]
+
+
+@dataclass
+class Return(Node):
+    expr: Expr
+
+
+@dataclass
+class Throw(Node):
+    expr: Optional[Expr]
+
+
+@dataclass
+class Break(Node):
+    pass
+
+
+@dataclass
+class Continue(Node):
+    pass
+
+
+@dataclass
+class Branch:
+    """One arm of an if chain: `je`, `nahin_taan_je` or `nahin_taan` (cond None)."""
+    line: int
+    cond: Optional[Expr]
+    body: List[Node]
+    error: Optional[str] = None
+
+
+@dataclass
+class If(Node):
+    branches: List[Branch]
+
+
+@dataclass
+class While(Node):
+    cond: Optional[Expr]
+    body: List[Node]
+    error: Optional[str] = None
+
+
+@dataclass
+class ForEach(Node):
+    names: List[str]          # [var] for lists, [key, value] for maps
+    iterable: Optional[Expr]
+    body: List[Node]
+    error: Optional[str] = None        # raised before the iterable is evaluated
+    body_error: Optional[str] = None   # raised after it, like the old executor
+
+
+@dataclass
+class Try(Node):
+    body: List[Node]
+    catch_var: Optional[str]
+    handler: List[Node]
+    error: Optional[str] = None
+    error_line: Optional[int] = None
+
+
+@dataclass
+class Program:
+    """A parsed program plus the source lines used for error context."""
+    source_lines: List[str]
+    body: List[Node] = field(default_factory=list)
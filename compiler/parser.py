@@ -0,0 +1,694 @@
+# compiler/parser.py
+# Turns Jatti source into a tree of compiler.nodes, once per run.
+#
+# Syntax problems inside a statement are not raised here: they become Invalid
+# nodes (or error fields on block nodes) and roast when execution reaches them,
+# so a program still prints everything up to the broken line, same as before.
+# Only the program frame (sun_we / ja_we / base indent) and indentation itself
+# are checked up front, because the tree cannot be built without them.
+
+import re
+import threading
+from functools import lru_cache
+
+from compiler.errors import syntax_error, set_code_context
+from compiler.nodes import (
+    Expr, Call, MethodCall, Invalid, Print, Assign, IndexAssign, Append,
+    ShowLength, Copy, Clear, Input, PythonImport, Global, FunctionDef, Return,
+    Throw, Break, Continue, Branch, If, While, ForEach, Try, Program,
+)
+
+# lines[0] of the parsed body is source line 2 (line 1 is sun_we)
+LINE_OFFSET = 2
+
+
+class _ParseState(threading.local):
+    """Line being parsed and the file's indentation style, per thread so
+    programs can be parsed concurrently; parse_program() resets it"""
+    line = 1
+    indent_type = None   # "space" or "tab"
+    indent_width = None  # 4 for spaces, 1 for tabs
+
+
+_state = _ParseState()
+
+
+# ---------------- helpers ----------------
+def indent_of(line):
+    prefix = line[:len(line) - len(line.lstrip())]
+
+    if not prefix:
+        return 0
+
+    # detect indentation type
+    has_space = " " in prefix
+    has_tab = "\t" in prefix
+
+    #  mixed indentation
+    if has_space and has_tab:
+        syntax_error(
+            "Tabs te spaces mix nahi kar sakde.",
+            _state.line
+        )
+
+    # determine indent type
+    indent_type = "tab" if has_tab else "space"
+    indent_width = prefix.count("\t") if has_tab else prefix.count(" ")
+
+    # validate space indentation
+    if indent_type == "space" and indent_width % 4 != 0:
+        syntax_error(
+            "Spaces indentation 4 di multiple honi chahidi hai.",
+            _state.line
+        )
+
+    # set file-wide indentation style
+    if _state.indent_type is None:
+        _state.indent_type = indent_type
+        _state.indent_width = 1 if indent_type == "tab" else 4
+
+    # enforce consistency
+    if indent_type != _state.indent_type:
+        syntax_error(
+            f"Indentation mix ho rahi hai. Sirf {_state.indent_type} use karo.",
+            _state.line
+        )
+
+    # return logical indent level
+    return indent_width // _state.indent_width
+
+
+# Jatti keyword -> Python operator/constant
+KEYWORDS = {
+    "vadha_hai": ">",
+    "nikka_hai": "<",
+    "barabar": "==",
+    "barabar_nahi_hai": "!=",
+    "nikka_ya_barabar": "<=",
+    "vadha_ya_barabar": ">=",
+    "hor": "and",
+    "ya_te": "or",
+    "nahi": "not",
+    "sach": "True",
+    "jhoot": "False",
+    "khaali": "None",
+}
+
+# One scanner for the whole expression: a double-quoted string literal
+# (escapes skipped, may be unterminated) or a whole-word keyword.
+_NORM_TOKEN = re.compile(
+    r'"(?:[^"\\]|\\.)*(?:\\)?"?'
+    r'|\b(?:' + "|".join(sorted(KEYWORDS, key=len, reverse=True)) + r')\b',
+    re.DOTALL,
+)
+_STRING_LITERAL = re.compile(r'"(?:[^"\\]|\\.)*(?:\\)?"?', re.DOTALL)
+_PROTECTED = re.compile("\0(\\d+)\0")
+
+
+def _replace_keyword(match):
+    token = match.group(0)
+    return token if token[0] == '"' else KEYWORDS[token]
+
+
+def _split_outside_strings(expr, maxsplit):
+    """str.split(maxsplit=...) that keeps quoted strings in one piece"""
+    strings = []
+
+    def protect(match):
+        strings.append(match.group(0))
+        return f"\0{len(strings) - 1}\0"
+
+    parts = _STRING_LITERAL.sub(protect, expr).split(maxsplit=maxsplit)
+    return [_PROTECTED.sub(lambda m: strings[int(m.group(1))], p) for p in parts]
+
+
+@lru_cache(maxsize=4096)
+def _normalize(expr):
+    """Convert Jatti keywords to Python, protecting string literals.
+
+    Returns (python_expr, error). error is a roast message or None.
+    Results are memoized, so repeated expressions cost one dict lookup.
+    """
+    expr = _NORM_TOKEN.sub(_replace_keyword, expr)
+
+    error = None
+    if expr.startswith("mil_gaya"):
+        parts = _split_outside_strings(expr, 2)
+        if len(parts) != 3:
+            error = "mil_gaya syntax galat hai."
+        else:
+            _, container, item = parts
+            expr = f"{item} in {container}"
+
+    return expr.strip(), error
+
+
+def norm(expr):
+    """Convert Jatti keywords to Python, protecting string literals"""
+    code, error = _normalize(expr)
+    if error:
+        syntax_error(error, _state.line)
+    return code
+
+
+# catches: hor hor, ya_te ya_te, hor ya_te, ya_te hor
+_BAD_LOGIC = re.compile(r"\b(hor|ya_te|nahi)\s+(hor|ya_te|nahi)\b")
+_LOGIC_ERROR = "Logical operator syntax galat hai."
+
+
+def validate_logical_syntax(stmt):
+    if _BAD_LOGIC.search(stmt):
+        syntax_error(_LOGIC_ERROR, _state.line)
+
+
+def _split_args(args_str):
+    """Split call arguments on commas that are not nested or quoted"""
+    args = []
+    depth = 0
+    in_string = False
+    start = 0
+    for idx, ch in enumerate(args_str):
+        if ch == '"' and (idx == 0 or args_str[idx - 1] != '\\'):
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(args_str[start:idx])
+            start = idx + 1
+    args.append(args_str[start:])
+    return [a.strip() for a in args if a.strip()]
+
+
+def _call_shape(src):
+    """Return Call if the whole expression is a single name(args) call"""
+    if "(" not in src or not src.endswith(")"):
+        return None
+
+    open_idx = src.index("(")
+    depth = 0
+    in_string = False
+    for idx in range(open_idx, len(src)):
+        ch = src[idx]
+        if ch == '"' and src[idx - 1] != '\\':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                if idx != len(src) - 1:
+                    return None  # e.g. f(1) + g(2)
+                break
+
+    name = src[:open_idx]
+    args = [make_expr(a) for a in _split_args(src[open_idx + 1:-1])]
+    return Call(name, args)
+
+
+def make_expr(src):
+    """Normalize an expression once and remember its call shape"""
+    code, error = _normalize(src)
+    return Expr(src, code, error, _call_shape(src))
+
+
+_METHOD_PATTERN = re.compile(r'(.+)\.(\w+)\((.*)\)')
+
+
+def _method_shape(expr):
+    """Detect `obj.method(args)` on the right hand side of chal_oye"""
+    if not ("." in expr and "(" in expr and expr.endswith(")")):
+        return None
+    match = _METHOD_PATTERN.match(expr)
+    if not match:
+        return None
+    obj_expr, method_name, args_str = match.groups()
+    args = [make_expr(a.strip()) for a in args_str.split(",")] if args_str.strip() else []
+    return MethodCall(make_expr(obj_expr), method_name, args)
+
+
+# ---------------- block parsing ----------------
+class SourceLines(list):
+    """The program body lines plus a block-structure index built in one pass.
+
+    - indents[i]: indent level of lines[i] (None for blank lines)
+    - ends[i]: index of the first non-blank line after i that is not indented
+      deeper than lines[i], i.e. where the block opened at i ends
+
+    The parser reads these instead of re-running indent_of and re-scanning
+    every time it needs the extent of a block.
+    """
+
+    def __init__(self, lines):
+        super().__init__(lines)
+        self.indents = []
+        for i, line in enumerate(lines):
+            if line.strip():
+                _state.line = i + LINE_OFFSET
+                self.indents.append(indent_of(line))
+            else:
+                self.indents.append(None)
+
+        self.ends = [len(lines)] * len(lines)
+        open_blocks = []
+        for i, level in enumerate(self.indents):
+            if level is None:
+                continue
+            while open_blocks and self.indents[open_blocks[-1]] >= level:
+                self.ends[open_blocks.pop()] = i
+            open_blocks.append(i)
+
+
+def _indent(lines, i):
+    return lines.indents[i]
+
+
+def _has_body(lines, i, base_indent):
+    """True if lines[i] exists and is indented deeper than the header"""
+    return i < len(lines) and lines[i].strip() and _indent(lines, i) > base_indent
+
+
+def parse_block(lines, start, base_indent):
+    """Parse statements until a line is indented less than base_indent"""
+    nodes = []
+    i = start
+    while i < len(lines):
+        if not lines[i].strip():
+            i += 1
+            continue
+
+        if _indent(lines, i) < base_indent:
+            break
+
+        node, i = parse_statement(lines, i, base_indent)
+        if node is not None:
+            nodes.append(node)
+
+    return nodes, i
+
+
+def _parse_body(lines, i, base_indent):
+    """Parse the body that follows the header at i. Returns (body, next, ok)"""
+    body_start = i + 1
+    if not _has_body(lines, body_start, base_indent):
+        return [], body_start, False
+    body, j = parse_block(lines, body_start, _indent(lines, body_start))
+    return body, j, True
+
+
+def _skip_body(lines, i):
+    """Index of the first line after the indented region under lines[i]"""
+    return lines.ends[i]
+
+
+# ---------------- IF / ELSE ----------------
+def parse_if_chain(lines, i, base_indent):
+    stmt = lines[i].strip()
+    line = i + LINE_OFFSET
+    cond_raw = stmt.replace("je", "", 1).strip()
+    cond = make_expr(cond_raw)
+    body, j, ok = _parse_body(lines, i, base_indent)
+
+    error = None
+    if _BAD_LOGIC.search(cond_raw):
+        error = _LOGIC_ERROR
+    elif stmt == "je":
+        error = "je vich condition missing hai."
+    elif cond.error:
+        error = cond.error
+    elif not ok:
+        error = "je de baad indented body chahidi hai."
+    branches = [Branch(line, cond, body, error)]
+
+    # ----- else-if / else chain -----
+    while j < len(lines) and _indent(lines, j) == base_indent:
+        stmt = lines[j].strip()
+        line = j + LINE_OFFSET
+
+        # ---- else-if ----
+        if stmt.startswith("nahin_taan_je"):
+            cond_raw = stmt.replace("nahin_taan_je", "", 1).strip()
+            body, next_j, ok = _parse_body(lines, j, base_indent)
+
+            error = None
+            if stmt == "nahin_taan_je":
+                error = "nahin_taan_je vich condition missing hai."
+            elif not ok:
+                error = "nahin_taan_je de baad indented body chahidi hai."
+            elif _BAD_LOGIC.search(cond_raw):
+                error = _LOGIC_ERROR
+            branches.append(Branch(line, make_expr(cond_raw), body, error))
+            j = next_j
+
+        # ---- else ----
+        elif stmt.startswith("nahin_taan"):
+            body, next_j, ok = _parse_body(lines, j, base_indent)
+
+            error = None
+            if stmt != "nahin_taan":
+                error = "nahin_taan de baad kuch nahi aunda."
+            elif not ok:
+                error = "nahin_taan de baad indented body chahidi hai."
+            branches.append(Branch(line, None, body, error))
+            j = next_j
+            break
+
+        else:
+            break
+
+    return If(i + LINE_OFFSET, lines[i].strip(), branches), j
+
+
+# ---------------- WHILE ----------------
+def parse_loop(lines, i, base_indent):
+    stmt = lines[i].strip()
+    cond_raw = stmt.replace("jadon_tak", "", 1).strip()
+    cond = make_expr(cond_raw)
+    body, j, ok = _parse_body(lines, i, base_indent)
+
+    error = None
+    if _BAD_LOGIC.search(cond_raw):
+        error = _LOGIC_ERROR
+    elif stmt == "jadon_tak":
+        error = "jadon_tak vich condition missing hai."
+    elif cond.error:
+        error = cond.error
+    elif i + 1 >= len(lines):
+        error = "jadon_tak body missing hai."
+    elif not ok:
+        error = "jadon_tak de baad indented body chahidi hai."
+
+    return While(i + LINE_OFFSET, stmt, cond, body, error), j
+
+
+# ---------------- FOREACH (LIST + MAP) ----------------
+def parse_foreach(lines, i, base_indent):
+    stmt = lines[i].strip()
+    header = stmt.replace("har_ek", "", 1).strip()
+    body, j, ok = _parse_body(lines, i, base_indent)
+    body_error = None if ok else "har_ek de baad indented body chahidi hai."
+
+    # Find the last space that's not inside parentheses
+    # This handles cases like: "i range_banao(1, 5)" correctly
+    paren_depth = 0
+    last_space_outside_parens = -1
+    for idx, char in enumerate(header):
+        if char == '(':
+            paren_depth += 1
+        elif char == ')':
+            paren_depth -= 1
+        elif char == ' ' and paren_depth == 0:
+            last_space_outside_parens = idx
+
+    if last_space_outside_parens == -1:
+        return ForEach(i + LINE_OFFSET, stmt, [], None, body, "har_ek syntax galat hai."), j
+
+    vars_part = header[:last_space_outside_parens].strip()
+    iterable_expr = header[last_space_outside_parens:].strip()
+    names = [v.strip() for v in vars_part.split(",")]
+
+    error = None
+    if len(names) > 2:
+        error = "har_ek syntax galat hai."
+    elif _BAD_LOGIC.search(iterable_expr):
+        error = _LOGIC_ERROR
+
+    return ForEach(i + LINE_OFFSET, stmt, names, make_expr(iterable_expr), body, error, body_error), j
+
+
+# ---------------- TRY / PAKAD ----------------
+def parse_try_pakad(lines, i, base_indent):
+    stmt = lines[i].strip()
+    line = i + LINE_OFFSET
+
+    def invalid(message, next_i, error_line=line):
+        return Try(line, stmt, [], None, [], message, error_line), next_i
+
+    if i + 1 >= len(lines):
+        return invalid("chal_koshish_karle body missing hai.", i + 1)
+
+    try_body, j, ok = _parse_body(lines, i, base_indent)
+    if not ok:
+        return invalid("chal_koshish_karle de baad indented body chahidi hai.", j)
+
+    if j >= len(lines) or _indent(lines, j) != base_indent:
+        return invalid("try de baad pakad chahida hai.", j)
+
+    pakad_stmt = lines[j].strip()
+    pakad_line = j + LINE_OFFSET
+    if not pakad_stmt.startswith("pakad"):
+        return invalid("try de baad pakad chahida hai.", j)
+
+    parts = pakad_stmt.split()
+    catch_var = None
+
+    if len(parts) == 2:
+        catch_var = parts[1]
+        if not catch_var.isidentifier():
+            return invalid("pakad vich galat variable naam.", _skip_body(lines, j), pakad_line)
+    elif len(parts) > 2:
+        return invalid("pakad syntax galat hai. Format: pakad <var>", _skip_body(lines, j), pakad_line)
+
+    handler, k, ok = _parse_body(lines, j, base_indent)
+    if not ok:
+        return invalid("pakad de baad indented body chahidi hai.", k, pakad_line)
+
+    return Try(line, stmt, try_body, catch_var, handler), k
+
+
+# ---------------- FUNCTION DEFINITION ----------------
+def parse_function(lines, i, base_indent):
+    stmt = lines[i].strip()
+    line = i + LINE_OFFSET
+
+    def invalid(message):
+        return Invalid(line, stmt, message), _skip_body(lines, i)
+
+    # ----- basic structure -----
+    head = stmt.split()
+    if "(" not in stmt or ")" not in stmt or len(head) < 2:
+        return invalid("kaam syntax galat hai. Format: kaam name(arg1, arg2)")
+
+    fname = head[1].split("(")[0]
+
+    # ----- function name validation -----
+    if not fname.isidentifier():
+        return invalid("Function naam galat hai.")
+
+    # ----- parameter parsing -----
+    param_str = stmt[stmt.find("(")+1:stmt.find(")")]
+    if not param_str and "," in stmt:
+        return invalid("Function parameters galat hain.")
+    params = [p.strip() for p in param_str.split(",") if p.strip()]
+
+    for p in params:
+        if not p.isidentifier():
+            return invalid(f"Function parameter galat hai: {p}")
+
+    # ----- function body -----
+    body_start = i + 1
+    while body_start < len(lines) and not lines[body_start].strip():
+        body_start += 1
+    if not _has_body(lines, body_start, base_indent):
+        return invalid("Function body khaali nahi ho sakda.")
+
+    body, j = parse_block(lines, body_start, _indent(lines, body_start))
+    return FunctionDef(line, stmt, fname, params, body), j
+
+
+# ---------------- STATEMENTS ----------------
+def parse_statement(lines, i, base_indent):
+    """Parse the statement starting at lines[i]. Returns (node, next_index)"""
+    stmt = lines[i].strip()
+    line = i + LINE_OFFSET
+
+    def invalid(message):
+        return Invalid(line, stmt, message), i + 1
+
+    if stmt == "pakad" or stmt.startswith("pakad "):
+        return invalid("pakad sirf try de baad allowed hai.")
+
+    # throw
+    if stmt.startswith("throw"):
+        parts = stmt.split(maxsplit=1)
+        expr = make_expr(parts[1]) if len(parts) == 2 else None
+        return Throw(line, stmt, expr), i + 1
+
+    # comment
+    if stmt.startswith("fuddu_chiz"):
+        return None, i + 1
+
+    # python import
+    if stmt.startswith("python_le_aa"):
+        try:
+            parts = stmt.split()
+            module = parts[1].replace('"', "")
+            idx = parts.index("thon")
+        except (IndexError, ValueError):
+            return invalid("Python import fail ho gaya.")
+        return PythonImport(line, stmt, module, [f.strip(",") for f in parts[idx + 1:]]), i + 1
+
+    # input
+    if stmt.startswith("das_oye"):
+        parts = stmt.split(maxsplit=2)
+
+        if len(parts) != 3:
+            return invalid("das_oye syntax galat hai. Format: das_oye <var> eh_chahida \"msg\"")
+        _, var, rest = parts
+
+        if not rest.startswith("eh_chahida"):
+            return invalid("das_oye vich 'eh_chahida' keyword chahida hai.")
+        msg = rest.replace("eh_chahida", "", 1).strip()
+
+        if not (msg.startswith('"') and msg.endswith('"')):
+            return invalid("Input message quotes vich hona chahida hai.")
+        return Input(line, stmt, var, msg.strip('"')), i + 1
+
+    # function definition
+    if stmt.startswith("kaam"):
+        return parse_function(lines, i, base_indent)
+
+    # return
+    if stmt.startswith("wapas_kar"):
+        return Return(line, stmt, make_expr(stmt.replace("wapas_kar", "", 1).strip())), i + 1
+
+    # assignment (indexed or normal)
+    if stmt.startswith("chal_oye"):
+        after = stmt.replace("chal_oye", "", 1).strip()
+        padded = f" {after} "
+        if " ban " not in padded:
+            return invalid("chal_oye syntax galat hai. Format: chal_oye <var> ban <expr>")
+
+        left, expr = padded.split(" ban ", 1)
+        target = left.strip()
+        expr = expr.strip()
+        if not target:
+            return invalid("chal_oye vich variable missing hai.")
+
+        # indexed assignment
+        if "[" in target and "]" in target:
+            container_name = target[:target.index("[")].strip()
+            index_expr = target[target.index("[")+1:target.index("]")]
+            return IndexAssign(line, stmt, container_name, make_expr(index_expr), make_expr(expr)), i + 1
+
+        return Assign(line, stmt, target, make_expr(expr), _method_shape(expr)), i + 1
+
+    # append
+    if stmt.startswith("pa_ander"):
+        parts = stmt.split(maxsplit=2)
+        if len(parts) != 3:
+            return invalid("Syntax samajh nahi aaya.")
+        return Append(line, stmt, parts[1], make_expr(parts[2])), i + 1
+
+    # length
+    if stmt.startswith("kinna_lamba"):
+        parts = stmt.split(maxsplit=1)
+        if len(parts) != 2:
+            return invalid("Syntax samajh nahi aaya.")
+        return ShowLength(line, stmt, parts[1]), i + 1
+
+    # copy
+    if stmt.startswith("copy_kar"):
+        parts = stmt.split()
+        if len(parts) != 3:
+            return invalid("Syntax samajh nahi aaya.")
+        return Copy(line, stmt, parts[1], parts[2]), i + 1
+
+    # clear
+    if stmt.startswith("saaf_kar"):
+        parts = stmt.split()
+        if len(parts) != 2:
+            return invalid("Syntax samajh nahi aaya.")
+        return Clear(line, stmt, parts[1]), i + 1
+
+    # print
+    if stmt.startswith("chilla_we"):
+        return Print(line, stmt, make_expr(stmt.replace("chilla_we", "", 1).strip())), i + 1
+
+    if stmt == "chal_koshish_karle":
+        return parse_try_pakad(lines, i, base_indent)
+
+    # control flow
+    if stmt.startswith("je"):
+        return parse_if_chain(lines, i, base_indent)
+
+    if stmt.startswith("jadon_tak"):
+        return parse_loop(lines, i, base_indent)
+
+    if stmt.startswith("har_ek"):
+        return parse_foreach(lines, i, base_indent)
+
+    # roko_oye_roko (break)
+    if stmt == "roko_oye_roko":
+        return Break(line, stmt), i + 1
+
+    if stmt == "chalo_oye_chalo":
+        return Continue(line, stmt), i + 1
+
+    # global keyword - declare variables as global scope
+    if stmt.startswith("global"):
+        # Parse: global var1, var2, var3
+        parts = stmt.split(None, 1)
+        if len(parts) < 2:
+            return invalid("global ke baad variable names chahide ne.")
+        names = [v.strip() for v in parts[1].split(",") if v.strip()]
+        return Global(line, stmt, names), i + 1
+
+    known = (
+    "das_oye", "chal_oye", "kaam", "wapas_kar", "chilla_we",
+    "je", "nahin_taan_je", "nahin_taan",
+    "jadon_tak", "har_ek", "pa_ander",
+    "copy_kar", "saaf_kar", "kinna_lamba",
+    "fuddu_chiz", "python_le_aa",
+    "chal_koshish_karle", "pakad", "throw", "roko_oye_roko", "chalo_oye_chalo", "global"
+    )
+
+    first = stmt.split()[0]
+    if first not in known:
+        return invalid(f"Unknown keyword: {first}")
+
+    return invalid("Syntax samajh nahi aaya.")
+
+
+# ---------------- program ----------------
+def parse_program(code):
+    """Validate the sun_we/ja_we frame and parse the body into a Program"""
+    raw = code.splitlines()
+    _state.line = 1
+    _state.indent_type = None
+    _state.indent_width = None
+
+    # Set error context for better debugging
+    set_code_context(raw)
+
+    if not raw or raw[0].strip() != "sun_we":
+        syntax_error("Program sun_we naal shuru kar.")
+
+    if raw[-1].strip() != "ja_we":
+        syntax_error("Program ja_we naal khatam kar.", len(raw))
+
+    # Check for duplicate sun_we or ja_we in the middle of code
+    for i, line in enumerate(raw[1:-1], start=2):  # Start from line 2, skip first sun_we and last ja_we
+        stripped = line.strip()
+        if stripped == "sun_we":
+            syntax_error(f"sun_we sirf program de start layi use hunda hai. Line {i} layi galat jaga hai.", i)
+        if stripped == "ja_we":
+            syntax_error(f"ja_we sirf program de end layi use hunda hai. Line {i} layi galat jaga hai.", i)
+
+    lines = SourceLines(raw[1:-1])
+
+    base_indent = next((level for level in lines.indents if level is not None), None)
+
+    if base_indent != 1:
+        syntax_error(
+        "sun_we de baad 1 indent level chahidi hai (4 spaces ya 1 TAB).",
+        2
+        )
+
+    body, _ = parse_block(lines, 0, base_indent)
+    return Program(raw, body)
@@ -0,0 +1,97 @@
+# compiler/purity.py
+# Does a program print the same thing every time it runs?
+#
+# The playground caches the results of such programs (playground_cache.py).
+# A program qualifies when it reads no input (das_oye), imports no Python
+# modules (python_le_aa), and none of its expressions reach a Python builtin
+# that talks to the outside world or depends on the process: open(),
+# input(), id(), hash(), sets (string hashing is randomized per process),
+# and so on. Values whose repr carries a memory address are impure too:
+# object(), iterators, lambdas, and a kaam, builtin or method named without
+# calling it. Anything the check cannot see through, such as a dunder name,
+# counts as impure.
+
+import ast
+import builtins
+from dataclasses import fields, is_dataclass
+
+from compiler.core import BUILTIN_FUNCS
+from compiler.errors import JattiError
+from compiler.nodes import Expr, FunctionDef, Input, PythonImport
+from compiler.parser import parse_program
+
+
+# Expressions are evaluated with the real builtins available
+IMPURE_NAMES = frozenset({
+    "open", "input", "print", "breakpoint", "help", "exit", "quit",
+    "eval", "exec", "compile", "globals", "locals", "vars", "dir",
+    "getattr", "setattr", "delattr", "id", "hash", "set", "frozenset",
+    # results whose repr can show a memory address
+    "object", "type", "repr", "ascii", "format", "super", "memoryview",
+    "property", "classmethod", "staticmethod", "iter", "aiter", "anext",
+    "reversed", "enumerate", "zip", "map", "filter",
+})
+
+# Callables that print as `<function ... at 0x...>` when not called
+BUILTIN_NAMES = frozenset(BUILTIN_FUNCS) | frozenset(
+    name for name in dir(builtins) if callable(getattr(builtins, name))
+)
+
+
+def _parts(obj):
+    """Every statement and expression reachable from obj"""
+    if isinstance(obj, list):
+        for item in obj:
+            yield from _parts(item)
+    elif is_dataclass(obj):
+        yield obj
+        for field in fields(obj):
+            yield from _parts(getattr(obj, field.name))
+
+
+def _expr_is_pure(expr, callables):
+    if expr.error:
+        return True   # fails the same way every time
+    try:
+        tree = ast.parse(expr.code, mode="eval")
+    except SyntaxError:
+        return True
+    called = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Set, ast.SetComp, ast.Lambda, ast.GeneratorExp)):
+            return False
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name in callables and id(node) not in called:
+                return False
+        elif isinstance(node, ast.Attribute):
+            # A method or attribute that is not called may be a bound method
+            if id(node) not in called:
+                return False
+            name = node.attr
+        else:
+            continue
+        if name in IMPURE_NAMES or name.startswith("__"):
+            return False
+    return True
+
+
+def is_deterministic(program):
+    """True if running program always gives the same output"""
+    parts = list(_parts(program.body))
+    callables = BUILTIN_NAMES | {part.name for part in parts if isinstance(part, FunctionDef)}
+    for part in parts:
+        if isinstance(part, (Input, PythonImport)):
+            return False
+        if isinstance(part, Expr) and not _expr_is_pure(part, callables):
+            return False
+    return True
+
+
+def is_deterministic_source(code):
+    """is_deterministic() for source text; programs that do not parse are impure"""
+    try:
+        program = parse_program(code)
+    except JattiError:
+        return False
+    return is_deterministic(program)
@@ -9,13 +9,37 @@ class BreakSignal(Exception):
 class ContinueSignal(Exception):
     pass
 
+class ReturnSignal(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+import ast
+import operator
+import os
+import threading
+from collections import OrderedDict
+
+
+# ---------------- call frames ----------------
+# Each kaam call gets its own Frame holding its parameters and locals. Names
+# not bound in the frame resolve to the globals, so a call costs O(params)
+# instead of copying and restoring the whole variable dict.
+def frame_class(variables, python_funcs):
+    """Frame type of one interpreter, whose globals are variables"""
+
+    class Frame(dict):
+        """Local scope of one kaam call; missing names fall back to globals."""
+        __slots__ = ()
 
-from compiler.errors import roast_error
-import compiler.state as state   # ✅ REQUIRED
+        def __missing__(self, name):
+            if name in variables:
+                return variables[name]
+            # kaams and imports live in python_funcs (eval's globals); answering
+            # here saves raising KeyError on every call made from inside a kaam
+            return python_funcs[name]
 
-variables = {}
-functions = {}
-python_funcs = {}
+    return Frame
 
 
 def process_string_escapes(s):
@@ -36,118 +60,131 @@ def process_string_escapes(s):
     return content
 
 
-def safe_eval(expr: str):
+# ---------------- compiled expression cache ----------------
+# safe_eval used to hand the expression string to eval() on every call, so a
+# loop condition was re-compiled (three times for comparisons) per iteration.
+# Expressions are now compiled once into a CompiledExpr. Lookups go through a
+# per-run dict (each interpreter's own) first and then an optional
+# process-wide LRU, which helps long-lived processes that run the same
+# programs again (playground workers).
+EXPR_CACHE_SIZE = int(os.environ.get("JATTI_EXPR_CACHE_SIZE", "1024") or 0)
+
+_shared_cache = OrderedDict()
+_shared_lock = threading.Lock()
+
+_COMPARE_OPS = {
+    ">=": (ast.GtE, operator.ge),
+    "<=": (ast.LtE, operator.le),
+    "==": (ast.Eq, operator.eq),
+    "!=": (ast.NotEq, operator.ne),
+    ">": (ast.Gt, operator.gt),
+    "<": (ast.Lt, operator.lt),
+}
+
+
+class CompiledExpr:
+    """An expression compiled once, plus what safe_eval needs to know about it.
+
+    - code:  code object for the whole expression (None if it does not compile)
+    - left/right: code objects for the operands around the first comparison
+      operator found outside strings, or None when there is no comparison
+    - op: operator function when the expression is exactly `left op right`,
+      so operands are evaluated once instead of twice
+    """
+    __slots__ = ("source", "code", "left", "right", "op", "invalid")
+
+    def __init__(self, source):
+        self.source = source
+        self.code = None
+        self.left = None
+        self.right = None
+        self.op = None
+        self.invalid = False
+
+
+def _find_comparison(expr):
+    """Find the first comparison operator outside of strings"""
+    in_string = False
+    i = 0
+    while i < len(expr):
+        if expr[i] == '"' and (i == 0 or expr[i-1] != '\\'):
+            in_string = not in_string
+
+        if not in_string:
+            # Check for multi-character operators first
+            two = expr[i:i+2]
+            if two in (">=", "<=", "==", "!="):
+                return two, expr[:i], expr[i+2:]
+            if expr[i] in "<>":
+                return expr[i], expr[:i], expr[i+1:]
+
+        i += 1
+    return None, None, None
+
+
+def compile_expression(expr):
+    """Compile expr into a CompiledExpr (uncached)"""
+    compiled = CompiledExpr(expr)
     try:
-        # ---------- numeric comparison safety ----------
-        # Check for any comparison operator (checking multi-char operators first to avoid false matches)
-        comp_op = None
-        left = None
-        right = None
-        
-        # Find comparison operator OUTSIDE of strings
-        in_string = False
-        i = 0
-        while i < len(expr):
-            if expr[i] == '"' and (i == 0 or expr[i-1] != '\\'):
-                in_string = not in_string
-            
-            if not in_string:
-                # Check for multi-character operators first
-                if expr[i:i+2] == ">=":
-                    comp_op = ">="
-                    left, right = expr[:i], expr[i+2:]
-                    break
-                elif expr[i:i+2] == "<=":
-                    comp_op = "<="
-                    left, right = expr[:i], expr[i+2:]
-                    break
-                elif expr[i:i+2] == "==":
-                    comp_op = "=="
-                    left, right = expr[:i], expr[i+2:]
-                    break
-                elif expr[i:i+2] == "!=":
-                    comp_op = "!="
-                    left, right = expr[:i], expr[i+2:]
-                    break
-                elif expr[i] == '>':
-                    comp_op = ">"
-                    left, right = expr[:i], expr[i+1:]
-                    break
-                elif expr[i] == '<':
-                    comp_op = "<"
-                    left, right = expr[:i], expr[i+1:]
-                    break
-            
-            i += 1
-        
+        compiled.code = compile(expr, "<jatti>", "eval")
+        comp_op, left, right = _find_comparison(expr)
         if comp_op:
-            lval = eval(left.strip(), python_funcs, variables)
-            rval = eval(right.strip(), python_funcs, variables)
-
-            if not isinstance(lval, (int, float)) or not isinstance(rval, (int, float)):
-                if state.IN_TRY > 0:
-                    raise JattiException("Comparison sirf numbers layi allowed hai.")
-                roast_error(
-                    "Comparison sirf numbers layi allowed hai.",
-                    state.CURRENT_LINE
-                )
-
-            return eval(expr, python_funcs, variables)
-
-        # ---------- division by zero check ----------
-        # Look for "/" outside of strings
-        in_string = False
-        i = 0
-        found_div = False
-        while i < len(expr):
-            if expr[i] == '"' and (i == 0 or expr[i-1] != '\\'):
-                in_string = not in_string
-            
-            if not in_string and expr[i] == '/':
-                found_div = True
-                break
-            
-            i += 1
-        
-        if found_div:
-            # Try to evaluate and let Python catch ZeroDivisionError
-            # We'll handle it in the exception handler below
-            pass
-
-        return eval(expr, python_funcs, variables)
-
-    except NameError as e:
-        name = str(e).split("'")[1]
-        if state.IN_TRY > 0:
-            raise JattiException(f"Variable define nahi hoya: {name}")
-        roast_error(f"Variable define nahi hoya: {name}", state.CURRENT_LINE)
-
-
-    except ZeroDivisionError:
-        if state.IN_TRY > 0:
-            raise JattiException("Zero naal divide nahi kar sakde.")
-        roast_error(
-            "Zero naal divide nahi kar sakde.",
-            state.CURRENT_LINE
-        )
-
-    except TypeError:
-        if state.IN_TRY > 0:
-            raise JattiException("Galat type operation hoyi hai.")
-        roast_error(
-            "Galat type operation hoyi hai.",
-            state.CURRENT_LINE
-        )
-
-    except Exception:
-        if state.IN_TRY > 0:
-            raise JattiException(f"Expression error: {expr}")
-        roast_error(
-            f"Expression error: {expr}",
-            state.CURRENT_LINE
-        )
-
-def register_builtins():
+            compiled.left = compile(left.strip(), "<jatti>", "eval")
+            compiled.right = compile(right.strip(), "<jatti>", "eval")
+
+            # Single `left op right`: apply the operator to the operand values
+            tree = ast.parse(expr.strip(), mode="eval").body
+            node_type, fn = _COMPARE_OPS[comp_op]
+            if (
+                isinstance(tree, ast.Compare)
+                and len(tree.ops) == 1
+                and isinstance(tree.ops[0], node_type)
+                and ast.dump(tree.left) == ast.dump(ast.parse(left.strip(), mode="eval").body)
+                and ast.dump(tree.comparators[0]) == ast.dump(ast.parse(right.strip(), mode="eval").body)
+            ):
+                compiled.op = fn
+    except SyntaxError:
+        compiled.invalid = True
+    return compiled
+
+
+def get_compiled(expr, run_cache):
+    """Return the CompiledExpr for expr, compiling it on first use"""
+    compiled = run_cache.get(expr)
+    if compiled is not None:
+        return compiled
+
+    if EXPR_CACHE_SIZE > 0:
+        with _shared_lock:
+            compiled = _shared_cache.get(expr)
+            if compiled is not None:
+                _shared_cache.move_to_end(expr)
+        if compiled is None:
+            compiled = compile_expression(expr)
+            with _shared_lock:
+                _shared_cache[expr] = compiled
+                while len(_shared_cache) > EXPR_CACHE_SIZE:
+                    _shared_cache.popitem(last=False)
+    else:
+        compiled = compile_expression(expr)
+
+    run_cache[expr] = compiled
+    return compiled
+
+
+def expression_error_message(exc, expr):
+    """The Jatti message for an exception raised while evaluating expr"""
+    if isinstance(exc, NameError):
+        name = str(exc).split("'")[1]
+        return f"Variable define nahi hoya: {name}"
+    if isinstance(exc, ZeroDivisionError):
+        return "Zero naal divide nahi kar sakde."
+    if isinstance(exc, TypeError):
+        return "Galat type operation hoyi hai."
+    return f"Expression error: {expr}"
+
+
+def register_builtins(python_funcs):
     """Register Jatti builtin functions in python_funcs for use in eval()"""
     from compiler.stdlib import (
         kinna_lamba, sort_hoja_oye, ulta_hoja_oye, jod_oye, average_kad,
@@ -1,12 +1,11 @@
 # compiler/state.py
-CURRENT_LINE = 1
-LOOP_DEPTH = 0
-IN_TRY = 0
-
-INDENT_TYPE = None   # "space" or "tab"
-INDENT_WIDTH = None # 4 for spaces, 1 for tabs
-GLOBAL_VARS = set()  # Track which variables are declared as global
+# Settings compiler.core.run() passes to the JattiInterpreter it creates.
+# Everything that changes while a program runs lives on the interpreter
+# (compiler.interpreter), so programs on different threads do not share it.
 
 # Debugging/tracing
 DEBUG_MODE = False  # Set to True to see execution trace
-TRACE_EXECUTION = []  # Store execution trace
\ No newline at end of file
+TRACE_LIMIT = 30  # Steps the trace keeps (--trace-limit)
+TRACE_KEEP = "both"  # Which steps: head, tail, both or sample (--trace-keep)
+PROFILER = None  # compiler.profiler.Profiler for `jatti run --profile`
+TRACER = None  # compiler.tracer.CallTracer for `jatti run --trace`
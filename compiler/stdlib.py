@@ -11,21 +11,21 @@ def kinna_lamba(obj):
 
 def sort_hoja_oye(lst):
     """Sort a list and return sorted copy"""
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise TypeError("sort_hoja_oye: only works with lists")
     return sorted(lst)
 
 
 def ulta_hoja_oye(lst):
     """Reverse a list and return reversed copy"""
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise TypeError("ulta_hoja_oye: only works with lists")
     return list(reversed(lst))
 
 
 def jod_oye(lst):
     """Sum all elements in a list"""
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise TypeError("jod_oye: only works with lists")
     try:
         return sum(lst)
@@ -35,7 +35,7 @@ def jod_oye(lst):
 
 def average_kad(lst):
     """Calculate average of list elements"""
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise TypeError("average_kad: only works with lists")
     if len(lst) == 0:
         raise ValueError("average_kad: cannot average empty list")
@@ -47,7 +47,7 @@ def average_kad(lst):
 
 def sabton_vaddha(lst):
     """Find maximum value in list"""
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise TypeError("sabton_vaddha: only works with lists")
     if len(lst) == 0:
         raise ValueError("sabton_vaddha: cannot find max of empty list")
@@ -59,7 +59,7 @@ def sabton_vaddha(lst):
 
 def sabton_nikka(lst):
     """Find minimum value in list"""
-    if not isinstance(lst, list):
+    if not isinstance(lst, LIST_TYPES):
         raise TypeError("sabton_nikka: only works with lists")
     if len(lst) == 0:
         raise ValueError("sabton_nikka: cannot find min of empty list")
@@ -74,19 +74,152 @@ def dona_nu_jod_oye(str1, str2):
     return str(str1) + str(str2)
 
 
+def python_range(*args):
+    """range_banao's numbers as a plain Python range"""
+    if not 1 <= len(args) <= 3:
+        raise ValueError("range_banao: takes 1-3 arguments")
+    return range(*[int(arg) for arg in args])
+
+
 def range_banao(*args):
     """Create a range of numbers - supports range(stop), range(start, stop), range(start, stop, step)"""
-    if len(args) == 1:
-        # range(stop)
-        return list(range(int(args[0])))
-    elif len(args) == 2:
-        # range(start, stop)
-        return list(range(int(args[0]), int(args[1])))
-    elif len(args) == 3:
-        # range(start, stop, step)
-        return list(range(int(args[0]), int(args[1]), int(args[2])))
-    else:
-        raise ValueError("range_banao: takes 1-3 arguments")
+    return JattiRange(python_range(*args))
+
+
+class JattiRange:
+    """What range_banao returns: a list of numbers that is not built until needed.
+
+    Reading it (har_ek, len, indexing, in, ==, +, printing) works on the
+    underlying range in O(1) memory and looks exactly like the list. The
+    first change (pa_ander, indexed assignment, list methods that sort or
+    reverse) turns it into a real list in place, so every variable holding
+    it sees the change, as with a list.
+    """
+
+    __slots__ = ("_range", "_list")
+    __hash__ = None
+
+    def __init__(self, numbers):
+        self._range = numbers
+        self._list = None
+
+    def _items(self):
+        return self._range if self._list is None else self._list
+
+    def _materialize(self):
+        if self._list is None:
+            self._list = list(self._range)
+            self._range = None
+        return self._list
+
+    def tolist(self):
+        return list(self._items())
+
+    copy = tolist
+
+    # -------- reading --------
+    def __len__(self):
+        return len(self._items())
+
+    def __iter__(self):
+        # By index, like a list iterator, so a loop sees the list that a
+        # change made while it runs (pa_ander inside har_ek) turns this into
+        i = 0
+        if self._list is None:
+            for number in self._range:
+                if self._list is not None:
+                    break
+                yield number
+                i += 1
+            if self._list is None:
+                return
+        while i < len(self._list):
+            yield self._list[i]
+            i += 1
+
+    def __reversed__(self):
+        return reversed(self._items())
+
+    def __contains__(self, item):
+        return item in self._items()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items()[index])
+        return self._items()[index]
+
+    def index(self, *args):
+        return self._items().index(*args)
+
+    def count(self, item):
+        return self._items().count(item)
+
+    def __eq__(self, other):
+        if isinstance(other, JattiRange):
+            if self._list is None and other._list is None:
+                return self._range == other._range
+            return self.tolist() == other.tolist()
+        if isinstance(other, list):
+            return len(other) == len(self) and self.tolist() == other
+        return NotImplemented
+
+    def __add__(self, other):
+        if isinstance(other, (list, JattiRange)):
+            return self.tolist() + list(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + self.tolist()
+        return NotImplemented
+
+    def __mul__(self, times):
+        return self.tolist() * times
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    # -------- changing: from here on it is a list --------
+    def __setitem__(self, index, value):
+        self._materialize()[index] = value
+
+    def __delitem__(self, index):
+        del self._materialize()[index]
+
+    def __iadd__(self, other):
+        self._materialize().extend(other)
+        return self
+
+    def append(self, item):
+        self._materialize().append(item)
+
+    def extend(self, items):
+        self._materialize().extend(items)
+
+    def insert(self, index, item):
+        self._materialize().insert(index, item)
+
+    def pop(self, *args):
+        return self._materialize().pop(*args)
+
+    def remove(self, item):
+        self._materialize().remove(item)
+
+    def clear(self):
+        self._list = []
+        self._range = None
+
+    def reverse(self):
+        self._materialize().reverse()
+
+    def sort(self, **kwargs):
+        self._materialize().sort(**kwargs)
+
+
+# Values Jatti treats as lists
+LIST_TYPES = (list, JattiRange)
 
 
 # String methods (added to string class dynamically)
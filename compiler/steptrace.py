@@ -0,0 +1,85 @@
+# compiler/steptrace.py
+# The --debug execution trace (JattiInterpreter.trace).
+#
+# Every statement executed in debug mode is one step. Keeping a formatted
+# string per step made long loops allocate millions of strings, so a
+# StepTrace keeps at most `limit` compact (step, line, call depth) records
+# and only formats the ones that are printed, with the source text from the
+# run's error context. Which steps survive depends on `keep`:
+#
+#   head    the first `limit` steps
+#   tail    the last `limit` steps (a ring buffer)
+#   both    the first half and the last half (default)
+#   sample  `limit` steps picked uniformly over the whole run (reservoir
+#           sampling, seeded, so a rerun keeps the same steps)
+
+import random
+
+from compiler.errors import ERROR_CONTEXT
+
+
+KEEP_MODES = ("head", "tail", "both", "sample")
+
+
+class StepTrace:
+    def __init__(self, limit=30, keep="both", context=ERROR_CONTEXT):
+        if keep not in KEEP_MODES:
+            raise ValueError(f"keep must be one of {', '.join(KEEP_MODES)}")
+        self.limit = max(0, limit)
+        self.keep = keep
+        self.steps = 0
+        if keep == "head":
+            self._head_size = self.limit
+        elif keep == "both":
+            self._head_size = (self.limit + 1) // 2
+        else:
+            self._head_size = 0
+        self._head = []
+        # tail: ring of the latest records; sample: the reservoir
+        self._ring_size = self.limit - self._head_size if keep in ("tail", "both") else 0
+        self._ring = []
+        self._pos = 0
+        self._rng = random.Random(0) if keep == "sample" else None
+        # Error context of the run this trace belongs to: its kaam call
+        # stack gives the depth of each step, its code lines the text
+        self._context = context
+        self._calls = context['function_stack']
+
+    def __len__(self):
+        """Steps recorded, kept or not"""
+        return self.steps
+
+    def record(self, line):
+        step = self.steps = self.steps + 1
+        entry = (step, line, len(self._calls))
+        if step <= self._head_size:
+            self._head.append(entry)
+            return
+        ring = self._ring
+        if self._ring_size:
+            if len(ring) < self._ring_size:
+                ring.append(entry)
+            else:
+                ring[self._pos] = entry
+                self._pos += 1
+                if self._pos == self._ring_size:
+                    self._pos = 0
+        elif self._rng is not None and self.limit:
+            if len(ring) < self.limit:
+                ring.append(entry)
+            else:
+                slot = self._rng.randrange(step)
+                if slot < self.limit:
+                    ring[slot] = entry
+
+    def entries(self):
+        """Kept (step, line, depth) records, oldest first"""
+        if self._rng is not None:
+            return sorted(self._ring)
+        return self._head + self._ring[self._pos:] + self._ring[:self._pos]
+
+    def format(self, entry):
+        _, line, depth = entry
+        lines = self._context['code_lines']
+        text = lines[line - 1].strip() if 0 < line <= len(lines) else ""
+        return f"{'  ' * depth}Line {line}: {text[:50]}"
@@ -0,0 +1,111 @@
+# compiler/streams.py
+# Where a program's output goes and where das_oye answers come from.
+#
+# A JattiInterpreter writes everything the program prints (chilla_we,
+# dikha_lambai) to its output sink, and asks its input provider for das_oye
+# answers:
+#
+#   JattiInterpreter(output=BufferSink(max_bytes=200_000),
+#                    input=ListInput(["Ravi", "21"]))
+#
+# Sinks have write(text) and flush():
+#
+#   StdoutSink    sys.stdout at the time of the write (the default, so
+#                 redirect_stdout() and swapped sys.stdout keep working)
+#   FileSink      any text file object
+#   BufferSink    collects the text in memory, optionally up to max_bytes of
+#                 UTF-8; what does not fit is dropped and truncated is set
+#   CallbackSink  hands every write to a callback, for streaming
+#
+# Input providers have read(prompt, output) and return the answer as a str:
+#
+#   StdinInput    prompts on the output sink and reads a line from stdin
+#   ListInput     answers from a list; the prompt and answer are echoed to the
+#                 output like a terminal would show them. Running out of
+#                 answers raises EOFError, as input() does at end of file.
+
+import sys
+
+
+class StdoutSink:
+    def write(self, text):
+        sys.stdout.write(text)
+
+    def flush(self):
+        sys.stdout.flush()
+
+
+class FileSink:
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, text):
+        self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+
+class BufferSink:
+    """Output kept in memory; max_bytes caps its UTF-8 size"""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+        self._parts = []
+
+    def write(self, text):
+        if self.truncated:
+            return
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+        if self.max_bytes is not None and self.size + size > self.max_bytes:
+            room = self.max_bytes - self.size
+            text = text.encode("utf-8")[:room].decode("utf-8", "ignore")
+            size = room
+            self.truncated = True
+        self._parts.append(text)
+        self.size += size
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+
+class CallbackSink:
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, text):
+        self.callback(text)
+
+    def flush(self):
+        pass
+
+
+class StdinInput:
+    def read(self, prompt, output):
+        output.write(prompt)
+        output.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        return line[:-1] if line.endswith("\n") else line
+
+
+class ListInput:
+    def __init__(self, answers):
+        self.answers = [str(answer) for answer in answers]
+        self._next = 0
+
+    def read(self, prompt, output):
+        if self._next >= len(self.answers):
+            raise EOFError("EOF when reading a line")
+        answer = self.answers[self._next]
+        self._next += 1
+        output.write(f"{prompt}{answer}\n")
+        return answer
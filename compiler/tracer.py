@@ -0,0 +1,126 @@
+# compiler/tracer.py
+# Call-stack tracer behind `jatti run --trace out.json`.
+#
+# A JattiInterpreter keeps the kaam call stack for error messages; while it
+# has a CallTracer, its push_function()/pop_function() also report every call
+# to it. Both engines go through those two methods (JattiFunction and
+# VMFunction), so the trace covers either; compiled mode runs Python
+# functions directly and is traced on the engine instead.
+#
+# Two files come out of one run:
+#
+#   out.json    Chrome trace_event format (chrome://tracing, Perfetto,
+#               speedscope): one complete ("X") event per call, with the call
+#               site line in args
+#   out.folded  collapsed stacks (`main;fib;fib 1234`, self time in
+#               microseconds) for flamegraph.pl, inferno or speedscope
+#
+# Stacks are counted in a tree keyed by kaam name, so deep recursion such as
+# fact(500) costs one dict lookup per call rather than a copy of the stack.
+# At most max_events calls are kept as trace events; the folded stacks always
+# cover the whole run.
+
+import json
+import os
+import time
+
+
+class CallTracer:
+    def __init__(self, clock=time.perf_counter, max_events=1_000_000):
+        self.clock = clock
+        self.max_events = max_events
+        self.events = []       # (name, call line, depth, start, duration)
+        self.dropped = 0
+        self.start = clock()
+        self.end = None
+        # Stack tree: name -> [self seconds, children]; one root for the program
+        self.root = [0.0, {}]
+        # Open calls: [name, call line, start, time in callees, tree node]
+        self._stack = [["main", 0, self.start, 0.0, self.root]]
+
+    def begin(self):
+        """Restart the clock of the root frame; JattiInterpreter.run() calls
+        this once the program is parsed, so main's time is execution only"""
+        self.start = self.clock()
+        self._stack[0][2] = self.start
+
+    def enter(self, name, line):
+        children = self._stack[-1][4][1]
+        node = children.get(name)
+        if node is None:
+            node = children[name] = [0.0, {}]
+        self._stack.append([name, line, self.clock(), 0.0, node])
+
+    def leave(self):
+        if len(self._stack) > 1:
+            self._close(self.clock())
+
+    def finish(self):
+        """Close the calls still open (the program stopped inside them) and the root"""
+        if self.end is not None:
+            return
+        now = self.clock()
+        while len(self._stack) > 1:
+            self._close(now)
+        _, _, start, callees, node = self._stack[0]
+        node[0] += (now - start) - callees
+        self.end = now
+
+    def _close(self, now):
+        name, line, start, callees, node = self._stack.pop()
+        elapsed = now - start
+        node[0] += elapsed - callees
+        self._stack[-1][3] += elapsed
+        if len(self.events) < self.max_events:
+            self.events.append((name, line, len(self._stack), start, elapsed))
+        else:
+            self.dropped += 1
+
+    # ---------------- output ----------------
+    def chrome_trace(self):
+        self.finish()
+        origin = self.start
+
+        def us(seconds):
+            return round(seconds * 1_000_000, 3)
+
+        events = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "jatti"}},
+            {"name": "main", "cat": "program", "ph": "X", "pid": 1, "tid": 1,
+             "ts": 0, "dur": us(self.end - origin)},
+        ]
+        for name, line, depth, start, duration in self.events:
+            events.append({
+                "name": name, "cat": "kaam", "ph": "X", "pid": 1, "tid": 1,
+                "ts": us(start - origin), "dur": us(duration),
+                "args": {"line": line, "depth": depth},
+            })
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if self.dropped:
+            trace["otherData"] = {"droppedEvents": self.dropped}
+        return trace
+
+    def folded_lines(self):
+        """Collapsed stacks with their self time in whole microseconds"""
+        self.finish()
+        out = []
+        pending = [("main", self.root)]
+        while pending:
+            path, (self_time, children) = pending.pop()
+            micros = round(self_time * 1_000_000)
+            if micros > 0:
+                out.append(f"{path} {micros}")
+            for name, child in children.items():
+                pending.append((f"{path};{name}", child))
+        out.sort()
+        return out
+
+    def write(self, path):
+        """Write the Chrome trace to path and the folded stacks next to it;
+        returns the folded file's path"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+        folded_path = os.path.splitext(path)[0] + ".folded"
+        with open(folded_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.folded_lines()) + "\n")
+        return folded_path
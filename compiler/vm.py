@@ -0,0 +1,716 @@
+# compiler/vm.py
+# Bytecode engine for Jatti, selected with `jatti run --engine=vm`.
+#
+# compile_program() turns the tree from compiler.parser into flat CodeUnits
+# (one for the program body, one per kaam) and execute() runs a unit in a
+# single dispatch loop over an explicit value stack. if chains, loops, break
+# and continue become jumps, and try/pakad becomes a block stack, so nothing
+# is walked recursively and no signal exceptions are raised for control flow.
+#
+# Expressions keep running as the code objects safe_eval caches: an
+# expression is one EVAL_CODE op (plain eval, no safe_eval wrapper), bare
+# names and constants load directly, and the shapes that dominate loops are
+# fused into superinstructions (COMPARE_JUMP for `a < b` conditions,
+# BINARY_STORE for `x ban a + b`, EVAL_STORE for other assignments). A Python
+# level op per AST node would cost more than CPython's own eval. Comparisons
+# that safe_eval splits textually stay EVAL ops through safe_eval, and errors
+# are mapped with the same expression_error, so both engines report the same
+# messages. Rarely used statements (pa_ander, das_oye, python_le_aa, ...) run
+# through the tree walker's executors.
+#
+# Statements only get an op of their own where a run asks for one: LINE in
+# --debug mode for the execution trace, and STEP while run() has
+# ExecutionLimits (compiler.limits). A limited run has a STEP per statement,
+# so it is dispatched right after the loop ops.
+
+import ast
+import builtins
+import operator
+
+from compiler.errors import roast_error
+from compiler.runtime import JattiException, get_compiled, process_string_escapes
+from compiler.core import BUILTIN_FUNCS, EXECUTORS, call_method
+from compiler.stdlib import LIST_TYPES
+from compiler.nodes import (
+    Invalid, Print, Assign, IndexAssign, Append, ShowLength, Copy, Clear,
+    Input, PythonImport, Global, FunctionDef, Return, Throw, Break, Continue,
+    If, While, ForEach, Try,
+)
+
+
+# ---------------- opcodes ----------------
+# Ordered roughly by how often they run; the dispatch loop tests them in
+# this order.
+OPNAMES = (
+    "EVAL_STORE", "BINARY_STORE", "COMPARE_JUMP", "JUMP", "STEP", "LOAD_NAME",
+    "LOAD_CONST", "EVAL_CODE", "STORE_NAME", "COMPARE_NUM", "POP_JUMP_IF_FALSE", "FOR_ITER",
+    "PRINT", "RETURN", "POP_TOP", "EVAL", "CALL_BUILTIN", "CHECK_KAAM",
+    "CALL_KAAM", "CALL_METHOD", "GET_ITER", "SETUP_TRY", "POP_TRY",
+    "POP_BLOCK", "CHECK_THROW", "THROW", "DEF_KAAM", "EXEC", "FAIL", "LINE",
+    "END",
+)
+(
+    EVAL_STORE, BINARY_STORE, COMPARE_JUMP, JUMP, STEP, LOAD_NAME,
+    LOAD_CONST, EVAL_CODE, STORE_NAME, COMPARE_NUM, POP_JUMP_IF_FALSE, FOR_ITER,
+    PRINT, RETURN, POP_TOP, EVAL, CALL_BUILTIN, CHECK_KAAM,
+    CALL_KAAM, CALL_METHOD, GET_ITER, SETUP_TRY, POP_TRY,
+    POP_BLOCK, CHECK_THROW, THROW, DEF_KAAM, EXEC, FAIL, LINE,
+    END,
+) = range(len(OPNAMES))
+
+# Ops that can be folded into a COMPARE_JUMP operand
+_OPERANDS = (LOAD_NAME, LOAD_CONST, EVAL_CODE)
+
+# `x ban a <op> b` with a name or constant on each side runs as one
+# BINARY_STORE instead of an eval
+_ARITHMETIC = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+# Returned by a kaam body that falls off the end
+_NO_RETURN = object()
+
+
+class CodeUnit:
+    """Flat bytecode for the program body or one kaam.
+
+    ops/args are parallel lists; lines[pc] is the source line of each
+    instruction and sources[pc] the normalized expression it belongs to
+    (None outside expressions), used to report errors like safe_eval does.
+    """
+    __slots__ = ("name", "params", "ops", "args", "lines", "sources")
+
+    def __init__(self, name, params=()):
+        self.name = name
+        self.params = list(params)
+        self.ops = []
+        self.args = []
+        self.lines = []
+        self.sources = []
+
+
+def disassemble(unit):
+    """Readable listing of a CodeUnit, for debugging the compiler"""
+    out = [f"{unit.name}({', '.join(unit.params)}):"]
+    for pc, (op, arg) in enumerate(zip(unit.ops, unit.args)):
+        shown = arg.name if isinstance(arg, CodeUnit) else arg
+        out.append(f"  {pc:4d}  line {unit.lines[pc]:<4d} {OPNAMES[op]:<16} {'' if shown is None else repr(shown)}")
+    return "\n".join(out)
+
+
+# ---------------- compiler ----------------
+def _operand(tree, code):
+    """Op loading one operand: names and constants directly, anything else via eval"""
+    if isinstance(tree, ast.Name):
+        return LOAD_NAME, tree.id
+    if isinstance(tree, ast.Constant):
+        return LOAD_CONST, tree.value
+    return EVAL_CODE, code
+
+
+def lower_expression(code, expressions):
+    """Ops that leave the value of a normalized expression on the stack;
+    expressions is the run's CompiledExpr cache"""
+    compiled = get_compiled(code, expressions)
+    if compiled.invalid:
+        return [(EVAL, code)]
+
+    tree = ast.parse(code.strip(), mode="eval").body
+    if compiled.left is None:
+        return [_operand(tree, compiled.code)]
+    if compiled.op is not None:
+        # Exactly `left op right`: same numeric check as safe_eval
+        return [
+            _operand(tree.left, compiled.left),
+            _operand(tree.comparators[0], compiled.right),
+            (COMPARE_NUM, compiled.op),
+        ]
+    # A comparison safe_eval splits textually; let it do exactly that
+    return [(EVAL, code)]
+
+
+def _simple_binary(code):
+    """(lop, lval, fn, rop, rval) for `a <op> b` over names/constants, else None"""
+    tree = ast.parse(code.strip(), mode="eval").body
+    if not isinstance(tree, ast.BinOp) or type(tree.op) not in _ARITHMETIC:
+        return None
+    sides = []
+    for side in (tree.left, tree.right):
+        op, arg = _operand(side, None)
+        if op == EVAL_CODE:
+            return None
+        sides.append((op, arg))
+    (lop, lval), (rop, rval) = sides
+    return lop, lval, _ARITHMETIC[type(tree.op)], rop, rval
+
+
+class _Compiler:
+    def __init__(self, interp, name, params=()):
+        self.interp = interp
+        self.unit = CodeUnit(name, params)
+        self.line = 0
+        self.source = None
+        self.blocks = 0    # try/pakad blocks open at this point
+        self.loops = []    # [continue_target, break_fixups, blocks_at_entry]
+
+    # ----- emitting -----
+    def emit(self, op, arg=None):
+        unit = self.unit
+        unit.ops.append(op)
+        unit.args.append(arg)
+        unit.lines.append(self.line)
+        unit.sources.append(self.source)
+        return len(unit.ops) - 1
+
+    def here(self):
+        return len(self.unit.ops)
+
+    def patch(self, pc, arg):
+        self.unit.args[pc] = arg
+
+    def fail(self, message, line=None):
+        self.emit(FAIL, (message, line or self.line))
+
+    # ----- expressions -----
+    def expr(self, expr):
+        """Leave the value of a parsed Expr on the stack"""
+        if expr.error:
+            self.fail(expr.error)
+            return
+
+        saved, self.source = self.source, expr.code
+        for op, arg in lower_expression(expr.code, self.interp.expressions):
+            self.emit(op, arg)
+        self.source = saved
+
+    def jump_unless(self, expr):
+        """Evaluate a condition and jump if it is false. Returns the jump pc"""
+        if not expr.error:
+            ops = lower_expression(expr.code, self.interp.expressions)
+            if len(ops) == 3 and ops[0][0] in _OPERANDS and ops[1][0] in _OPERANDS:
+                (lop, larg), (rop, rarg), (_, compare) = ops
+                saved, self.source = self.source, expr.code
+                pc = self.emit(COMPARE_JUMP, [lop, larg, rop, rarg, compare, None])
+                self.source = saved
+                return pc
+        self.expr(expr)
+        return self.emit(POP_JUMP_IF_FALSE)
+
+    def patch_jump(self, pc, target):
+        if self.unit.ops[pc] == COMPARE_JUMP:
+            self.unit.args[pc][5] = target
+        else:
+            self.unit.args[pc] = target
+
+    def store(self, expr, target):
+        """Evaluate expr into target, fused into one op where possible"""
+        if not expr.error:
+            ops = lower_expression(expr.code, self.interp.expressions)
+            if len(ops) == 1 and ops[0][0] == EVAL_CODE:
+                saved, self.source = self.source, expr.code
+                binary = _simple_binary(expr.code)
+                if binary is not None:
+                    self.emit(BINARY_STORE, binary + (target,))
+                else:
+                    self.emit(EVAL_STORE, (ops[0][1], target))
+                self.source = saved
+                return
+        self.expr(expr)
+        self.emit(STORE_NAME, target)
+
+    def value(self, expr):
+        """Like expr(), but a whole-expression builtin call gets builtin errors"""
+        call = expr.call
+        if call is not None and call.name in BUILTIN_FUNCS:
+            for arg in call.args:
+                self.expr(arg)
+            self.emit(CALL_BUILTIN, (call.name, len(call.args)))
+        else:
+            self.expr(expr)
+
+    # ----- statements -----
+    def block(self, nodes):
+        for node in nodes:
+            self.line = node.line
+            if self.interp.limits is not None:
+                self.emit(STEP)
+            if self.interp.debug:
+                self.emit(LINE)
+            STATEMENTS[type(node)](self, node)
+
+    def stmt_invalid(self, node):
+        self.fail(node.message, node.line)
+
+    def stmt_print(self, node):
+        self.value(node.expr)
+        self.emit(PRINT)
+
+    def stmt_assign(self, node):
+        expr = node.expr
+        call = expr.call
+        if call is not None and call.name in BUILTIN_FUNCS:
+            self.value(expr)
+            self.emit(STORE_NAME, node.target)
+            return
+
+        done = None
+        if call is not None:
+            # chal_oye x ban f(...): arity is checked before the arguments run
+            check = self.emit(CHECK_KAAM)
+            for arg in call.args:
+                self.expr(arg)
+            self.emit(CALL_KAAM, (call.name, len(call.args)))
+            self.emit(STORE_NAME, node.target)
+            done = self.emit(JUMP)
+            self.patch(check, (call.name, len(call.args), self.here()))
+
+        if node.method is not None:
+            self.emit(CALL_METHOD, node.method)
+            self.emit(STORE_NAME, node.target)
+        else:
+            self.store(expr, node.target)
+
+        if done is not None:
+            self.patch(done, self.here())
+
+    def stmt_if(self, node):
+        branches = node.branches
+        end_fixups = []
+        for k, branch in enumerate(branches):
+            self.line = branch.line
+            if branch.error:
+                self.fail(branch.error, branch.line)
+                break
+
+            skip = None
+            if branch.cond is not None:
+                skip = self.jump_unless(branch.cond)
+            self.block(branch.body)
+
+            # Later arms with syntax errors still roast after a matched arm
+            self.line = branch.line
+            later_error = next((b for b in branches[k + 1:] if b.error), None)
+            if later_error is not None:
+                self.fail(later_error.error, later_error.line)
+            elif k < len(branches) - 1:
+                end_fixups.append(self.emit(JUMP))
+
+            if skip is None:
+                break
+            self.patch_jump(skip, self.here())
+
+        for pc in end_fixups:
+            self.patch(pc, self.here())
+
+    def stmt_while(self, node):
+        if node.error:
+            self.fail(node.error, node.line)
+            return
+
+        top = self.here()
+        exit_jump = self.jump_unless(node.cond)
+
+        self.loops.append([top, [], self.blocks])
+        self.block(node.body)
+        _, breaks, _ = self.loops.pop()
+
+        self.line = node.line
+        self.emit(JUMP, top)
+        self.patch_jump(exit_jump, self.here())
+        for pc in breaks:
+            self.patch(pc, self.here())
+
+    def stmt_foreach(self, node):
+        if node.error:
+            self.fail(node.error, node.line)
+            return
+
+        self.value(node.iterable)
+        if node.body_error:
+            self.fail(node.body_error, node.line)
+            return
+
+        self.emit(GET_ITER, len(node.names) == 2)
+        top = self.emit(FOR_ITER)
+
+        self.loops.append([top, [], self.blocks])
+        self.block(node.body)
+        _, breaks, _ = self.loops.pop()
+
+        self.line = node.line
+        self.emit(JUMP, top)
+        # break leaves the iterator on the stack; normal exit pops it in FOR_ITER
+        if breaks:
+            for pc in breaks:
+                self.patch(pc, self.here())
+            self.emit(POP_TOP)
+        self.patch(top, (tuple(node.names), self.here()))
+
+    def stmt_try(self, node):
+        if node.error:
+            self.fail(node.error, node.error_line or node.line)
+            return
+
+        setup = self.emit(SETUP_TRY)
+        self.blocks += 1
+        self.block(node.body)
+        self.line = node.line
+        self.emit(POP_TRY)
+        skip_handler = self.emit(JUMP)
+
+        # Unwinding turns the try block into a handler block, which keeps
+        # IN_TRY raised while pakad runs (same as the tree walker)
+        self.patch(setup, (self.here(), node.catch_var))
+        self.block(node.handler)
+        self.line = node.line
+        self.emit(POP_BLOCK)
+        self.blocks -= 1
+        self.patch(skip_handler, self.here())
+
+    def stmt_return(self, node):
+        self.expr(node.expr)
+        self.emit(RETURN)
+
+    def stmt_throw(self, node):
+        self.emit(CHECK_THROW, node.expr is not None)
+        if node.expr is not None:
+            self.expr(node.expr)
+            self.emit(THROW)
+
+    def _jump_out_of_loop(self, keyword, is_break):
+        if not self.loops:
+            self.fail(f"{keyword} sirf loop vich allowed hai.")
+            return
+        loop = self.loops[-1]
+        for _ in range(self.blocks - loop[2]):
+            self.emit(POP_BLOCK)
+        if is_break:
+            loop[1].append(self.emit(JUMP))
+        else:
+            self.emit(JUMP, loop[0])
+
+    def stmt_break(self, node):
+        self._jump_out_of_loop("roko_oye_roko", True)
+
+    def stmt_continue(self, node):
+        self._jump_out_of_loop("chalo_oye_chalo", False)
+
+    def stmt_function_def(self, node):
+        self.emit(DEF_KAAM, compile_function(self.interp, node))
+
+    def stmt_exec(self, node):
+        self.emit(EXEC, node)
+
+
+STATEMENTS = {
+    Invalid: _Compiler.stmt_invalid,
+    Print: _Compiler.stmt_print,
+    Assign: _Compiler.stmt_assign,
+    If: _Compiler.stmt_if,
+    While: _Compiler.stmt_while,
+    ForEach: _Compiler.stmt_foreach,
+    Try: _Compiler.stmt_try,
+    Return: _Compiler.stmt_return,
+    Throw: _Compiler.stmt_throw,
+    Break: _Compiler.stmt_break,
+    Continue: _Compiler.stmt_continue,
+    FunctionDef: _Compiler.stmt_function_def,
+    # Rare statements run through the tree walker's executors
+    IndexAssign: _Compiler.stmt_exec,
+    Append: _Compiler.stmt_exec,
+    ShowLength: _Compiler.stmt_exec,
+    Copy: _Compiler.stmt_exec,
+    Clear: _Compiler.stmt_exec,
+    Input: _Compiler.stmt_exec,
+    PythonImport: _Compiler.stmt_exec,
+    Global: _Compiler.stmt_exec,
+}
+
+
+def compile_function(interp, node):
+    c = _Compiler(interp, node.name, node.params)
+    c.block(node.body)
+    c.emit(END)
+    return c.unit
+
+
+def compile_program(interp, program):
+    """Compile a parsed Program into the CodeUnit for its body"""
+    c = _Compiler(interp, "<program>")
+    c.block(program.body)
+    c.emit(END)
+    return c.unit
+
+
+# ---------------- runtime ----------------
+class VMFunction:
+    """A kaam compiled to a CodeUnit. Callable from expressions like JattiFunction."""
+
+    def __init__(self, interp, unit):
+        self.interp = interp
+        self.name = unit.name
+        self.params = unit.params
+        self.unit = unit
+
+    def __call__(self, *args):
+        interp = self.interp
+        if len(args) != len(self.params):
+            roast_error(
+                f"Function {self.name} expects {len(self.params)} args, got {len(args)}",
+                interp.current_line
+            )
+
+        call_line = interp.current_line
+        interp.push_function(self.name, call_line)
+        interp.push_frame(interp.Frame(zip(self.params, args)))
+        try:
+            result = execute(interp, self.unit)
+            if result is _NO_RETURN:
+                roast_error("wapas_kar missing hai.", call_line)
+        finally:
+            interp.pop_frame()
+            interp.pop_function()
+
+        interp.current_line = call_line
+        return result
+
+
+def _load_global(python_funcs, name):
+    """Name lookup after the scope misses: imports/kaams, then Python builtins"""
+    try:
+        return python_funcs[name]
+    except KeyError:
+        pass
+    try:
+        return getattr(builtins, name)
+    except AttributeError:
+        raise NameError(f"name '{name}' is not defined") from None
+
+
+def execute(interp, unit):
+    """Run a CodeUnit in the interpreter's current scope. Returns the wapas_kar value"""
+
+    ops, args, lines, sources = unit.ops, unit.args, unit.lines, unit.sources
+    scope = interp.scope
+    variables = interp.variables
+    functions = interp.functions
+    python_funcs = interp.python_funcs
+    global_vars = interp.global_vars
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    blocks = []     # [handler_pc, catch_var, stack_depth]; handler_pc None once in pakad
+    pc = 0
+
+    while True:
+        try:
+            while True:
+                op = ops[pc]
+                arg = args[pc]
+                pc += 1
+
+                if op == EVAL_STORE:
+                    code, name = arg
+                    interp.current_line = lines[pc - 1]
+                    if name in global_vars:
+                        variables[name] = eval(code, python_funcs, scope)
+                    else:
+                        scope[name] = eval(code, python_funcs, scope)
+                elif op == BINARY_STORE:
+                    lop, lval, fn, rop, rval, name = arg
+                    if lop == LOAD_NAME:
+                        try:
+                            lval = scope[lval]
+                        except KeyError:
+                            lval = _load_global(python_funcs, lval)
+                    if rop == LOAD_NAME:
+                        try:
+                            rval = scope[rval]
+                        except KeyError:
+                            rval = _load_global(python_funcs, rval)
+                    if name in global_vars:
+                        variables[name] = fn(lval, rval)
+                    else:
+                        scope[name] = fn(lval, rval)
+                elif op == COMPARE_JUMP:
+                    lop, lval, rop, rval, compare, target = arg
+                    interp.current_line = lines[pc - 1]
+                    if lop == LOAD_NAME:
+                        try:
+                            lval = scope[lval]
+                        except KeyError:
+                            lval = _load_global(python_funcs, lval)
+                    elif lop == EVAL_CODE:
+                        lval = eval(lval, python_funcs, scope)
+                    if rop == LOAD_NAME:
+                        try:
+                            rval = scope[rval]
+                        except KeyError:
+                            rval = _load_global(python_funcs, rval)
+                    elif rop == EVAL_CODE:
+                        rval = eval(rval, python_funcs, scope)
+                    if not isinstance(lval, (int, float)) or not isinstance(rval, (int, float)):
+                        interp.comparison_error()
+                    if not compare(lval, rval):
+                        pc = target
+                elif op == JUMP:
+                    pc = arg
+                elif op == STEP:
+                    interp.current_line = lines[pc - 1]
+                    interp.limits.tick()
+                elif op == LOAD_NAME:
+                    try:
+                        push(scope[arg])
+                    except KeyError:
+                        push(_load_global(python_funcs, arg))
+                elif op == LOAD_CONST:
+                    push(arg)
+                elif op == EVAL_CODE:
+                    interp.current_line = lines[pc - 1]
+                    push(eval(arg, python_funcs, scope))
+                elif op == STORE_NAME:
+                    if arg in global_vars:
+                        variables[arg] = pop()
+                    else:
+                        scope[arg] = pop()
+                elif op == COMPARE_NUM:
+                    rval = pop()
+                    lval = stack[-1]
+                    if not isinstance(lval, (int, float)) or not isinstance(rval, (int, float)):
+                        interp.current_line = lines[pc - 1]
+                        interp.comparison_error()
+                    stack[-1] = arg(lval, rval)
+                elif op == POP_JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == FOR_ITER:
+                    names, exit_pc = arg
+                    try:
+                        item = next(stack[-1])
+                    except StopIteration:
+                        pop()
+                        pc = exit_pc
+                        continue
+                    if len(names) == 1:
+                        if names[0] in global_vars:
+                            variables[names[0]] = item
+                        else:
+                            scope[names[0]] = item
+                    else:
+                        interp.set_var(names[0], item[0])
+                        interp.set_var(names[1], item[1])
+                elif op == PRINT:
+                    result = pop()
+                    if isinstance(result, str):
+                        result = process_string_escapes(f'"{result}"')
+                    interp.print(result)
+                elif op == RETURN:
+                    interp.in_try -= len(blocks)
+                    return pop()
+                elif op == POP_TOP:
+                    pop()
+                elif op == EVAL:
+                    interp.current_line = lines[pc - 1]
+                    push(interp.safe_eval(arg))
+                elif op == CALL_BUILTIN:
+                    name, argc = arg
+                    call_args = stack[len(stack) - argc:]
+                    del stack[len(stack) - argc:]
+                    interp.current_line = lines[pc - 1]
+                    try:
+                        push(BUILTIN_FUNCS[name](*call_args))
+                    except Exception as e:
+                        roast_error(f"Built-in function error: {str(e)}", interp.current_line)
+                elif op == CHECK_KAAM:
+                    name, argc, skip_pc = arg
+                    fn = functions.get(name)
+                    if fn is None:
+                        pc = skip_pc
+                    elif len(fn.params) != argc:
+                        roast_error("Function arguments ginti galat hai.", lines[pc - 1])
+                elif op == CALL_KAAM:
+                    name, argc = arg
+                    call_args = stack[len(stack) - argc:]
+                    del stack[len(stack) - argc:]
+                    interp.current_line = lines[pc - 1]
+                    push(functions[name](*call_args))
+                elif op == CALL_METHOD:
+                    interp.current_line = lines[pc - 1]
+                    push(call_method(interp, arg))
+                elif op == GET_ITER:
+                    iterable = pop()
+                    if arg:
+                        if not isinstance(iterable, dict):
+                            roast_error("har_ek key, value sirf map layi use hunda hai.", lines[pc - 1])
+                        push(iter(iterable.items()))
+                    else:
+                        if not isinstance(iterable, LIST_TYPES):
+                            roast_error("har_ek x sirf list layi use hunda hai.", lines[pc - 1])
+                        push(iter(iterable))
+                elif op == SETUP_TRY:
+                    handler_pc, catch_var = arg
+                    blocks.append([handler_pc, catch_var, len(stack)])
+                    interp.in_try += 1
+                elif op == POP_TRY or op == POP_BLOCK:
+                    blocks.pop()
+                    interp.in_try -= 1
+                elif op == CHECK_THROW:
+                    interp.current_line = lines[pc - 1]
+                    if interp.in_try == 0:
+                        roast_error("throw sirf try vich allowed hai.", interp.current_line)
+                    if not arg:
+                        roast_error("throw vich value chahidi hai.", interp.current_line)
+                elif op == THROW:
+                    raise JattiException(pop())
+                elif op == DEF_KAAM:
+                    fn = VMFunction(interp, arg)
+                    functions[fn.name] = fn
+                    python_funcs[fn.name] = fn
+                elif op == EXEC:
+                    interp.current_line = lines[pc - 1]
+                    EXECUTORS[type(arg)](interp, arg)
+                elif op == FAIL:
+                    message, line = arg
+                    interp.current_line = line
+                    roast_error(message, line)
+                elif op == LINE:
+                    interp.current_line = lines[pc - 1]
+                    interp.trace.record(lines[pc - 1])
+                elif op == END:
+                    return _NO_RETURN
+                else:
+                    raise RuntimeError(f"Unknown opcode {op}")
+
+        except Exception as exc:
+            failed = pc - 1
+            error = exc
+            if not isinstance(exc, JattiException) and sources[failed] is not None:
+                interp.current_line = lines[failed]
+                try:
+                    interp.expression_error(exc, sources[failed])
+                except JattiException as mapped:
+                    error = mapped
+
+            # Unwind to the innermost chal_koshish_karle of this frame
+            while blocks and blocks[-1][0] is None:
+                blocks.pop()
+                interp.in_try -= 1
+            if not blocks:
+                if error is exc:
+                    raise
+                raise error
+
+            block = blocks[-1]
+            handler_pc, catch_var, depth = block
+            block[0] = None
+            del stack[depth:]
+            if catch_var and isinstance(error, JattiException):
+                interp.set_var(catch_var, error.value)
+            pc = handler_pc
+
+
+def run_program(interp, program):
+    """Compile and run a parsed Program in the interpreter's global scope"""
+    execute(interp, compile_program(interp, program))
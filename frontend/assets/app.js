@@ -56,6 +56,53 @@ function appendOutput(text) {
   out.textContent = text;
 }
 
+function addOutput(text) {
+  $('output').appendChild(document.createTextNode(text));
+}
+
+// Calls onEvent(name, data) for each server-sent event in resp's body
+async function readEvents(resp, onEvent) {
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+
+    let end;
+    while ((end = buffered.indexOf('\n\n')) !== -1) {
+      const block = buffered.slice(0, end);
+      buffered = buffered.slice(end + 2);
+
+      let name = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) name = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      onEvent(name, JSON.parse(data));
+    }
+    if (done) return;
+  }
+}
+
+// Shows a streamed run as it happens; false if the stream broke off early
+async function showStream(resp) {
+  let finished = false;
+  appendOutput('');
+
+  await readEvents(resp, (name, data) => {
+    if (name === 'output') {
+      addOutput(data);
+    } else if (name === 'done') {
+      finished = true;
+      setStatus(data.success ? 'ok' : 'error', data.success ? 'ok' : 'error');
+    }
+  });
+  return finished;
+}
+
 const API_KEY_STORAGE_KEY = 'jatti.apiKey';
 
 function getApiKey() {
@@ -90,11 +137,26 @@ async function runCode(cm) {
     const headers = { 'Content-Type': 'application/json' };
     if (apiKey) headers['X-API-Key'] = apiKey;
 
-    const resp = await fetch('/api/run', {
+    const request = {
       method: 'POST',
       headers,
       body: JSON.stringify({ code: cm.getValue() }),
-    });
+    };
+
+    // Output arrives while the program runs; hosts without the streaming
+    // endpoint (e.g. the Vercel function) get the one-shot /api/run
+    let resp = await fetch('/api/run/stream', request);
+    if (resp.status === 404 || resp.status === 405) {
+      resp = await fetch('/api/run', request);
+    }
+
+    const type = resp.headers.get('Content-Type') || '';
+    if (resp.ok && type.startsWith('text/event-stream')) {
+      if (!(await showStream(resp))) {
+        setStatus('offline?', 'error');
+      }
+      return;
+    }
 
     const data = await resp.json().catch(() => null);
     if (!data) {
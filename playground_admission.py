@@ -0,0 +1,159 @@
+"""Admission control for the Jatti Playground.
+
+Every program runs in its own interpreter process, so the server bounds how
+many run at once instead of starting one per request. An AdmissionQueue
+grants up to `limit` slots; later requests wait their turn in a FIFO queue.
+
+- At most queue_depth requests wait; beyond that acquire() refuses at once.
+- A waiter that gets no slot within wait_timeout seconds gives up.
+- With per_client, one client (an IP address) can hold at most that many
+  slots and queue places together, so a single client cannot fill the queue
+  and starve everyone else.
+- retry_after() estimates how long until a refused request would fit, from
+  the average time a slot has been held, for the Retry-After header.
+
+playground_server.py keeps one queue in front of every backend; the backends
+in playground_pool.py use the same class (without clients) to hand out their
+workers and child processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+
+
+class AdmissionQueue:
+    """At most `limit` concurrent jobs, with a bounded FIFO queue of waiters"""
+
+    def __init__(self, limit: int, queue_depth: int, wait_timeout: float, per_client: int = 0) -> None:
+        self.limit = max(1, limit)
+        self.free = self.limit
+        self.queue_depth = max(0, queue_depth)
+        self.wait_timeout = wait_timeout
+        self.per_client = max(0, per_client)
+        self.closed = False
+        self._waiters: deque[asyncio.Future] = deque()
+        # client -> slots held plus places in the queue
+        self._clients: dict[str, int] = {}
+
+        self.admitted = 0
+        self.rejected_full = 0      # queue was full
+        self.rejected_client = 0    # the client already had per_client jobs
+        self.timed_out = 0          # waited wait_timeout without a slot
+
+        # For retry_after(): slot-seconds used by finished jobs
+        self._busy_time = 0.0
+        self._busy_since = time.monotonic()
+        self._finished = 0
+
+    @property
+    def running(self) -> int:
+        return self.limit - self.free
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, client: str | None = None) -> bool:
+        if self.closed:
+            return False
+        if client is not None and self.per_client:
+            if self._clients.get(client, 0) >= self.per_client:
+                self.rejected_client += 1
+                return False
+        if self.free > 0 and not self._waiters:
+            self._take()
+            self._hold(client)
+            return True
+        if len(self._waiters) >= self.queue_depth:
+            self.rejected_full += 1
+            return False
+
+        # release() hands its slot straight to the oldest waiter
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._hold(client)
+        granted = False
+        try:
+            granted = await asyncio.wait_for(waiter, self.wait_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+        finally:
+            if waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            elif not granted and waiter.result():
+                self._release_slot()    # handed a slot just as we were cancelled
+            if not granted:
+                self._drop(client)
+        if granted:
+            self.admitted += 1
+        return granted
+
+    def release(self, client: str | None = None) -> None:
+        self._drop(client)
+        self._finished += 1
+        self._release_slot()
+
+    def close(self) -> None:
+        self.closed = True
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(False)
+
+    def retry_after(self) -> int:
+        """Seconds a refused client should wait before trying again"""
+        self._tick()
+        if not self._finished:
+            return 1
+        average = self._busy_time / self._finished
+        return max(1, min(60, math.ceil(average * (self.queued + 1) / self.limit)))
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "running": self.running,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejectedFull": self.rejected_full,
+            "rejectedClient": self.rejected_client,
+            "timedOut": self.timed_out,
+        }
+
+    def _take(self) -> None:
+        self._tick()
+        self.free -= 1
+        self.admitted += 1
+
+    def _release_slot(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self._tick()
+        self.free += 1
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        self._busy_time += self.running * (now - self._busy_since)
+        self._busy_since = now
+
+    def _hold(self, client: str | None) -> None:
+        if client is not None:
+            self._clients[client] = self._clients.get(client, 0) + 1
+
+    def _drop(self, client: str | None) -> None:
+        if client is None:
+            return
+        count = self._clients.get(client, 0) - 1
+        if count > 0:
+            self._clients[client] = count
+        else:
+            self._clients.pop(client, None)
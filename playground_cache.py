@@ -0,0 +1,158 @@
+"""Result cache for /api/run.
+
+Most playground traffic is the built-in samples and tutorial snippets, run
+over and over. A deterministic program (see compiler/purity.py) prints the
+same output every time, so playground_server.py keeps its result keyed by a
+hash of the code and answers repeats without touching a worker.
+
+- Only successful runs are stored: errors end with a randomly picked roast
+  line, and a timeout depends on how busy the server was.
+- Memory holds the `size` most recently used results (LRU).
+- With a directory, results are also written there as small JSON files
+  (atomic rename), so they survive restarts and can be shared by several
+  server processes; at most disk_max files are kept, oldest first out.
+- Keys include a hash of the interpreter sources and the output cap, so
+  upgrading Jatti or changing JATTI_MAX_OUTPUT_BYTES never serves stale
+  output.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# (success, output, timed_out, truncated), as returned by _run_jatti()
+Result = tuple[bool, str, bool, bool]
+
+
+def _interpreter_hash() -> str:
+    digest = hashlib.sha256()
+    sources = sorted((REPO_ROOT / "compiler").glob("*.py"))
+    for path in sources + [REPO_ROOT / "playground_worker.py"]:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, size: int, directory: str | None = None, disk_max: int = 4096, salt: str = "") -> None:
+        self.size = max(0, size)
+        self.directory = Path(directory) if directory else None
+        self.disk_max = max(1, disk_max)
+        self._memory: OrderedDict[str, Result] = OrderedDict()
+        self._salt = f"{_interpreter_hash()}:{salt}".encode()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.impure = 0         # counted by the server: not cacheable
+        self.coalesced = 0      # counted by the server: joined an identical run
+        self.stores = 0
+
+        # Disk entries by last use, oldest first
+        self._disk: OrderedDict[str, None] = OrderedDict()
+        if self.directory is not None:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            except OSError:
+                files = []
+            self._disk.update((p.stem, None) for p in files)
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def key(self, code: str) -> str:
+        digest = hashlib.sha256(self._salt)
+        digest.update(code.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Result | None:
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return result
+
+        result = self._read(key)
+        if result is not None:
+            self._remember(key, result)
+            self.hits += 1
+            self.disk_hits += 1
+            return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: Result) -> None:
+        if not result[0]:
+            return
+        self._remember(key, result)
+        self._write(key, result)
+        self.stores += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "impure": self.impure,
+            "coalesced": self.coalesced,
+            "stores": self.stores,
+            "entries": len(self._memory),
+            "diskEntries": len(self._disk),
+        }
+
+    def _remember(self, key: str, result: Result) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.size:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> Result | None:
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            result = (bool(data["success"]), str(data["output"]), bool(data["timedOut"]), bool(data["truncated"]))
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self._disk.pop(key, None)
+            return None
+        self._disk[key] = None     # may have been written by another server
+        self._disk.move_to_end(key)
+        return result
+
+    def _write(self, key: str, result: Result) -> None:
+        if self.directory is None:
+            return
+        success, output, timed_out, truncated = result
+        data = {"success": success, "output": output, "timedOut": timed_out, "truncated": truncated}
+        try:
+            fd, tmp = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=self.directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.directory / f"{key}.json")
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            return   # read-only or full disk: memory still has it
+
+        self._disk[key] = None
+        self._disk.move_to_end(key)
+        while len(self._disk) > self.disk_max:
+            old, _ = self._disk.popitem(last=False)
+            try:
+                (self.directory / f"{old}.json").unlink()
+            except OSError:
+                pass
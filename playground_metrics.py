@@ -0,0 +1,137 @@
+"""Prometheus metrics for the Jatti Playground.
+
+GET /metrics returns everything registered here in the Prometheus text
+exposition format (version 0.0.4), so no client library is needed.
+
+- Counter and Histogram are updated by playground_server.py as requests
+  are handled. The server runs on a single event loop thread, so an update
+  is a dict lookup and an addition: no locks.
+- Sampled metrics read a value that is already kept elsewhere (cache hits,
+  slots in use, ...) only when /metrics is scraped, so the hot path pays
+  nothing for them.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from typing import Callable, Union
+
+
+# Request latencies, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# A sample function returns a single value, or values by label values
+Sample = Callable[[], Union[float, dict[tuple, float]]]
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: dict[tuple, float] = {} if labels else {(): 0}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def lines(self) -> list[str]:
+        return [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in self.values.items()]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (not cumulative) plus +Inf, sum]
+        self.values: dict[tuple, list] = {} if labels else {(): [[0] * (len(self.buckets) + 1), 0.0]}
+
+    def observe(self, value: float, *labels) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def lines(self) -> list[str]:
+        out = []
+        for key, (counts, total) in self.values.items():
+            running = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                running += count
+                bucket = _labels(self.labels + ("le",), key + (_number(bound),))
+                out.append(f"{self.name}_bucket{bucket} {running}")
+            out.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            out.append(f"{self.name}_count{_labels(self.labels, key)} {running}")
+        return out
+
+
+class Sampled:
+    """A counter or gauge whose value is read from fn() at scrape time"""
+
+    def __init__(self, name: str, kind: str, help: str, fn: Sample, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.fn = fn
+        self.labels = labels
+
+    def lines(self) -> list[str]:
+        value = self.fn()
+        values = value if isinstance(value, dict) else {(): value}
+        return [f"{self.name}{_labels(self.labels, key)} {_number(v)}" for key, v in values.items()]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list[Counter | Histogram | Sampled] = []
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def gauge_fn(self, name: str, help: str, fn: Sample, labels: tuple[str, ...] = ()) -> Sampled:
+        return self._add(Sampled(name, "gauge", help, fn, labels))
+
+    def counter_fn(self, name: str, help: str, fn: Sample, labels: tuple[str, ...] = ()) -> Sampled:
+        return self._add(Sampled(name, "counter", help, fn, labels))
+
+    def render(self) -> bytes:
+        out = []
+        for metric in self.metrics:
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+        return ("\n".join(out) + "\n").encode("utf-8")
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
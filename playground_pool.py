@@ -0,0 +1,360 @@
+"""Execution backends for the Jatti Playground: warm pool and fork server.
+
+Starting `python playground_worker.py` and importing compiler.core costs more
+than running a typical playground program, so playground_server.py keeps a
+pool of long-lived `playground_worker.py --serve` processes instead of
+starting one per request.
+
+- Each worker runs one program at a time; compiler.core.run() resets the
+  interpreter state between programs.
+- A worker is replaced after max_jobs programs, when it crashes, when a
+  program times out, and when a program's output hits the byte cap (the
+  process is killed in those cases, like the one-shot worker).
+- Requests wait for a free worker in a bounded queue; when queue_depth
+  requests are already waiting, or no worker frees up within wait_timeout
+  seconds, run() returns None and the server answers 503.
+
+ForkServer is the alternative: each program runs in a child forked from one
+preloaded zygote process (JATTI_EXEC_BACKEND=fork).
+
+Both backends are asyncio-native: playground_server.py awaits run() on its
+event loop, so a request waiting for its program holds no thread.
+ForkServer is POSIX only (fork() and descriptor passing).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from playground_admission import AdmissionQueue
+
+
+REPO_ROOT = Path(__file__).resolve().parent
+WORKER_PY = REPO_ROOT / "playground_worker.py"
+
+# Receives each piece of output as it arrives (streaming runs)
+OnOutput = Callable[[bytes], Awaitable[None]]
+
+# A fresh worker's first program also waits for its imports, up to this long;
+# the program's own timeout starts once the worker reports ready
+STARTUP_TIMEOUT_SEC = 10.0
+
+
+class JobResult:
+    __slots__ = ("output", "status", "timed_out", "truncated")
+
+    def __init__(self, output: bytes, status: int | None, timed_out: bool, truncated: bool):
+        self.output = output          # empty when the output was streamed
+        self.status = status          # None if the worker died mid-program
+        self.timed_out = timed_out
+        self.truncated = truncated
+
+    @property
+    def reusable(self) -> bool:
+        return self.status is not None and not self.timed_out and not self.truncated
+
+
+class _FrameReader:
+    """Parses the worker frame protocol (see playground_worker.py) from a stream"""
+
+    def __init__(self, reader: asyncio.StreamReader, ready: bool) -> None:
+        self.reader = reader
+        self.ready = ready
+
+    async def read_job(self, timeout: float, max_output: int, on_output: OnOutput | None = None) -> JobResult:
+        """Collect one program's output, or pass it to on_output as it arrives"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout + (0 if self.ready else STARTUP_TIMEOUT_SEC)
+        out = bytearray()
+        size = 0
+
+        try:
+            while True:
+                header = await asyncio.wait_for(self.reader.readline(), deadline - loop.time())
+                if not header.endswith(b"\n"):
+                    return JobResult(bytes(out), None, False, False)
+                kind, _, arg = header[:-1].partition(b" ")
+                if kind == b"R":
+                    self.ready = True
+                    deadline = loop.time() + timeout
+                    continue
+                if kind == b"D":
+                    return JobResult(bytes(out), int(arg), False, False)
+                chunk = await asyncio.wait_for(
+                    self.reader.readexactly(int(arg)), deadline - loop.time()
+                )
+                truncated = size + len(chunk) > max_output
+                if truncated:
+                    chunk = chunk[:max_output - size]
+                size += len(chunk)
+                if on_output is None:
+                    out += chunk
+                elif chunk:
+                    await on_output(chunk)
+                if truncated:
+                    return JobResult(bytes(out), 0, False, True)
+        except asyncio.TimeoutError:
+            return JobResult(bytes(out), 0, True, False)
+        except asyncio.IncompleteReadError:
+            return JobResult(bytes(out), None, False, False)
+
+
+class Worker:
+    """One `playground_worker.py --serve` process"""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self.proc = proc
+        self.jobs = 0
+        self._reader = _FrameReader(proc.stdout, ready=False)
+
+    @classmethod
+    async def spawn(cls) -> Worker:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(WORKER_PY),
+            "--serve",
+            cwd=str(REPO_ROOT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        return cls(proc)
+
+    @property
+    def ready(self) -> bool:
+        return self._reader.ready
+
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def run(self, code: str, timeout: float, max_output: int, on_output: OnOutput | None = None) -> JobResult:
+        self.jobs += 1
+        data = code.encode("utf-8", "replace")
+        try:
+            self.proc.stdin.write(b"%d\n" % len(data) + data)
+            # A worker that is still importing reads the request once it is ready
+            await asyncio.wait_for(self.proc.stdin.drain(), timeout + STARTUP_TIMEOUT_SEC)
+        except (BrokenPipeError, ConnectionResetError):
+            return JobResult(b"", None, False, False)
+        except asyncio.TimeoutError:
+            return JobResult(b"", 0, True, False)
+        return await self._reader.read_job(timeout, max_output, on_output)
+
+    async def stop(self) -> None:
+        try:
+            self.proc.kill()
+        except ProcessLookupError:
+            pass
+        try:
+            await asyncio.wait_for(self.proc.wait(), 1)
+        except asyncio.TimeoutError:
+            pass
+
+
+class WorkerPool:
+    def __init__(self, size: int, max_jobs: int, queue_depth: int, wait_timeout: float) -> None:
+        self.size = size
+        self.max_jobs = max(1, max_jobs)
+        self._slots = AdmissionQueue(size, queue_depth, wait_timeout)
+        # FIFO, so replacement workers (still importing) are picked last
+        self._idle: deque[Worker] = deque()
+
+    @property
+    def capacity(self) -> int:
+        return self._slots.limit
+
+    @property
+    def busy(self) -> int:
+        return self._slots.running
+
+    async def start(self) -> None:
+        """Start the workers; they import the compiler while waiting for work"""
+        for _ in range(self.size):
+            self._idle.append(await Worker.spawn())
+
+    async def close(self) -> None:
+        self._slots.close()
+        workers, self._idle = list(self._idle), deque()
+        for worker in workers:
+            await worker.stop()
+
+    async def _release(self, worker: Worker, reusable: bool) -> None:
+        if not reusable or worker.jobs >= self.max_jobs or not worker.alive():
+            await worker.stop()
+            worker = await Worker.spawn()
+        if self._slots.closed:
+            await worker.stop()
+            return
+        self._idle.append(worker)
+        self._slots.release()
+
+    async def run(
+        self, code: str, timeout: float, max_output: int, on_output: OnOutput | None = None
+    ) -> JobResult | None:
+        """Run code on a free worker; None when the pool is saturated"""
+        if not await self._slots.acquire():
+            return None
+        # Every held slot has an idle worker behind it
+        worker = self._idle.popleft() if self._idle else await Worker.spawn()
+
+        result = None
+        try:
+            if not worker.alive():
+                await worker.stop()
+                worker = await Worker.spawn()
+            result = await worker.run(code, timeout, max_output, on_output)
+            return result
+        finally:
+            await self._release(worker, result is not None and result.reusable)
+
+
+class ForkServer:
+    """Runs each program in a child forked from one preloaded zygote process.
+
+    The zygote (`playground_worker.py --zygote`) imports the compiler once;
+    fork() then hands every request a fresh process that shares that heap
+    copy-on-write, so there is nothing to recycle and no state can leak from
+    one program to the next. At most max_children programs run at once, with
+    the same bounded wait queue as WorkerPool.
+    """
+
+    def __init__(self, max_children: int, queue_depth: int, wait_timeout: float) -> None:
+        self._slots = AdmissionQueue(max_children, queue_depth, wait_timeout)
+        self._lock = asyncio.Lock()       # one fork request on the socket at a time
+        self._proc: asyncio.subprocess.Process | None = None
+        self._sock: socket.socket | None = None
+
+    @property
+    def capacity(self) -> int:
+        return self._slots.limit
+
+    @property
+    def busy(self) -> int:
+        return self._slots.running
+
+    async def start(self) -> None:
+        async with self._lock:
+            await self._ensure_zygote()
+
+    async def _ensure_zygote(self) -> None:
+        if self._proc is not None and self._proc.returncode is None:
+            return
+        await self._stop_zygote()
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(WORKER_PY),
+                "--zygote",
+                str(theirs.fileno()),
+                cwd=str(REPO_ROOT),
+                stdin=asyncio.subprocess.DEVNULL,
+                pass_fds=(theirs.fileno(),),
+            )
+        finally:
+            theirs.close()
+        ours.setblocking(False)
+        self._sock = ours
+
+    async def _stop_zygote(self) -> None:
+        if self._sock is not None:
+            self._sock.close()      # the zygote exits when its socket closes
+            self._sock = None
+        if self._proc is not None:
+            try:
+                await asyncio.wait_for(self._proc.wait(), 1)
+            except asyncio.TimeoutError:
+                self._proc.kill()
+            self._proc = None
+
+    async def close(self) -> None:
+        self._slots.close()
+        async with self._lock:
+            await self._stop_zygote()
+
+    async def _fork(self, code_fd: int, out_fd: int) -> tuple[int, socket.socket] | None:
+        """Ask the zygote for a child reading code_fd and writing out_fd; its
+        pid and the socket of the zygote that forked it"""
+        async with self._lock:
+            if self._slots.closed:
+                return None
+            await self._ensure_zygote()
+            try:
+                # Requests go one at a time, so this tiny message never blocks
+                socket.send_fds(self._sock, [b"run"], [code_fd, out_fd])
+                # The zygote may still be importing; wait for it like a fresh worker
+                reply = await asyncio.wait_for(
+                    asyncio.get_running_loop().sock_recv(self._sock, 32), STARTUP_TIMEOUT_SEC
+                )
+            except (OSError, asyncio.TimeoutError):
+                reply = b""
+            if not reply:
+                await self._stop_zygote()
+                return None
+            return int(reply), self._sock
+
+    def _kill(self, pid: int, zygote: socket.socket) -> None:
+        """Have the zygote SIGKILL its child pid.
+
+        Only the parent may signal by pid: the zygote reaps its children
+        itself, so here the number may already belong to another process.
+        """
+        if zygote is not self._sock:
+            return      # that zygote is gone and killed its children on the way out
+        try:
+            # No reply, so this cannot get in the way of a _fork() waiting for one
+            zygote.send(b"kill %d" % pid)
+        except OSError:
+            pass
+
+    async def run(
+        self, code: str, timeout: float, max_output: int, on_output: OnOutput | None = None
+    ) -> JobResult | None:
+        """Run code in a fresh child; None when max_children are already busy"""
+        if not await self._slots.acquire():
+            return None
+        try:
+            return await self._run_child(code, timeout, max_output, on_output)
+        finally:
+            self._slots.release()
+
+    async def _run_child(self, code: str, timeout: float, max_output: int, on_output: OnOutput | None) -> JobResult:
+        code_r, code_w = os.pipe()
+        out_r, out_w = os.pipe()
+        try:
+            child = await self._fork(code_r, out_w)
+        finally:
+            os.close(code_r)
+            os.close(out_w)
+        if child is None:
+            os.close(code_w)
+            os.close(out_r)
+            return JobResult(b"", None, False, False)
+
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        output, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), open(out_r, "rb", buffering=0)
+        )
+        result = None
+        try:
+            # The transport keeps writing in the background and closes the
+            # pipe once the child has read the whole program
+            program, _ = await loop.connect_write_pipe(
+                asyncio.Protocol, open(code_w, "wb", buffering=0)
+            )
+            program.write(code.encode("utf-8", "replace"))
+            program.close()
+
+            result = await _FrameReader(reader, ready=True).read_job(timeout, max_output, on_output)
+            return result
+        finally:
+            output.close()
+            # Also when on_output failed (the client went away)
+            if result is None or not result.reusable:
+                self._kill(*child)
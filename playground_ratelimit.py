@@ -0,0 +1,71 @@
+"""Token-bucket rate limiting for the Jatti Playground.
+
+Every client key (an IP address, or an API key) owns a bucket that holds up
+to `burst` tokens and refills at `rate` tokens per second; a request spends
+one token. Checking a request is O(1): the bucket is refilled from the time
+elapsed since its last use, never by walking a history of timestamps.
+
+The table is bounded. Buckets live in an LRU per shard; adding a key to a
+full shard evicts its least recently used bucket, and every check also drops
+the oldest bucket once it has been idle long enough to be full again (a full
+bucket is the same as no bucket at all). Keys are spread over shards that
+each have their own lock, so threads checking different clients do not
+contend on a single lock.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> [tokens, last refill time], least recently used first
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate: float, burst: float, max_keys: int = 100_000, shards: int = 16) -> None:
+        self.rate = max(0.0, rate)
+        self.burst = max(0.0, burst)
+        self.shards = [_Shard() for _ in range(max(1, shards))]
+        self.per_shard = max(1, -(-max(1, max_keys) // len(self.shards)))
+        # Idle this long and a bucket is full again
+        self.idle_sec = self.burst / self.rate if self.rate > 0 else float("inf")
+
+    def allow(self, key: str, now: float | None = None) -> bool:
+        """Spend one token from key's bucket; False if it is empty"""
+        if now is None:
+            now = time.monotonic()
+        shard = self.shards[hash(key) % len(self.shards)]
+
+        with shard.lock:
+            buckets = shard.buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                buckets[key] = bucket
+                if len(buckets) > self.per_shard:
+                    buckets.popitem(last=False)
+            else:
+                buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            # Drop the oldest bucket once it has refilled
+            oldest_key = next(iter(buckets))
+            if oldest_key != key and now - buckets[oldest_key][1] >= self.idle_sec:
+                del buckets[oldest_key]
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+            return False
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self.shards)
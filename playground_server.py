@@ -2,7 +2,11 @@
 """Jatti Playground server.
 
 - Serves the static UI from ./frontend
-- Exposes POST /api/run to execute Jatti code without writing files
+- Exposes POST /api/run to execute Jatti code without writing files, and
+  POST /api/run/stream to get its output as server-sent events while it runs
+- GET /metrics reports request, queue and backend metrics for Prometheus
+- HTTP/1.1 with keep-alive on a single asyncio event loop; programs run in
+  separate processes (playground_pool.py), so waiting on them blocks nothing
 
 Run:
   python playground_server.py
@@ -16,18 +20,26 @@ Security:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import codecs
 import json
 import mimetypes
 import os
-import subprocess
 import sys
-import time
-from collections import deque
+from email.utils import formatdate
+from html import escape
 from http import HTTPStatus
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.server import DEFAULT_ERROR_CONTENT_TYPE, DEFAULT_ERROR_MESSAGE
 from pathlib import Path
 from urllib.parse import urlparse
 
+from compiler.purity import is_deterministic_source
+from playground_admission import AdmissionQueue
+from playground_cache import ResultCache
+from playground_metrics import Registry
+from playground_pool import ForkServer, OnOutput, WorkerPool
+from playground_ratelimit import TokenBucketLimiter
+
 
 REPO_ROOT = Path(__file__).resolve().parent
 FRONTEND_DIR = REPO_ROOT / "frontend"
@@ -86,111 +98,208 @@ MAX_CODE_BYTES = _get_env_int("JATTI_MAX_CODE_BYTES", 200_000)
 MAX_OUTPUT_BYTES = _get_env_int("JATTI_MAX_OUTPUT_BYTES", 200_000)
 RUN_TIMEOUT_SEC = float(os.environ.get("JATTI_TIMEOUT_SEC", "2.5").strip() or 2.5)
 
-# Simple fixed-window rate limiting: N requests per window seconds, per IP
-RATE_WINDOW_SEC = float(os.environ.get("JATTI_RATE_WINDOW_SEC", "10").strip() or 10)
+# Token-bucket rate limiting (playground_ratelimit.py), per IP: bursts of up
+# to N requests, refilled at N per window seconds
+RATE_WINDOW_SEC = max(0.001, float(os.environ.get("JATTI_RATE_WINDOW_SEC", "10").strip() or 10))
 RATE_MAX_REQ = _get_env_int("JATTI_RATE_MAX_REQ", 30)
-_RATE: dict[str, deque[float]] = {}
-
-
-def _client_ip(handler: BaseHTTPRequestHandler) -> str:
+# Optional second budget per API key (0 = off), on top of the per-IP one
+RATE_KEY_MAX_REQ = _get_env_int("JATTI_RATE_KEY_MAX_REQ", 0)
+# Most clients the limiter remembers at once
+RATE_MAX_KEYS = _get_env_int("JATTI_RATE_MAX_KEYS", 100_000)
+_RATE = TokenBucketLimiter(RATE_MAX_REQ / RATE_WINDOW_SEC, RATE_MAX_REQ, RATE_MAX_KEYS)
+_KEY_RATE = TokenBucketLimiter(RATE_KEY_MAX_REQ / RATE_WINDOW_SEC, RATE_KEY_MAX_REQ, RATE_MAX_KEYS)
+
+# Execution backend (playground_pool.py):
+# - pool: warm playground_worker.py --serve processes (JATTI_POOL_SIZE=0 means
+#   subprocess)
+# - fork: one child per request, forked from a preloaded zygote process
+# - subprocess: start one playground_worker.py per request (the default where
+#   select() cannot watch pipes and fork() is missing, i.e. Windows)
+EXEC_BACKEND = (os.environ.get("JATTI_EXEC_BACKEND", "").strip().lower()
+                or ("pool" if os.name == "posix" else "subprocess"))
+POOL_SIZE = _get_env_int("JATTI_POOL_SIZE", 2 if os.name == "posix" else 0)
+POOL_MAX_JOBS = _get_env_int("JATTI_POOL_MAX_JOBS", 100)
+POOL_QUEUE_DEPTH = _get_env_int("JATTI_POOL_QUEUE_DEPTH", 16)
+POOL_WAIT_SEC = float(os.environ.get("JATTI_POOL_WAIT_SEC", "10").strip() or 10)
+FORK_MAX_CHILDREN = _get_env_int("JATTI_FORK_MAX_CHILDREN", 8)
+_POOL: WorkerPool | ForkServer | None = None
+
+
+def _backend_capacity() -> int:
+    if EXEC_BACKEND == "fork" and hasattr(os, "fork"):
+        return FORK_MAX_CHILDREN
+    if EXEC_BACKEND == "pool" and POOL_SIZE > 0:
+        return POOL_SIZE
+    return os.cpu_count() or 2
+
+
+# Admission control (playground_admission.py), in front of every backend: at
+# most RUN_MAX_CONCURRENT programs at once, then a FIFO queue of
+# RUN_QUEUE_DEPTH requests waiting up to RUN_QUEUE_WAIT_SEC; the rest get 503
+# with Retry-After. One client may hold RUN_MAX_PER_CLIENT running or queued
+# runs (0 = no cap). The JATTI_POOL_* names are the older spelling.
+RUN_MAX_CONCURRENT = _get_env_int("JATTI_RUN_MAX_CONCURRENT", _backend_capacity())
+RUN_QUEUE_DEPTH = _get_env_int("JATTI_RUN_QUEUE_DEPTH", POOL_QUEUE_DEPTH)
+RUN_QUEUE_WAIT_SEC = float(os.environ.get("JATTI_RUN_QUEUE_WAIT_SEC", "").strip() or POOL_WAIT_SEC)
+RUN_MAX_PER_CLIENT = _get_env_int("JATTI_RUN_MAX_PER_CLIENT", 4)
+ADMISSION = AdmissionQueue(RUN_MAX_CONCURRENT, RUN_QUEUE_DEPTH, RUN_QUEUE_WAIT_SEC, RUN_MAX_PER_CLIENT)
+
+# Results of deterministic programs (playground_cache.py). Size 0 disables the
+# cache; a directory adds an on-disk layer shared across restarts.
+RESULT_CACHE = ResultCache(
+    _get_env_int("JATTI_RESULT_CACHE_SIZE", 256),
+    os.environ.get("JATTI_RESULT_CACHE_DIR", "").strip() or None,
+    _get_env_int("JATTI_RESULT_CACHE_DISK_MAX", 4096),
+    salt=str(MAX_OUTPUT_BYTES),
+)
+# Runs in progress by cache key, so identical programs submitted together
+# share one run
+_INFLIGHT: dict[str, asyncio.Future] = {}
+
+# Prometheus metrics (playground_metrics.py), served at GET /metrics
+METRICS = Registry()
+_REQUESTS = METRICS.counter(
+    "jatti_http_requests_total", "HTTP requests answered, by route, method and status", ("route", "method", "status")
+)
+_REQUEST_SECONDS = METRICS.histogram(
+    "jatti_http_request_duration_seconds", "Time from request head to the end of the response", ("route",)
+)
+_QUEUE_SECONDS = METRICS.histogram("jatti_run_queue_wait_seconds", "Time a run waited for an admission slot")
+_RUN_SECONDS = METRICS.histogram("jatti_run_duration_seconds", "Time a program spent on the execution backend")
+_RUNS = METRICS.counter("jatti_runs_total", "Programs started on the execution backend")
+_TIMEOUTS = METRICS.counter("jatti_run_timeouts_total", "Programs stopped after JATTI_TIMEOUT_SEC")
+_TRUNCATIONS = METRICS.counter("jatti_run_truncations_total", "Programs whose output was cut at JATTI_MAX_OUTPUT_BYTES")
+_CRASHES = METRICS.counter("jatti_worker_crashes_total", "Workers that died before finishing a program")
+_RATE_LIMITED = METRICS.counter("jatti_rate_limited_total", "Requests refused by a rate limit", ("limit",))
+METRICS.counter_fn(
+    "jatti_run_rejected_total",
+    "Runs refused by admission control",
+    lambda: {
+        ("queue_full",): ADMISSION.rejected_full,
+        ("per_client",): ADMISSION.rejected_client,
+        ("wait_timeout",): ADMISSION.timed_out,
+    },
+    ("reason",),
+)
+METRICS.gauge_fn("jatti_run_slots", "Programs allowed to run at once", lambda: ADMISSION.limit)
+METRICS.gauge_fn("jatti_run_slots_busy", "Programs running now", lambda: ADMISSION.running)
+METRICS.gauge_fn("jatti_run_queue_length", "Runs waiting for a slot", lambda: ADMISSION.queued)
+METRICS.gauge_fn(
+    "jatti_backend_capacity", "Workers or child processes the backend has", lambda: _POOL.capacity if _POOL else ADMISSION.limit
+)
+METRICS.gauge_fn("jatti_backend_busy", "Workers or child processes in use", lambda: _POOL.busy if _POOL else ADMISSION.running)
+METRICS.counter_fn("jatti_result_cache_hits_total", "Runs answered from the result cache", lambda: RESULT_CACHE.hits)
+METRICS.counter_fn("jatti_result_cache_disk_hits_total", "Cache hits read from disk", lambda: RESULT_CACHE.disk_hits)
+METRICS.counter_fn("jatti_result_cache_misses_total", "Cache lookups that found nothing", lambda: RESULT_CACHE.misses)
+METRICS.counter_fn("jatti_result_cache_impure_total", "Programs not cacheable", lambda: RESULT_CACHE.impure)
+METRICS.counter_fn("jatti_result_cache_coalesced_total", "Requests that joined an identical run", lambda: RESULT_CACHE.coalesced)
+METRICS.gauge_fn("jatti_result_cache_entries", "Results held in memory", lambda: RESULT_CACHE.stats()["entries"])
+
+# HTTP: idle keep-alive connections (and slow request heads) are closed after
+# this many seconds
+KEEPALIVE_SEC = float(os.environ.get("JATTI_KEEPALIVE_SEC", "15").strip() or 15)
+MAX_HEADER_BYTES = 64 * 1024
+SERVER_VERSION = "JattiPlayground/0.2"
+
+
+def _client_ip(request: Request) -> str:
     # If you run behind a reverse proxy, set it up to pass X-Forwarded-For.
-    xff = handler.headers.get("X-Forwarded-For")
+    xff = request.headers.get("x-forwarded-for")
     if xff:
         return xff.split(",", 1)[0].strip()
-    return handler.client_address[0]
+    return request.peer
 
 
-def _rate_ok(ip: str) -> bool:
-    now = time.time()
-    q = _RATE.get(ip)
-    if q is None:
-        q = deque()
-        _RATE[ip] = q
-    # Drop old timestamps
-    while q and (now - q[0]) > RATE_WINDOW_SEC:
-        q.popleft()
-    if len(q) >= RATE_MAX_REQ:
-        return False
-    q.append(now)
-    return True
+async def _pump_subprocess(code: str, on_output: OnOutput | None = None) -> tuple[bytes, int, bool, bool]:
+    """Run code in a fresh playground_worker.py and collect its raw output
+    (or pass it to on_output as it arrives).
 
+    Returns as soon as the worker closes its output, at the byte cap, or at
+    the monotonic deadline, whichever comes first.
 
-def _run_jatti_subprocess(code: str) -> tuple[bool, str, bool, bool]:
-    """Run Jatti code in a subprocess.
-
-    Returns: (success, output, timed_out, truncated)
+    Returns: (output, status, timed_out, truncated), status being the
+    worker's exit code (see playground_worker.py), or 0 if it was stopped
     """
-    if not WORKER_PY.exists():
-        return False, "Server misconfigured: playground_worker.py missing", False, False
-
-    proc = subprocess.Popen(
-        [sys.executable, str(WORKER_PY)],
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(WORKER_PY),
         cwd=str(REPO_ROOT),
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
     )
-
     assert proc.stdin is not None
     assert proc.stdout is not None
 
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + RUN_TIMEOUT_SEC
     timed_out = False
     truncated = False
-    out_chunks: list[str] = []
-    out_len = 0
+    finished = False
+    out = bytearray()
+    size = 0
 
     try:
-        proc.stdin.write(code)
-        proc.stdin.close()
+        # The worker reads all of stdin before it runs anything
+        proc.stdin.write(code.encode("utf-8", "replace"))
+        try:
+            await asyncio.wait_for(proc.stdin.drain(), RUN_TIMEOUT_SEC)
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # died early; whatever it printed is still read below
 
-        start = time.time()
-        # Read output incrementally so we can cap size
         while True:
-            if proc.poll() is not None:
-                # Drain remaining output
-                remainder = proc.stdout.read()
-                if remainder:
-                    take = remainder
-                    if out_len + len(take.encode("utf-8", "ignore")) > MAX_OUTPUT_BYTES:
-                        # Approx cap: slice by characters; good enough for UI
-                        truncated = True
-                        take = take[: max(0, MAX_OUTPUT_BYTES - out_len)]
-                    out_chunks.append(take)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            chunk = await asyncio.wait_for(proc.stdout.read(65536), remaining)
+            if not chunk:
+                finished = True
                 break
-
-            if time.time() - start > RUN_TIMEOUT_SEC:
-                timed_out = True
-                proc.kill()
+            truncated = size + len(chunk) > MAX_OUTPUT_BYTES
+            if truncated:
+                chunk = chunk[:MAX_OUTPUT_BYTES - size]
+            size += len(chunk)
+            if on_output is None:
+                out += chunk
+            elif chunk:
+                await on_output(chunk)
+            if truncated:
                 break
-
-            chunk = proc.stdout.read(1024)
-            if chunk:
-                chunk_bytes = len(chunk.encode("utf-8", "ignore"))
-                if out_len + chunk_bytes > MAX_OUTPUT_BYTES:
-                    truncated = True
-                    # Add only what fits
-                    remaining = max(0, MAX_OUTPUT_BYTES - out_len)
-                    if remaining:
-                        out_chunks.append(chunk[:remaining])
-                    proc.kill()
-                    break
-                out_len += chunk_bytes
-                out_chunks.append(chunk)
-            else:
-                time.sleep(0.01)
-
-        output = "".join(out_chunks)
+    except asyncio.TimeoutError:
+        timed_out = True
     finally:
-        try:
-            proc.kill()
-        except Exception:
-            pass
+        if not finished:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        status = await proc.wait()
+
+    return bytes(out), status if finished else 0, timed_out, truncated
+
 
-    # Heuristic: roast_error prints a banner containing "❌ JATTI ERROR"
-    success = (not timed_out) and ("❌ JATTI ERROR" not in output)
+async def _run_jatti_subprocess(code: str, on_output: OnOutput | None = None) -> tuple[bool, str, bool, bool]:
+    """Run Jatti code in a subprocess.
+
+    Returns: (success, output, timed_out, truncated)
+    """
+    if not WORKER_PY.exists():
+        return False, "Server misconfigured: playground_worker.py missing", False, False
+
+    output, status, timed_out, truncated = await _pump_subprocess(code, on_output)
+    return _finish_output(output.decode("utf-8", "replace"), status, timed_out, truncated)
+
+
+def _finish_output(output: str, status: int | None, timed_out: bool, truncated: bool) -> tuple[bool, str, bool, bool]:
+    """Build the (success, output, timed_out, truncated) result for /api/run.
+
+    status is the worker's (0 = the program ran to the end), None if it crashed.
+    """
+    crashed = status is None
+    success = (not timed_out) and status == 0
+    if crashed:
+        output = (output + "\n" if output else "") + "💥 Worker crashed"
     if timed_out:
         output = (output + "\n" if output else "") + f"⏱️ Timed out after {RUN_TIMEOUT_SEC}s"
         success = False
@@ -200,107 +309,455 @@ def _run_jatti_subprocess(code: str) -> tuple[bool, str, bool, bool]:
     return success, output, timed_out, truncated
 
 
-def _read_json(handler: BaseHTTPRequestHandler) -> dict:
-    length = int(handler.headers.get("Content-Length", "0"))
-    if length > MAX_CODE_BYTES:
-        return {"__too_large__": True}
+async def _get_pool() -> WorkerPool | ForkServer | None:
+    """The configured backend, started on first use; None for subprocess"""
+    global _POOL
+    use_fork = EXEC_BACKEND == "fork" and hasattr(os, "fork")
+    if not use_fork and (EXEC_BACKEND != "pool" or POOL_SIZE <= 0):
+        return None
+    if _POOL is None:
+        if use_fork:
+            _POOL = ForkServer(FORK_MAX_CHILDREN, RUN_QUEUE_DEPTH, RUN_QUEUE_WAIT_SEC)
+        else:
+            _POOL = WorkerPool(POOL_SIZE, POOL_MAX_JOBS, RUN_QUEUE_DEPTH, RUN_QUEUE_WAIT_SEC)
+        await _POOL.start()
+    return _POOL
+
+
+async def _run_jatti(
+    code: str, on_output: OnOutput | None = None, client: str | None = None
+) -> tuple[bool, str, bool, bool] | None:
+    """Run Jatti code on the configured backend (pool, fork or subprocess).
+
+    With on_output the program's output is passed to it as it is produced,
+    and the returned output only holds the timeout/truncation notes.
+
+    Returns None when the run is not admitted (ADMISSION: queue full, waited
+    too long, or client has too many runs) or the backend is saturated.
+    """
+    loop = asyncio.get_running_loop()
+    queued_at = loop.time()
+    if not await ADMISSION.acquire(client):
+        return None
+    started = loop.time()
+    _QUEUE_SECONDS.observe(started - queued_at)
+    _RUNS.inc()
+    try:
+        pool = await _get_pool()
+        if pool is None:
+            result = await _run_jatti_subprocess(code, on_output)
+        else:
+            job = await pool.run(code, RUN_TIMEOUT_SEC, MAX_OUTPUT_BYTES, on_output)
+            if job is None:
+                return None
+            crashed = job.status is None
+            if crashed:
+                _CRASHES.inc()
+            result = _finish_output(job.output.decode("utf-8", "replace"), job.status, job.timed_out, job.truncated)
+    finally:
+        ADMISSION.release(client)
+        _RUN_SECONDS.observe(loop.time() - started)
+
+    if result[2]:
+        _TIMEOUTS.inc()
+    if result[3]:
+        _TRUNCATIONS.inc()
+    return result
+
+
+async def _run_cached(code: str, client: str | None = None) -> tuple[bool, str, bool, bool] | None:
+    """_run_jatti() with the result cache in front of it"""
+    if not RESULT_CACHE.enabled:
+        return await _run_jatti(code, client=client)
+
+    key = RESULT_CACHE.key(code)
+    pending = _INFLIGHT.get(key)
+    if pending is not None:
+        RESULT_CACHE.coalesced += 1
+        return await asyncio.shield(pending)
+
+    result = RESULT_CACHE.get(key)
+    if result is not None:
+        return result
+
+    if not is_deterministic_source(code):
+        RESULT_CACHE.impure += 1
+        return await _run_jatti(code, client=client)
+
+    pending = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = pending
+    result = None
+    try:
+        result = await _run_jatti(code, client=client)
+        if result is not None:
+            RESULT_CACHE.put(key, result)
+        return result
+    finally:
+        del _INFLIGHT[key]
+        pending.set_result(result)
+
+
+class Request:
+    """One parsed HTTP request"""
+
+    __slots__ = ("method", "path", "version", "headers", "body", "peer")
+
+    def __init__(self, method: str, path: str, version: str, headers: dict[str, str], peer: str):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers      # lower-cased names
+        self.body = b""
+        self.peer = peer
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+# A response is (status, content type, body)
+Response = tuple[int, str, bytes]
+
+
+def _parse_head(head: bytes, peer: str) -> Request | None:
+    lines = head.decode("iso-8859-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        return None
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return Request(parts[0], urlparse(parts[1]).path, parts[2], headers, peer)
+
 
-    raw = handler.rfile.read(length) if length else b"{}"
+def _json(status: int, payload: dict) -> Response:
+    return status, "application/json; charset=utf-8", json.dumps(payload).encode("utf-8")
+
+
+def _error(status: int) -> Response:
+    """The same HTML error page http.server's send_error() produces"""
+    status = HTTPStatus(status)
+    body = DEFAULT_ERROR_MESSAGE % {
+        "code": status.value,
+        "message": escape(status.phrase, quote=False),
+        "explain": escape(status.description, quote=False),
+    }
+    return status, DEFAULT_ERROR_CONTENT_TYPE, body.encode("utf-8", "replace")
+
+
+def _file(file_path: Path) -> Response:
     try:
-        return json.loads(raw.decode("utf-8"))
+        file_path = file_path.resolve()
+        file_path.relative_to(FRONTEND_DIR.resolve())
+    except ValueError:
+        return _error(HTTPStatus.NOT_FOUND)
+    if not file_path.exists() or not file_path.is_file():
+        return _error(HTTPStatus.NOT_FOUND)
+
+    ctype, _ = mimetypes.guess_type(str(file_path))
+    return HTTPStatus.OK, ctype or "application/octet-stream", file_path.read_bytes()
+
+
+def _do_get(request: Request) -> Response:
+    path = request.path
+
+    if path == "/healthz":
+        return _json(HTTPStatus.OK, {"ok": True})
+
+    if path == "/metrics":
+        return HTTPStatus.OK, "text/plain; version=0.0.4; charset=utf-8", METRICS.render()
+
+    if path == "/api/stats":
+        return _json(HTTPStatus.OK, {"resultCache": RESULT_CACHE.stats(), "admission": ADMISSION.stats()})
+
+    if path == "/" or path == "":
+        return _file(FRONTEND_DIR / "index.html")
+
+    if path.startswith("/assets/"):
+        rel = path.removeprefix("/")
+        return _file(FRONTEND_DIR / rel)
+
+    return _error(HTTPStatus.NOT_FOUND)
+
+
+def _check_run(request: Request, too_large: bool) -> Response | str:
+    """The code to run, or the error response for a refused request"""
+    ip = _client_ip(request)
+    if not _RATE.allow(ip):
+        _RATE_LIMITED.inc("ip")
+        return _json(HTTPStatus.TOO_MANY_REQUESTS, {"success": False, "error": "Rate limit exceeded"})
+
+    if REQUIRE_API_KEY:
+        if not JATTI_API_KEY:
+            return _json(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"success": False, "error": "Server misconfigured: JATTI_API_KEY is missing"},
+            )
+        provided = request.headers.get("x-api-key", "").strip()
+        if provided != JATTI_API_KEY:
+            return _json(HTTPStatus.UNAUTHORIZED, {"success": False, "error": "Unauthorized"})
+
+    api_key = request.headers.get("x-api-key", "").strip()
+    if RATE_KEY_MAX_REQ > 0 and api_key and not _KEY_RATE.allow(api_key):
+        _RATE_LIMITED.inc("api_key")
+        return _json(HTTPStatus.TOO_MANY_REQUESTS, {"success": False, "error": "Rate limit exceeded"})
+
+    if too_large:
+        return _json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"success": False, "error": "Code too large"})
+
+    try:
+        body = json.loads((request.body or b"{}").decode("utf-8"))
     except Exception:
-        return {}
-
-
-class PlaygroundHandler(BaseHTTPRequestHandler):
-    server_version = "JattiPlayground/0.1"
-
-    def _send_json(self, status: int, payload: dict) -> None:
-        data = json.dumps(payload).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(data)))
-        self.end_headers()
-        self.wfile.write(data)
-
-    def _send_file(self, file_path: Path) -> None:
-        if not file_path.exists() or not file_path.is_file():
-            self.send_error(HTTPStatus.NOT_FOUND)
-            return
-
-        ctype, _ = mimetypes.guess_type(str(file_path))
-        ctype = ctype or "application/octet-stream"
-        data = file_path.read_bytes()
-
-        self.send_response(HTTPStatus.OK)
-        self.send_header("Content-Type", ctype)
-        self.send_header("Content-Length", str(len(data)))
-        self.end_headers()
-        self.wfile.write(data)
-
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
-
-        if path == "/healthz":
-            return self._send_json(HTTPStatus.OK, {"ok": True})
-
-        if path == "/" or path == "":
-            return self._send_file(FRONTEND_DIR / "index.html")
-
-        if path.startswith("/assets/"):
-            rel = path.removeprefix("/")
-            return self._send_file(FRONTEND_DIR / rel)
-
-        self.send_error(HTTPStatus.NOT_FOUND)
-
-    def do_POST(self):
-        parsed = urlparse(self.path)
-        if parsed.path != "/api/run":
-            self.send_error(HTTPStatus.NOT_FOUND)
-            return
-
-        ip = _client_ip(self)
-        if not _rate_ok(ip):
-            self._send_json(HTTPStatus.TOO_MANY_REQUESTS, {"success": False, "error": "Rate limit exceeded"})
-            return
-
-        if REQUIRE_API_KEY:
-            if not JATTI_API_KEY:
-                self._send_json(
-                    HTTPStatus.INTERNAL_SERVER_ERROR,
-                    {"success": False, "error": "Server misconfigured: JATTI_API_KEY is missing"},
-                )
-                return
-            provided = (self.headers.get("X-API-Key") or "").strip()
-            if provided != JATTI_API_KEY:
-                self._send_json(HTTPStatus.UNAUTHORIZED, {"success": False, "error": "Unauthorized"})
-                return
-
-        body = _read_json(self)
-        if body.get("__too_large__"):
-            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"success": False, "error": "Code too large"})
-            return
-
-        code = body.get("code", "")
-        if not isinstance(code, str) or not code.strip():
-            self._send_json(HTTPStatus.BAD_REQUEST, {"success": False, "error": "Missing code"})
-            return
-
-        success, output, timed_out, truncated = _run_jatti_subprocess(code)
-        self._send_json(
-            HTTPStatus.OK,
-            {
-                "success": success,
-                "output": output,
-                "timedOut": timed_out,
-                "truncated": truncated,
-            },
-        )
-
-    def log_message(self, format, *args):
-        # Keep console clean; uncomment for debugging.
-        return
+        body = {}
+
+    code = body.get("code", "") if isinstance(body, dict) else ""
+    if not isinstance(code, str) or not code.strip():
+        return _json(HTTPStatus.BAD_REQUEST, {"success": False, "error": "Missing code"})
+    return code
+
+
+async def _do_post(request: Request, too_large: bool, writer: asyncio.StreamWriter, keep_alive: bool) -> Response | None:
+    if request.path not in ("/api/run", "/api/run/stream"):
+        return _error(HTTPStatus.NOT_FOUND)
+
+    code = _check_run(request, too_large)
+    if not isinstance(code, str):
+        return code
+    client = _client_ip(request)
+    if request.path == "/api/run/stream":
+        return await _stream_run(code, client, writer, keep_alive, chunked=request.version != "HTTP/1.0")
+
+    result = await _run_cached(code, client)
+    if result is None:
+        return _json(HTTPStatus.SERVICE_UNAVAILABLE, {"success": False, "error": "Server busy, try again"})
+
+    success, output, timed_out, truncated = result
+    return _json(
+        HTTPStatus.OK,
+        {
+            "success": success,
+            "output": output,
+            "timedOut": timed_out,
+            "truncated": truncated,
+        },
+    )
+
+
+def _head(status: int, ctype: str, keep_alive: bool, headers: dict[str, str]) -> bytes:
+    status = HTTPStatus(status)
+    lines = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        f"Server: {SERVER_VERSION}",
+        f"Date: {formatdate(usegmt=True)}",
+        f"Content-Type: {ctype}",
+    ]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _encode_response(response: Response, keep_alive: bool) -> bytes:
+    status, ctype, body = response
+    headers = {"Content-Length": str(len(body))}
+    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+        headers["Retry-After"] = str(ADMISSION.retry_after())
+    return _head(status, ctype, keep_alive, headers) + body
+
+
+class _EventStream:
+    """Server-sent events as one HTTP response, started by the first event"""
+
+    def __init__(self, writer: asyncio.StreamWriter, keep_alive: bool, chunked: bool) -> None:
+        self.writer = writer
+        self.keep_alive = keep_alive
+        self.chunked = chunked      # HTTP/1.0 clients get the raw stream and a close
+        self.started = False
+
+    async def send(self, event: str, payload) -> None:
+        data = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+        if not self.started:
+            self.started = True
+            headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            if self.chunked:
+                headers["Transfer-Encoding"] = "chunked"
+            self.writer.write(_head(HTTPStatus.OK, "text/event-stream; charset=utf-8", self.keep_alive, headers))
+        self.writer.write(b"%x\r\n%b\r\n" % (len(data), data) if self.chunked else data)
+        await self.writer.drain()
+
+    async def end(self) -> None:
+        if self.chunked:
+            self.writer.write(b"0\r\n\r\n")
+            await self.writer.drain()
+
+
+async def _stream_run(
+    code: str, client: str, writer: asyncio.StreamWriter, keep_alive: bool, chunked: bool
+) -> Response | None:
+    """Run code, sending its output as `output` events and then a `done` event.
+
+    Returns a response to send instead when the run never started (busy).
+    """
+    stream = _EventStream(writer, keep_alive, chunked)
+
+    key = RESULT_CACHE.key(code) if RESULT_CACHE.enabled else None
+    if key is not None:
+        cached = RESULT_CACHE.get(key)
+        if cached is not None:
+            success, output, timed_out, truncated = cached
+            if output:
+                await stream.send("output", output)
+            await stream.send("done", {"success": success, "timedOut": timed_out, "truncated": truncated})
+            await stream.end()
+            return None
+
+    # Deterministic programs are small enough to keep for the cache; nothing
+    # else is buffered
+    kept: bytearray | None = None
+    if key is not None:
+        if is_deterministic_source(code):
+            kept = bytearray()
+        else:
+            RESULT_CACHE.impure += 1
+
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    sent = False
+
+    async def forward(chunk: bytes) -> None:
+        nonlocal sent
+        if kept is not None:
+            kept.extend(chunk)
+        text = decoder.decode(chunk)
+        if text:
+            sent = True
+            await stream.send("output", text)
+
+    result = await _run_jatti(code, forward, client)
+    if result is None and not stream.started:
+        return _json(HTTPStatus.SERVICE_UNAVAILABLE, {"success": False, "error": "Server busy, try again"})
+
+    success, notes, timed_out, truncated = result or (False, "", False, False)
+    text = decoder.decode(b"", final=True)
+    if notes:
+        text += ("\n" if sent or text else "") + notes
+    if text:
+        await stream.send("output", text)
+    await stream.send("done", {"success": success, "timedOut": timed_out, "truncated": truncated})
+    await stream.end()
+
+    if kept is not None and success:
+        RESULT_CACHE.put(key, _finish_output(kept.decode("utf-8", "replace"), 0, timed_out, truncated))
+    return None
+
+
+async def _respond(
+    request: Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> tuple[Response | None, bool]:
+    """Read the request body and dispatch; returns (response, keep_alive).
+
+    The response is None when the handler has already written it (streaming).
+    """
+    keep_alive = request.keep_alive
+    if "transfer-encoding" in request.headers:
+        return _error(HTTPStatus.LENGTH_REQUIRED), False
+    try:
+        length = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        return _error(HTTPStatus.BAD_REQUEST), False
+    if length < 0:
+        return _error(HTTPStatus.BAD_REQUEST), False
+
+    # An oversized body is never read, so the connection cannot be reused
+    too_large = length > MAX_CODE_BYTES
+    if too_large:
+        keep_alive = False
+    elif length:
+        request.body = await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_SEC)
+
+    if request.method == "GET":
+        return _do_get(request), keep_alive
+    if request.method == "POST":
+        if request.version == "HTTP/1.0" and request.path == "/api/run/stream":
+            keep_alive = False     # a streamed reply ends when the connection does
+        return await _do_post(request, too_large, writer, keep_alive), keep_alive
+    return _error(HTTPStatus.NOT_IMPLEMENTED), keep_alive
+
+
+def _route(path: str) -> str:
+    """path as a metrics label, so arbitrary URLs do not add label values"""
+    if path in ("/", "/api/run", "/api/run/stream", "/api/stats", "/metrics", "/healthz"):
+        return path
+    if path.startswith("/assets/"):
+        return "/assets/"
+    return "other"
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    loop = asyncio.get_running_loop()
+    peer = writer.get_extra_info("peername")
+    peer_ip = peer[0] if isinstance(peer, tuple) else ""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SEC)
+            except asyncio.LimitOverrunError:
+                writer.write(_encode_response(_error(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE), False))
+                break
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                break
+
+            request = _parse_head(head, peer_ip)
+            if request is None:
+                writer.write(_encode_response(_error(HTTPStatus.BAD_REQUEST), False))
+                break
+            started = loop.time()
+            try:
+                response, keep_alive = await _respond(request, reader, writer)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                break
+
+            if response is not None:
+                writer.write(_encode_response(response, keep_alive))
+                await writer.drain()
+
+            route = _route(request.path)
+            status = response[0] if response is not None else HTTPStatus.OK   # streamed
+            method = request.method if request.method in ("GET", "POST") else "other"
+            _REQUESTS.inc(route, method, int(status))
+            _REQUEST_SECONDS.observe(loop.time() - started, route)
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def _serve(host: str, port: int) -> None:
+    # Start the backend before serving so the first requests find it warm
+    await _get_pool()
+
+    server = await asyncio.start_server(_handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    print(f"Jatti Playground running at http://{host}:{port}/")
+    print("Press Ctrl+C to stop")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        ADMISSION.close()
+        if _POOL is not None:
+            await _POOL.close()
 
 
 def main() -> int:
@@ -315,15 +772,10 @@ def main() -> int:
 
     os.chdir(str(REPO_ROOT))
 
-    httpd = ThreadingHTTPServer((args.host, args.port), PlaygroundHandler)
-    print(f"Jatti Playground running at http://{args.host}:{args.port}/")
-    print("Press Ctrl+C to stop")
     try:
-        httpd.serve_forever()
+        asyncio.run(_serve(args.host, args.port))
     except KeyboardInterrupt:
         pass
-    finally:
-        httpd.server_close()
 
     return 0
 
@@ -6,14 +6,267 @@ the interpreter prints to stdout.
 
 This is intentionally tiny so the main server can enforce timeouts/output limits
 by controlling this subprocess.
+
+With --serve the worker stays up and runs one program per request, for the warm
+pool in playground_pool.py. Each request is `<length>\\n<utf-8 code>` on stdin;
+the reply on stdout is a series of frames:
+
+  R\\n                the worker has imported the compiler (sent once, first)
+  O <n>\\n<n bytes>   output printed by the program
+  D <status>\\n       the program finished (status as the one-shot exit code)
+
+Status (and one-shot exit code) is 0 when the program ran to the end,
+JATTI_ERROR (3) when it stopped with a Jatti error (its banner is in the output),
+1 for an unexpected Python exception and 2 when the compiler cannot be imported.
+
+stdin is not available to programs in this mode (input() sees end of file).
+
+With --zygote <fd> the worker is a fork server instead (JATTI_EXEC_BACKEND=fork):
+it imports the compiler once and then waits on the Unix socket <fd>. Each
+message carries two file descriptors, a pipe the program text is read from and
+a pipe for the reply; the zygote forks, answers with the child's pid, and the
+child reads the program, writes the frames above (minus R) and exits. Children
+share the zygote's warm heap copy-on-write. A `kill <pid>` message (no file
+descriptors, no answer) SIGKILLs that child if it has not been reaped yet: only
+the parent knows the pid still belongs to the child. When the socket closes the
+zygote kills the children still running and exits.
 """
 
 from __future__ import annotations
 
+import gc
+import io
+import os
+import select
+import signal
+import socket
 import sys
+import threading
+import time
+
+
+JATTI_ERROR = 3
+
+
+def _run(jatti_run, code: str) -> int:
+    from compiler.errors import JattiError
+
+    try:
+        jatti_run(code)
+        return 0
+    except JattiError as e:
+        sys.stdout.write(e.render())
+        return JATTI_ERROR
+    except Exception as e:
+        print(str(e))
+        return 1
+
+
+# Buffered output is sent once this old, so streaming clients (/api/run/stream)
+# see a program's output while it is still running
+FLUSH_SEC = 0.05
+FLUSH_BYTES = 8192
+
+
+class _BatchedStdout(io.TextIOBase):
+    """stdout for a program: text is collected and handed to send() as UTF-8
+    once FLUSH_BYTES have piled up, or FLUSH_SEC after the first unsent write
+    (see _ticker). Flushing per line instead makes print-heavy programs ~15x
+    slower."""
+
+    encoding = "utf-8"
+
+    def __init__(self, send):
+        self._send = send
+        self._parts = []
+        self._size = 0
+        self._since = 0.0
+        self._lock = threading.Lock()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s) -> int:
+        with self._lock:
+            if not self._parts:
+                self._since = time.monotonic()
+            self._parts.append(s)
+            self._size += len(s)
+            if self._size >= FLUSH_BYTES:
+                self._flush()
+        return len(s)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def flush_stale(self) -> None:
+        with self._lock:
+            if self._parts and time.monotonic() - self._since >= FLUSH_SEC:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._parts:
+            data = "".join(self._parts).encode("utf-8", "replace")
+            self._parts = []
+            self._size = 0
+            self._send(data)
+
+
+def _ticker(writer: _BatchedStdout, done: threading.Event) -> None:
+    while not done.wait(FLUSH_SEC):
+        writer.flush_stale()
+
+
+def _run_batched(jatti_run, code: str, send) -> int:
+    """Run one program with stdout/stderr batched into send()"""
+    writer = _BatchedStdout(send)
+    done = threading.Event()
+    ticker = threading.Thread(target=_ticker, args=(writer, done), daemon=True)
+    sys.stdout = sys.stderr = writer
+    ticker.start()
+    try:
+        return _run(jatti_run, code)
+    finally:
+        done.set()
+        ticker.join()
+        writer.flush()
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+
+def _run_job(jatti_run, code: str, out) -> None:
+    """Run one program with its output framed onto out, then send D"""
+    def send(data: bytes) -> None:
+        out.write(b"O %d\n" % len(data) + data)
+        out.flush()
+
+    sys.stdin = io.StringIO()
+    try:
+        status = _run_batched(jatti_run, code, send)
+    finally:
+        sys.stdin = sys.__stdin__
+
+    out.write(b"D %d\n" % status)
+    out.flush()
+
+
+def serve() -> int:
+    try:
+        from compiler.core import run as jatti_run
+    except Exception as e:
+        print(f"Failed to import Jatti compiler: {e}", file=sys.stderr)
+        return 2
+
+    requests = sys.stdin.buffer
+    out = sys.stdout.buffer
+    cwd = os.getcwd()
+    out.write(b"R\n")
+    out.flush()
+
+    while True:
+        header = requests.readline()
+        if not header:
+            return 0
+        code = requests.read(int(header)).decode("utf-8", "replace")
+        try:
+            _run_job(jatti_run, code, out)
+        finally:
+            os.chdir(cwd)
+
+
+def _reap(children: set[int]) -> None:
+    """Collect finished children so they do not linger as zombies"""
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        children.discard(pid)
+
+
+def _kill(children: set[int], pid: int) -> None:
+    # A child that is not reaped yet still owns its pid, even as a zombie
+    if pid in children:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def _child(jatti_run, code_fd: int, out_fd: int) -> None:
+    """Body of one forked child: read the program, run it, exit"""
+    os.dup2(out_fd, 1)
+    os.dup2(out_fd, 2)
+    os.close(out_fd)
+
+    chunks = []
+    while True:
+        chunk = os.read(code_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(code_fd)
+    code = b"".join(chunks).decode("utf-8", "replace")
+
+    _run_job(jatti_run, code, open(1, "wb", buffering=0, closefd=False))
+
+
+def zygote(sock_fd: int) -> int:
+    try:
+        import compiler.runtime  # noqa: F401
+        import compiler.stdlib  # noqa: F401
+        from compiler.core import run as jatti_run
+    except Exception as e:
+        print(f"Failed to import Jatti compiler: {e}", file=sys.stderr)
+        return 2
+
+    # Keep the preloaded heap out of the collector's reach, so children do not
+    # copy every page the first time a GC pass touches an object header
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(fileno=sock_fd)
+    children: set[int] = set()
+    while True:
+        readable, _, _ = select.select([sock], [], [], 1.0)
+        if not readable:
+            _reap(children)
+            continue
+        msg, fds, _, _ = socket.recv_fds(sock, 16, 2)
+        if not msg:
+            for pid in children:
+                _kill(children, pid)
+            return 0
+        if msg.startswith(b"kill "):
+            # Before reaping, so the pid cannot have been handed to another process
+            _kill(children, int(msg[5:]))
+            _reap(children)
+            continue
+        _reap(children)
+        code_fd, out_fd = fds
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                sock.close()
+                _child(jatti_run, code_fd, out_fd)
+            finally:
+                os._exit(0)
+
+        children.add(pid)
+        os.close(code_fd)
+        os.close(out_fd)
+        sock.send(b"%d" % pid)
 
 
 def main() -> int:
+    if "--serve" in sys.argv[1:]:
+        return serve()
+    if sys.argv[1:2] == ["--zygote"]:
+        return zygote(int(sys.argv[2]))
+
     code = sys.stdin.read()
     try:
         from compiler.core import run as jatti_run
@@ -21,15 +274,13 @@ def main() -> int:
         print(f"Failed to import Jatti compiler: {e}")
         return 2
 
-    try:
-        jatti_run(code)
-        return 0
-    except SystemExit:
-        # roast_error raises SystemExit; error text is already printed.
-        return 0
-    except Exception as e:
-        print(str(e))
-        return 1
+    out = sys.stdout.buffer
+
+    def send(data: bytes) -> None:
+        out.write(data)
+        out.flush()
+
+    return _run_batched(jatti_run, code, send)
 
 
 if __name__ == "__main__":
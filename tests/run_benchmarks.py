@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmarks for the Jatti interpreter.
+
+Runs in-process (program output is discarded) and reports best-of-N timings:
+
+- norm: keyword normalization of every line in tests/cases/*.jatti,
+  first pass (memo cleared) and repeated passes
+- cases: end-to-end run() of each tests/cases/*.jatti program
+- loop: a synthetic jadon_tak loop (default 10^6 iterations)
+
+Usage:
+  python tests/run_benchmarks.py
+  python tests/run_benchmarks.py --loop-iterations 100000 --repeat 5
+  python tests/run_benchmarks.py --only norm
+  python tests/run_benchmarks.py --engine vm
+  python tests/run_benchmarks.py --compiled
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CASES_DIR = REPO_ROOT / "tests" / "cases"
+
+sys.path.insert(0, str(REPO_ROOT))
+
+from compiler import parser  # noqa: E402
+from compiler.core import norm, run  # noqa: E402
+
+
+def _loop_program(iterations: int) -> str:
+    return "\n".join([
+        "sun_we",
+        "    chal_oye i ban 0",
+        "    chal_oye total ban 0",
+        f"    jadon_tak i nikka_hai {iterations}",
+        "        chal_oye total ban total + i",
+        "        chal_oye i ban i + 1",
+        "    chilla_we total",
+        "ja_we",
+    ])
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _run_quiet(code: str, engine: str = "tree", mode: str = "interpret") -> None:
+    with redirect_stdout(io.StringIO()):
+        run(code, engine=engine, mode=mode)
+
+
+def bench_norm(repeat: int) -> None:
+    lines = []
+    for case in sorted(CASES_DIR.glob("*.jatti")):
+        lines.extend(l.strip() for l in case.read_text(encoding="utf-8").splitlines() if l.strip())
+
+    def first_pass():
+        if hasattr(parser._normalize, "cache_clear"):
+            parser._normalize.cache_clear()
+        for line in lines:
+            norm(line)
+
+    def repeated(passes=1000):
+        for _ in range(passes):
+            for line in lines:
+                norm(line)
+
+    cold = _best(first_pass, repeat)
+    repeated(1)
+    warm = _best(repeated, repeat)
+    calls = len(lines) * 1000
+    print(f"norm   first pass   {len(lines):6d} lines  {cold * 1e6:10.1f} us")
+    print(f"norm   repeated     {calls:6d} calls  {warm * 1e3:10.2f} ms  ({warm / calls * 1e9:.0f} ns/call)")
+
+
+def bench_cases(repeat: int, engine: str, mode: str) -> None:
+    for case in sorted(CASES_DIR.glob("*.jatti")):
+        code = case.read_text(encoding="utf-8")
+        elapsed = _best(lambda: _run_quiet(code, engine, mode), repeat)
+        print(f"case   {case.stem:28s} {elapsed * 1e3:10.2f} ms")
+
+
+def bench_loop(iterations: int, repeat: int, engine: str, mode: str) -> None:
+    code = _loop_program(iterations)
+    elapsed = _best(lambda: _run_quiet(code, engine, mode), repeat)
+    print(f"loop   {iterations:d} iterations {elapsed:15.3f} s")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3, help="Take the best of N runs")
+    ap.add_argument("--loop-iterations", type=int, default=1_000_000)
+    ap.add_argument("--only", choices=["norm", "cases", "loop"], default=None)
+    ap.add_argument("--engine", choices=["tree", "vm"], default="tree")
+    ap.add_argument("--compiled", action="store_true", help="Use run(mode=\"compiled\")")
+    args = ap.parse_args()
+    mode = "compiled" if args.compiled else "interpret"
+
+    if args.only in (None, "norm"):
+        bench_norm(args.repeat)
+    if args.only in (None, "cases"):
+        bench_cases(args.repeat, args.engine, mode)
+    if args.only in (None, "loop"):
+        bench_loop(args.loop_iterations, args.repeat, args.engine, mode)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
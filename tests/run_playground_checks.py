@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""Checks for the playground server's building blocks.
+
+Each check_* function below exercises one piece in-process and raises
+AssertionError when it misbehaves: the result-cache purity test, the worker
+frame protocol, admission control, token-bucket rate limiting, the result
+cache in front of /api/run, server-sent events, the fork server, and the
+/metrics exposition format. Only the worker and fork checks start processes
+(one `playground_worker.py --serve` and a `--zygote`).
+
+Usage:
+  python tests/run_playground_checks.py
+  python tests/run_playground_checks.py --check purity_bare_kaam
+  python tests/run_playground_checks.py --check frames_timeout
+
+Exit code:
+  0 if all checks pass, 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import playground_server as server  # noqa: E402
+from compiler.purity import is_deterministic_source  # noqa: E402
+from playground_admission import AdmissionQueue  # noqa: E402
+from playground_cache import ResultCache  # noqa: E402
+from playground_metrics import Registry  # noqa: E402
+from playground_pool import ForkServer, Worker, _FrameReader  # noqa: E402
+from playground_ratelimit import TokenBucketLimiter  # noqa: E402
+
+
+def _program(*lines: str) -> str:
+    return "sun_we\n" + "".join(f"    {line}\n" for line in lines) + "ja_we\n"
+
+
+def _async(fn):
+    """Run an async check on a fresh event loop"""
+    def check() -> None:
+        asyncio.run(fn())
+    check.__name__ = fn.__name__
+    return check
+
+
+def _frames(data: bytes, eof: bool = True) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    if eof:
+        reader.feed_eof()
+    return reader
+
+
+class _Writer:
+    """Stands in for an asyncio.StreamWriter, keeping what was written"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+
+# ---------------- purity ----------------
+def check_purity_pure_program() -> None:
+    code = _program(
+        "kaam square(x)",
+        "    wapas_kar x * x",
+        "chal_oye nums ban [3, 1, 2]",
+        "chilla_we square(4)",
+        "chilla_we kinna_lamba(nums)",
+        "chilla_we sort_hoja_oye(nums)",
+    )
+    assert is_deterministic_source(code)
+
+
+def check_purity_impure_builtins() -> None:
+    for expr in ("object()", "repr(object())", "type(object())", "print", "id(1)", "iter([1, 2])"):
+        code = _program(f"chilla_we {expr}")
+        assert not is_deterministic_source(code), expr
+
+
+def check_purity_bare_kaam() -> None:
+    code = _program(
+        "kaam f(x)",
+        "    wapas_kar x",
+        "chilla_we f",
+    )
+    assert not is_deterministic_source(code)
+
+
+def check_purity_bare_builtin() -> None:
+    assert not is_deterministic_source(_program("chilla_we kinna_lamba"))
+    assert not is_deterministic_source(_program("chal_oye g ban len", "chilla_we g"))
+
+
+def check_purity_bare_method() -> None:
+    code = _program("chal_oye l ban [1, 2]", "chilla_we l.append")
+    assert not is_deterministic_source(code)
+    assert not is_deterministic_source(_program("chilla_we \"abc\".upper"))
+    # Called, the same method is fine
+    assert is_deterministic_source(_program("chilla_we \"abc\".upper()"))
+
+
+# ---------------- worker frames ----------------
+@_async
+async def check_frames_output_and_done() -> None:
+    reader = _frames(b"R\nO 6\nhello\nO 3\nabcD 0\n")
+    frames = _FrameReader(reader, ready=False)
+    result = await frames.read_job(1.0, 1000)
+    assert frames.ready
+    assert result.output == b"hello\nabc", result.output
+    assert (result.status, result.timed_out, result.truncated) == (0, False, False)
+    assert result.reusable
+
+
+@_async
+async def check_frames_jatti_error_status() -> None:
+    result = await _FrameReader(_frames(b"O 4\noopsD 3\n"), ready=True).read_job(1.0, 1000)
+    assert (result.output, result.status) == (b"oops", 3)
+    assert result.reusable
+
+
+@_async
+async def check_frames_streamed_to_callback() -> None:
+    chunks = []
+
+    async def on_output(chunk: bytes) -> None:
+        chunks.append(chunk)
+
+    reader = _frames(b"O 2\nabO 1\ncD 0\n")
+    result = await _FrameReader(reader, ready=True).read_job(1.0, 1000, on_output)
+    assert chunks == [b"ab", b"c"], chunks
+    assert result.output == b"" and result.status == 0
+
+
+@_async
+async def check_frames_truncated() -> None:
+    result = await _FrameReader(_frames(b"O 10\n0123456789D 0\n"), ready=True).read_job(1.0, 4)
+    assert result.output == b"0123"
+    assert result.truncated and not result.reusable
+
+
+@_async
+async def check_frames_worker_died() -> None:
+    # Output frame cut short, then a header without its newline
+    for data in (b"O 10\nabc", b"O 2\nabD"):
+        result = await _FrameReader(_frames(data), ready=True).read_job(1.0, 1000)
+        assert result.status is None, data
+        assert not result.reusable
+
+
+@_async
+async def check_frames_timeout() -> None:
+    reader = _frames(b"O 2\nab", eof=False)
+    result = await _FrameReader(reader, ready=True).read_job(0.05, 1000)
+    assert result.output == b"ab"
+    assert result.timed_out and not result.reusable
+
+
+@_async
+async def check_worker_runs_programs() -> None:
+    worker = await Worker.spawn()
+    try:
+        first = await worker.run(_program("chilla_we 6 * 7"), 10.0, 1000)
+        assert (first.output, first.status) == (b"42\n", 0), (first.output, first.status)
+        # The same process takes the next program
+        second = await worker.run(_program("chilla_we \"phir\""), 10.0, 1000)
+        assert (second.output, second.status) == (b"phir\n", 0), (second.output, second.status)
+        assert worker.jobs == 2 and worker.alive()
+    finally:
+        worker.proc.kill()
+        await worker.proc.wait()
+
+
+# ---------------- admission ----------------
+@_async
+async def check_admission_queue_fifo() -> None:
+    queue = AdmissionQueue(1, 2, 1.0)
+    assert await queue.acquire()
+    order = []
+
+    async def wait(name: str) -> None:
+        assert await queue.acquire()
+        order.append(name)
+        queue.release()
+
+    waiters = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+    await asyncio.sleep(0)
+    assert queue.queued == 2
+    assert not await queue.acquire()     # queue full
+    assert queue.rejected_full == 1
+    queue.release()
+    await asyncio.gather(*waiters)
+    assert order == ["a", "b"] and queue.running == 0
+
+
+@_async
+async def check_admission_wait_timeout_and_per_client() -> None:
+    queue = AdmissionQueue(1, 4, 0.05, per_client=1)
+    assert await queue.acquire("10.0.0.1")
+    assert not await queue.acquire("10.0.0.1")    # already holds its one place
+    assert queue.rejected_client == 1
+    assert not await queue.acquire("10.0.0.2")    # waits, then gives up
+    assert queue.timed_out == 1 and queue.queued == 0
+    queue.release("10.0.0.1")
+    assert await queue.acquire("10.0.0.2")
+
+
+@_async
+async def check_admission_503_retry_after() -> None:
+    saved = server.ADMISSION, server.RESULT_CACHE
+    server.ADMISSION = AdmissionQueue(1, 0, 1.0)
+    server.RESULT_CACHE = ResultCache(0)
+    try:
+        assert await server.ADMISSION.acquire()     # the only slot is busy
+        request = server.Request("POST", "/api/run", "HTTP/1.1", {}, "10.0.0.3")
+        request.body = json.dumps({"code": _program("chilla_we 1")}).encode()
+        response = await server._do_post(request, False, None, True)
+        assert response[0] == 503, response
+        assert json.loads(response[2])["success"] is False
+
+        head = server._encode_response(response, True).split(b"\r\n\r\n", 1)[0].decode()
+        assert head.startswith("HTTP/1.1 503 "), head
+        retry = [line for line in head.split("\r\n") if line.startswith("Retry-After: ")]
+        assert retry and int(retry[0].split(": ", 1)[1]) >= 1, head
+    finally:
+        server.ADMISSION, server.RESULT_CACHE = saved
+
+
+# ---------------- rate limit ----------------
+def check_token_bucket_refill() -> None:
+    limiter = TokenBucketLimiter(rate=2.0, burst=3)
+    assert [limiter.allow("ip", now=0.0) for _ in range(4)] == [True, True, True, False]
+    assert not limiter.allow("ip", now=0.25)     # half a token back
+    assert limiter.allow("ip", now=0.5)          # one token: 0.25s at 2/s plus the half
+    assert not limiter.allow("ip", now=0.5)
+    # A long idle spell refills only up to burst
+    assert [limiter.allow("ip", now=100.0) for _ in range(4)] == [True, True, True, False]
+    # Buckets are per key
+    assert limiter.allow("other", now=100.0)
+
+
+def check_token_bucket_bounded() -> None:
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=4, shards=1)
+    for i in range(10):
+        assert limiter.allow(f"10.0.0.{i}", now=0.0)
+    assert len(limiter) == 4
+    # Evicted keys start over with a full bucket
+    assert limiter.allow("10.0.0.0", now=0.0)
+
+
+# ---------------- result cache ----------------
+class _FakeRuns:
+    """Replaces server._run_jatti, counting the runs that reach the backend"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, code: str, on_output=None, client=None):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return True, f"run {self.calls}\n", False, False
+
+
+async def _with_cache(fn) -> None:
+    saved = server.RESULT_CACHE, server._run_jatti
+    server.RESULT_CACHE = ResultCache(8)
+    server._run_jatti = runs = _FakeRuns()
+    try:
+        await fn(runs)
+    finally:
+        server.RESULT_CACHE, server._run_jatti = saved
+
+
+@_async
+async def check_cache_refuses_impure() -> None:
+    async def check(runs: _FakeRuns) -> None:
+        for code in (
+            _program("das_oye naam eh_chahida \"Naam?\"", "chilla_we naam"),
+            _program("chilla_we object()"),
+            _program("kaam f(x)", "    wapas_kar x", "chilla_we f"),
+        ):
+            first = await server._run_cached(code)
+            second = await server._run_cached(code)
+            assert first != second, code    # ran twice, nothing cached
+        assert runs.calls == 6
+        assert server.RESULT_CACHE.impure == 6 and server.RESULT_CACHE.stores == 0
+
+    await _with_cache(check)
+
+
+@_async
+async def check_cache_coalesces_inflight() -> None:
+    async def check(runs: _FakeRuns) -> None:
+        code = _program("chilla_we 2 + 2")
+        results = await asyncio.gather(*(server._run_cached(code) for _ in range(3)))
+        assert runs.calls == 1
+        assert results == [(True, "run 1\n", False, False)] * 3
+        assert server.RESULT_CACHE.coalesced == 2
+        assert not server._INFLIGHT
+
+        # Later repeats are cache hits
+        assert await server._run_cached(code) == results[0]
+        assert runs.calls == 1 and server.RESULT_CACHE.hits == 1
+
+    await _with_cache(check)
+
+
+# ---------------- streaming ----------------
+@_async
+async def check_event_stream_chunks() -> None:
+    writer = _Writer()
+    stream = server._EventStream(writer, keep_alive=True, chunked=True)
+    await stream.send("output", "ok\n")
+    await stream.send("done", {"success": True})
+    await stream.end()
+
+    head, body = bytes(writer.data).split(b"\r\n\r\n", 1)
+    assert b"Content-Type: text/event-stream" in head and b"Transfer-Encoding: chunked" in head
+    events = []
+    while True:
+        size, _, body = body.partition(b"\r\n")
+        size = int(size, 16)
+        if not size:
+            break
+        events.append(body[:size])
+        assert body[size:size + 2] == b"\r\n"
+        body = body[size + 2:]
+    assert events == [
+        b'event: output\ndata: "ok\\n"\n\n',
+        b'event: done\ndata: {"success": true}\n\n',
+    ], events
+
+
+# ---------------- fork server ----------------
+def _proc_state(pid: int) -> str | None:
+    """State letter of a process from /proc (Z for a zombie), None once it is gone"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0]
+    except OSError:
+        return None
+
+
+def _ppid(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return int(f.read().rsplit(")", 1)[1].split()[1])
+    except (OSError, ValueError):
+        return None
+
+
+async def _wait_dead(pid: int, reaped: bool, limit: float = 5.0) -> bool:
+    states = (None,) if reaped else (None, "Z")
+    for _ in range(int(limit / 0.05)):
+        if _proc_state(pid) in states:
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+class _KillLog:
+    """Wraps ForkServer._kill to note the pids the server asks the zygote to kill"""
+
+    def __init__(self, forks: ForkServer) -> None:
+        self.pids = []
+        self._kill = forks._kill
+        forks._kill = self
+
+    def __call__(self, pid: int, zygote) -> None:
+        self.pids.append(pid)
+        self._kill(pid, zygote)
+
+
+@_async
+async def check_fork_server_runs_programs() -> None:
+    if not hasattr(os, "fork"):
+        return
+    forks = ForkServer(2, 2, 5.0)
+    try:
+        await forks.start()
+        first = await forks.run(_program("chilla_we 6 * 7"), 10.0, 1000)
+        assert (first.output, first.status) == (b"42\n", 0), (first.output, first.status)
+        second = await forks.run(_program("chal_oye x ban x_nahi_hai + 1"), 10.0, 1000)
+        assert second.status == 3, (second.output, second.status)     # a Jatti error
+        assert forks.busy == 0
+    finally:
+        await forks.close()
+
+
+@_async
+async def check_fork_server_kills_timed_out_child() -> None:
+    if not hasattr(os, "fork") or not os.path.isdir("/proc"):
+        return
+    forks = ForkServer(2, 2, 5.0)
+    kills = _KillLog(forks)
+    try:
+        await forks.start()
+        loop = _program("jadon_tak 1 barabar 1", "    chal_oye x ban 1")
+        result = await forks.run(loop, 0.3, 1000)
+        assert result.timed_out
+        assert len(kills.pids) == 1
+        pid = kills.pids[0]
+        # The zygote kills its child, then reaps it on its next pass
+        assert await _wait_dead(pid, reaped=True), _proc_state(pid)
+        assert forks._proc.returncode is None
+
+        # A program that ran to the end is left alone
+        assert (await forks.run(_program("chilla_we 1"), 10.0, 1000)).status == 0
+        assert len(kills.pids) == 1
+    finally:
+        await forks.close()
+
+
+@_async
+async def check_fork_server_close_kills_children() -> None:
+    if not hasattr(os, "fork") or not os.path.isdir("/proc"):
+        return
+    forks = ForkServer(2, 2, 5.0)
+    await forks.start()
+    zygote = forks._proc.pid
+    loop = _program("jadon_tak 1 barabar 1", "    chal_oye x ban 1")
+    run = asyncio.create_task(forks.run(loop, 30.0, 1000))
+    try:
+        children = []
+        for _ in range(100):
+            children = [
+                int(pid) for pid in os.listdir("/proc")
+                if pid.isdigit() and _ppid(int(pid)) == zygote
+            ]
+            if children:
+                break
+            await asyncio.sleep(0.05)
+        assert len(children) == 1, children
+    finally:
+        await forks.close()
+    result = await asyncio.wait_for(run, 5.0)
+    assert not result.reusable
+    assert await _wait_dead(children[0], reaped=False), _proc_state(children[0])
+
+
+# ---------------- metrics ----------------
+def check_metrics_render() -> None:
+    registry = Registry()
+    requests = registry.counter("jatti_requests_total", "Requests", ("route", "status"))
+    latency = registry.histogram("jatti_request_seconds", "Request time", buckets=(0.1, 1.0))
+    registry.gauge_fn("jatti_slots", "Slots", lambda: 4)
+
+    requests.inc("/api/run", 200)
+    requests.inc("/api/run", 200)
+    requests.inc('/a"b\\c\nd', 404)
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(seconds)
+
+    lines = registry.render().decode("utf-8").split("\n")
+    assert lines[-1] == "", "render() ends with a newline"
+    expected = [
+        "# HELP jatti_requests_total Requests",
+        "# TYPE jatti_requests_total counter",
+        'jatti_requests_total{route="/api/run",status="200"} 2',
+        'jatti_requests_total{route="/a\\"b\\\\c\\nd",status="404"} 1',
+        "# HELP jatti_request_seconds Request time",
+        "# TYPE jatti_request_seconds histogram",
+        # Buckets count every observation at or below their bound
+        'jatti_request_seconds_bucket{le="0.1"} 2',
+        'jatti_request_seconds_bucket{le="1"} 3',
+        'jatti_request_seconds_bucket{le="+Inf"} 4',
+        "jatti_request_seconds_sum 3.65",
+        "jatti_request_seconds_count 4",
+        "# HELP jatti_slots Slots",
+        "# TYPE jatti_slots gauge",
+        "jatti_slots 4",
+    ]
+    assert lines[:-1] == expected, "\n".join(lines)
+
+
+def check_metrics_labelled_histogram() -> None:
+    registry = Registry()
+    latency = registry.histogram("t_seconds", "T", ("route",), buckets=(1.0,))
+    latency.observe(0.5, "/a")
+    latency.observe(2.0, "/b")
+    text = registry.render().decode("utf-8")
+    for line in (
+        't_seconds_bucket{route="/a",le="1"} 1',
+        't_seconds_bucket{route="/a",le="+Inf"} 1',
+        't_seconds_bucket{route="/b",le="1"} 0',
+        't_seconds_bucket{route="/b",le="+Inf"} 1',
+        't_seconds_count{route="/b"} 1',
+    ):
+        assert line in text.split("\n"), (line, text)
+
+
+def _checks() -> dict:
+    return {
+        name[len("check_"):]: fn
+        for name, fn in globals().items()
+        if name.startswith("check_") and callable(fn)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", default=None, help="Run a single check by name (e.g., purity_bare_kaam)")
+    args = parser.parse_args()
+
+    checks = _checks()
+    if args.check:
+        checks = {name: fn for name, fn in checks.items() if name == args.check}
+    if not checks:
+        print("No checks found.")
+        return 1
+
+    failed = 0
+    for name, fn in checks.items():
+        try:
+            fn()
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {name}")
+            print(traceback.format_exc())
+            continue
+        print(f"[PASS] {name}")
+
+    if failed:
+        print(f"\n{failed} failing check(s).")
+        return 1
+
+    print("\nAll checks passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -60,18 +60,17 @@ def sabton_nikka(lst):
 def dona_nu_jod_oye(str1, str2):
     return str(str1) + str(str2)
 
+def __jatti_range(*args):
+    if not 1 <= len(args) <= 3:
+        raise ValueError('range_banao: takes 1-3 arguments')
+    return range(*[int(a) for a in args])
+
 def range_banao(*args):
-    if len(args) == 1:
-        return list(range(int(args[0])))
-    if len(args) == 2:
-        return list(range(int(args[0]), int(args[1])))
-    if len(args) == 3:
-        return list(range(int(args[0]), int(args[1]), int(args[2])))
-    raise ValueError('range_banao: takes 1-3 arguments')
+    return list(__jatti_range(*args))
 
 def __jatti_main__():
     total = 0
-    for i in range_banao(1, 6):
+    for i in __jatti_range(1, 6):
         total = total + i
     print(total)
 
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Auto-generated from Jatti code
+
+# Minimal Jatti stdlib (embedded)
+class __JattiThrown(Exception):
+    pass
+
+def __jatti_exception_value(e):
+    # Match interpreter-style error payloads where practical
+    if isinstance(e, __JattiThrown):
+        return e.args[0] if e.args else None
+    if isinstance(e, ZeroDivisionError):
+        return 'Zero naal divide nahi kar sakde.'
+    if isinstance(e, TypeError):
+        return 'Galat type operation hoyi hai.'
+    if isinstance(e, NameError):
+        # Best-effort; Python messages vary
+        return f'Variable define nahi hoya: {e}'
+    return str(e)
+
+def kinna_lamba(obj):
+    return len(obj)
+
+def sort_hoja_oye(lst):
+    if not isinstance(lst, list):
+        raise TypeError('sort_hoja_oye: only works with lists')
+    return sorted(lst)
+
+def ulta_hoja_oye(lst):
+    if not isinstance(lst, list):
+        raise TypeError('ulta_hoja_oye: only works with lists')
+    return list(reversed(lst))
+
+def jod_oye(lst):
+    if not isinstance(lst, list):
+        raise TypeError('jod_oye: only works with lists')
+    return sum(lst)
+
+def average_kad(lst):
+    if not isinstance(lst, list):
+        raise TypeError('average_kad: only works with lists')
+    if len(lst) == 0:
+        raise ValueError('average_kad: cannot average empty list')
+    return sum(lst) / len(lst)
+
+def sabton_vaddha(lst):
+    if not isinstance(lst, list):
+        raise TypeError('sabton_vaddha: only works with lists')
+    if len(lst) == 0:
+        raise ValueError('sabton_vaddha: cannot find max of empty list')
+    return max(lst)
+
+def sabton_nikka(lst):
+    if not isinstance(lst, list):
+        raise TypeError('sabton_nikka: only works with lists')
+    if len(lst) == 0:
+        raise ValueError('sabton_nikka: cannot find min of empty list')
+    return min(lst)
+
+def dona_nu_jod_oye(str1, str2):
+    return str(str1) + str(str2)
+
+def __jatti_range(*args):
+    if not 1 <= len(args) <= 3:
+        raise ValueError('range_banao: takes 1-3 arguments')
+    return range(*[int(a) for a in args])
+
+def range_banao(*args):
+    return list(__jatti_range(*args))
+
+def __jatti_main__():
+    def sign(n):
+        if n < 0:
+            return -1
+        return 1
+
+    a = 1
+    if a == 1:
+        if a == 2:
+            print("inner")
+    else:
+        print("outer else")
+
+    k = 0
+    while k < 3:
+        k = k + 1
+
+        print(k * sign(-2))
+    print("done")
+
+if __name__ == '__main__':
+    __jatti_main__()
\ No newline at end of file